@@ -0,0 +1,152 @@
+"""
+Shared fixtures for the SPP test scripts (no live login needed)
+
+- ``automation``: SPPAutomationEnhanced on its built-in defaults (no
+  config.ini), working in the test's tmp_path, without a template
+- ``fake_connection``: Builds a FakeConnection, a Snowflake connection
+  stand-in that serves canned results by marker text
+- ``attach_connection``: Puts a FakeConnection on ``automation`` in place of
+  a Snowflake login
+
+Test files override ``automation`` (requesting it by the same name) to switch
+off whatever their test does not exercise.
+"""
+
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from spp_automation_enhanced import SPPAutomationEnhanced
+
+
+class FakeCursor:
+    """Cursor of a FakeConnection (the parts of the Snowflake cursor the engine uses)."""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.description = None
+        self.sfqid = None
+        self._rows = []
+
+    def execute(self, statement, params=None):
+        self.connection.statements.append((statement.strip(), params))
+        if self.connection.fail_on and self.connection.fail_on in statement:
+            raise Exception(f"Statement failed: {self.connection.fail_on}")
+        self._serve(statement, params)
+
+    def execute_async(self, statement, params=None):
+        self.sfqid = f"qid-{len(self.connection.submitted)}"
+        self.connection.submitted.append((statement, params))
+        # The n-th submitted query finishes after n polls, so queries complete out of order
+        self.connection.polls_left[self.sfqid] = len(self.connection.submitted)
+
+    def get_results_from_sfqid(self, query_id):
+        self._serve(*self.connection.submitted[int(query_id.split("-")[1])])
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchmany(self, size):
+        size = min(size, self.connection.batch_rows or size)
+        chunk, self._rows = self._rows[:size], self._rows[size:]
+        return chunk
+
+    def fetch_arrow_batches(self):
+        import pyarrow as pa
+        columns = [desc[0] for desc in self.description]
+        while self._rows:
+            chunk = self.fetchmany(len(self._rows))
+            yield pa.Table.from_pandas(pd.DataFrame(chunk, columns=columns), preserve_index=False)
+
+    def close(self):
+        pass
+
+    def _serve(self, statement, params):
+        self.description, self._rows = None, []
+        for marker, (columns, rows) in self.connection.results.items():
+            if marker in statement:
+                self.connection.queries.append((marker, statement, params))
+                self.description = [(column,) for column in columns]
+                self._rows = list(rows)
+                return
+        if self.connection.strict:
+            raise AssertionError(f"Unexpected statement: {statement.strip()[:80]}")
+
+
+class FakeConnection:
+    """
+    Snowflake connection stand-in serving canned results.
+
+    Attributes:
+        results (dict): Marker text -> (columns, rows); a statement gets the
+            rows of the first marker it contains, other statements no rows
+        statements (list): (statement, params) of every execute() call
+        queries (list): (marker, statement, params) of every statement that
+            matched a marker, executed or fetched by query ID
+        fail_on (str): Statements containing this text raise (so do the
+            status checks of submitted queries containing it)
+        batch_rows (int): Most rows per fetchmany() / Arrow batch
+        strict (bool): Statements without a marker raise AssertionError
+    """
+
+    def __init__(self, results=None, fail_on=None, batch_rows=None, strict=False):
+        self.results = results if results is not None else {}
+        self.fail_on = fail_on
+        self.batch_rows = batch_rows
+        self.strict = strict
+        self.statements = []
+        self.queries = []
+        self.submitted = []
+        self.polls_left = {}
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def executed(self, marker):
+        """(statement, params) of the last query that matched marker."""
+        return [(statement, params) for found, statement, params in self.queries if found == marker][-1]
+
+    def get_query_status_throw_if_error(self, query_id):
+        statement = self.submitted[int(query_id.split("-")[1])][0]
+        if self.fail_on and self.fail_on in statement:
+            raise Exception(f"Query {query_id} failed")
+        self.polls_left[query_id] -= 1
+        return "RUNNING" if self.polls_left[query_id] > 0 else "SUCCESS"
+
+    def is_still_running(self, status):
+        return status == "RUNNING"
+
+
+@pytest.fixture
+def automation(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    engine = SPPAutomationEnhanced(config_file=str(tmp_path / "missing.ini"), user_email="test@hdsupply.com")
+    engine.template_config["use_template"] = False
+    engine.performance_config["poll_interval"] = 0
+    return engine
+
+
+@pytest.fixture
+def fake_connection():
+    """FakeConnection(results=None, fail_on=None, batch_rows=None, strict=False)."""
+    return FakeConnection
+
+
+@pytest.fixture
+def attach_connection(automation, monkeypatch):
+    """Attach a FakeConnection built from the given arguments to automation and return it."""
+    def attach(results=None, **options):
+        automation.connection = FakeConnection(results, **options)
+        automation.fetch_engine.use_arrow = False
+        monkeypatch.setattr(automation, "connect_to_snowflake", lambda: True)
+        return automation.connection
+    return attach
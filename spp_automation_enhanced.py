@@ -72,6 +72,12 @@ print(f"Report created: {output_path}")
 print(f"Status: {status}")
 ```
 
+Command line (``--export`` adds Parquet/CSV/Feather/SQLite copies of the tabs):
+
+```
+python spp_automation_enhanced.py --vendors 13479 52889 --month FY2026-JAN --export parquet sqlite
+```
+
 Developer: Ben F. Benjamaa
 Manager: Lauren B. Trapani
 Team: HD Supply Chain Excellence
@@ -79,6 +85,7 @@ Version: 3.0
 Release Date: January 7, 2026
 """
 
+import argparse
 import pandas as pd
 import snowflake.connector
 import os
@@ -86,13 +93,34 @@ import logging
 import shutil
 import json
 import configparser
-from typing import List, Optional, Dict, Tuple, Any
+import time
+import sys
+from typing import List, Optional, Dict, Tuple, Any, Iterator, Union
 from datetime import datetime
 import re
 import openpyxl
 from openpyxl.utils.dataframe import dataframe_to_rows
 from pathlib import Path
 
+from spp_batch import partition_by_month, partition_by_vendor
+from spp_batch_writer import BatchWorkbookWriter
+from spp_excel_writers import SheetPlan, StreamingWorkbookWriter, TAB_SHEETS, clear_data_rows, copy_header_row, \
+    inject_sheet_data, plan_sheets, write_frame_rows
+from spp_export import EXPORT_FORMATS, parse_export_formats, start_export
+from spp_extract_store import IncrementalExtractStore
+from spp_fetch import ArrowFetchEngine, TAB_COLUMN_TYPES, materialize_types
+from spp_fiscal_calendar import ErdatRange, erdat_range, erdat_span, readable_month, report_month_date_filter, \
+    report_months_between
+from spp_query_builder import (BoundQuery, DROP_RUN_KEY_TABLES, PARAMSTYLE, QueryBinds, RUN_KEY_TABLE_STATEMENTS,
+                               RUN_PO_KEY_TABLE,
+                               bind_lifnr_list, bind_run_vendors, bind_vendor_list, month_predicate,
+                               run_vendor_list, vendor_in_list)
+from spp_query_profile import QueryProfiler
+from spp_result_cache import QueryResultCache
+from spp_session import SnowflakeSessionManager
+from spp_summary import derive_summary_metrics
+from spp_template_cache import TemplateCache
+
 class SPPAutomationEnhanced:
     """
     Enhanced SPP Metric Automation Engine with PDH Compliance Tracking.
@@ -105,6 +133,7 @@ class SPPAutomationEnhanced:
         config_file (str): Path to configuration file for Snowflake settings
         user_email (str): HD Supply email address for authentication
         connection (snowflake.connector.SnowflakeConnection): Active database connection
+        session (SnowflakeSessionManager): Owns and reuses the authenticated connection
         logger (logging.Logger): Logger instance for activity tracking
         template_config (Dict): Configuration for Excel template usage
         snowflake_config (Dict): Snowflake connection parameters
@@ -112,12 +141,19 @@ class SPPAutomationEnhanced:
         context_warnings (List[str]): Collection of non-fatal warnings
     
     Key Methods:
-        - connect_to_snowflake(): Establish authenticated database connection
+        - connect_to_snowflake(): Establish or reuse authenticated database connection
+        - close_connection(): End the Snowflake session when the engine is done
         - get_query_0_summary_metrics(): Generate summary KPIs query
+        - get_query_0_asn_success_rate(): Generate the ASN success rate rows of Tab1
+        - derive_summary_metrics(): Compute summary KPIs locally from Tab2 and the ASN success rates
         - get_query_1_basic_metrics(): Generate line-level metrics query
         - get_query_2_asn_data(): Generate ASN compliance query
         - get_query_3_pdh_compliance(): Generate PDH audit query (v3.0)
-        - run_full_automation(): Execute complete automation workflow
+        - load_run_key_tables(): Load the run's vendor and PO/USN keys into session temp tables
+        - run_tab_queries(): Execute the four tab queries (cached, concurrently by default)
+        - run_full_automation(): Execute complete automation workflow (profiled per run)
+        - run_batch_automation(): One query pass, one workbook per vendor
+        - run_range_automation(): One query pass over a month range, per-month or combined output
         - create_standard_excel_file(): Create Excel output without template
         - populate_template_tabs(): Populate user-provided template
     
@@ -130,7 +166,8 @@ class SPPAutomationEnhanced:
         Errors are logged to both file and console with full stack traces.
     """
     
-    def __init__(self, config_file: str = "config.ini", user_email: Optional[str] = None):
+    def __init__(self, config_file: str = "config.ini", user_email: Optional[str] = None,
+                 log_file: Optional[str] = None):
         """
         Initialize the SPP Automation engine with configuration and user credentials.
         
@@ -138,6 +175,8 @@ class SPPAutomationEnhanced:
             config_file (str): Path to Snowflake configuration file. Defaults to "config.ini"
             user_email (Optional[str]): HD Supply email address for authentication.
                                        If None, will attempt to load from config file.
+            log_file (Optional[str]): Existing log file to append to (used by batch
+                                      writer processes). Defaults to a new timestamped file.
         
         The constructor initializes:
         - Logging infrastructure with file and console output
@@ -151,7 +190,7 @@ class SPPAutomationEnhanced:
         self.connection: Optional[snowflake.connector.SnowflakeConnection] = None  # Active Snowflake connection
         
         # Initialize logging system (creates timestamped log file)
-        self.logger = self.setup_logging()
+        self.logger = self.setup_logging(log_file)
         
         # Template configuration for Excel output customization
         self.template_config_file = "template_config.json"  # Template settings file
@@ -160,11 +199,67 @@ class SPPAutomationEnhanced:
         # Load Snowflake connection settings from config.ini
         self.snowflake_config = self.load_snowflake_config()
         
+        # Query execution / output tuning from the [PERFORMANCE] section of config.ini
+        self.performance_config = self.load_performance_config()
+        
+        # Template resolved, read and parsed once per engine (template_cache)
+        self.template_cache = TemplateCache(enabled=self.performance_config["template_cache"], logger=self.logger)
+        
+        # Arrow-native result fetching with fetch time / peak RSS statistics
+        self.fetch_engine = ArrowFetchEngine(
+            use_arrow=self.performance_config["arrow_fetch"],
+            logger=self.logger
+        )
+        
+        # On-disk cache of tab query results (bypass per run with bypass_result_cache)
+        self.result_cache = QueryResultCache(
+            self.performance_config["cache_dir"],
+            ttl_seconds=self.performance_config["cache_ttl_hours"] * 3600,
+            max_size_mb=self.performance_config["cache_max_size_mb"],
+            enabled=self.performance_config["result_cache"],
+            logger=self.logger
+        )
+        self.bypass_result_cache = False
+        
+        # Parquet/CSV/Feather/SQLite copies of each report (the GUI and CLI set them per run)
+        try:
+            self.export_formats = parse_export_formats(self.performance_config["export_formats"])
+        except ValueError as e:
+            self.logger.warning(f"Ignoring export_formats: {e}")
+            self.export_formats = []
+        self.export_only = self.performance_config["export_only"]
+        
+        # Set while the run's vendor/PO keys are loaded into session temp tables
+        self.key_tables_active = False
+        
+        # Watermarked local store of raw ASN lines (incremental re-runs)
+        self.asn_store = IncrementalExtractStore(
+            os.path.join(self.performance_config["extract_dir"], "asn"),
+            overlap_days=self.performance_config["asn_overlap_days"],
+            enabled=self.performance_config["incremental_asn"],
+            logger=self.logger
+        )
+        
+        # Per-run QUERY_TAG, query IDs and warehouse metrics (JSON profile + log)
+        self.profiler = QueryProfiler(
+            self.performance_config["profile_dir"],
+            database=self.performance_config["profile_database"],
+            enabled=self.performance_config["query_profile"],
+            logger=self.logger
+        )
+        
+        # One authenticated session reused across report runs
+        self.session = SnowflakeSessionManager(
+            self._open_snowflake_connection,
+            logger=self.logger,
+            validation_interval=self.snowflake_config["session_validation_interval"]
+        )
+        
         # Error tracking for debugging and user feedback
         self.last_error: str = ""  # Most recent error message
         self.context_warnings: List[str] = []  # Non-fatal warnings during execution
         
-    def setup_logging(self):
+    def setup_logging(self, log_file: Optional[str] = None):
         """
         Configure logging infrastructure for activity tracking and debugging.
         
@@ -183,8 +278,8 @@ class SPPAutomationEnhanced:
             - WARNING: Non-fatal issues, missing templates, context switches
             - ERROR: Fatal errors, connection failures, query errors
         """
-        # Create timestamped log file in current directory
-        log_path = Path.cwd() / f"spp_automation_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+        # Create timestamped log file in current directory (or append to the given one)
+        log_path = Path(log_file) if log_file else Path.cwd() / f"spp_automation_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
         self.log_file = str(log_path)
         logging.basicConfig(
             level=logging.INFO,
@@ -238,7 +333,11 @@ class SPPAutomationEnhanced:
             "warehouse": "WH_SUPPLYCHAIN_ANALYST_XSMALL",
             "database": "DM_SUPPLYCHAIN",
             "role": "SUPPLYCHAIN_ANALYST",
-            "schema": ""
+            "schema": "",
+            "keep_alive": True,
+            "heartbeat_frequency": 900,
+            "session_validation_interval": 300,
+            "cache_sso_token": True
         }
 
         parser = configparser.ConfigParser()
@@ -253,6 +352,12 @@ class SPPAutomationEnhanced:
                             defaults[key] = value
                     if section.get("insecure_mode", "").strip():
                         defaults["insecure_mode"] = section.getboolean("insecure_mode", fallback=True)
+                    for key in ("keep_alive", "cache_sso_token"):
+                        if section.get(key, "").strip():
+                            defaults[key] = section.getboolean(key, fallback=defaults[key])
+                    for key in ("heartbeat_frequency", "session_validation_interval"):
+                        if section.get(key, "").strip():
+                            defaults[key] = section.getint(key, fallback=defaults[key])
             except Exception as exc:
                 self.logger.warning(f"Error loading Snowflake config: {exc}. Using defaults.")
 
@@ -263,6 +368,59 @@ class SPPAutomationEnhanced:
             self.user_email = defaults["user"]
 
         return defaults
+
+    def load_performance_config(self) -> Dict[str, Any]:
+        """Load query execution and output tuning settings from config.ini with sensible defaults."""
+        defaults: Dict[str, Any] = {
+            "concurrent_queries": True,
+            "poll_interval": 1.0,
+            "arrow_fetch": True,
+            "prefetch_threads": 4,
+            "stream_to_sheets": False,
+            "local_summary": True,
+            "scoped_receipts": True,
+            "query_profile": True,
+            "profile_dir": "profiles",
+            "profile_database": "EDP",
+            "batch_workers": 0,
+            "incremental_asn": True,
+            "asn_overlap_days": 3,
+            "extract_dir": "extracts",
+            "result_cache": True,
+            "cache_dir": "cache",
+            "cache_ttl_hours": 12.0,
+            "cache_max_size_mb": 500,
+            "run_key_tables": True,
+            "write_only_excel": True,
+            "template_injection": True,
+            "template_cache": True,
+            "row_overflow": "split",
+            "export_formats": "",
+            "export_only": False,
+            "typed_results": True
+        }
+
+        parser = configparser.ConfigParser()
+        if os.path.exists(self.config_file):
+            try:
+                parser.read(self.config_file)
+                if parser.has_section("PERFORMANCE"):
+                    section = parser["PERFORMANCE"]
+                    for key, default in defaults.items():
+                        if not section.get(key, "").strip():
+                            continue
+                        if isinstance(default, bool):
+                            defaults[key] = section.getboolean(key, fallback=default)
+                        elif isinstance(default, int):
+                            defaults[key] = section.getint(key, fallback=default)
+                        elif isinstance(default, float):
+                            defaults[key] = section.getfloat(key, fallback=default)
+                        else:
+                            defaults[key] = section.get(key).strip()
+            except Exception as exc:
+                self.logger.warning(f"Error loading performance config: {exc}. Using defaults.")
+
+        return defaults
     
     def save_template_config(self, config: Dict) -> None:
         """Save template configuration to JSON file."""
@@ -286,41 +444,32 @@ class SPPAutomationEnhanced:
         self.logger.info(f"Template config updated: Path={template_path}, Use={use_template}, Format={output_format}")
     
     def find_template_file(self) -> Optional[str]:
-        """Find template file using configured path or search paths."""
-        # First check if user has specified a custom path
-        if self.template_config.get("template_path") and os.path.exists(self.template_config["template_path"]):
-            self.logger.info(f"Using user-specified template: {self.template_config['template_path']}")
-            return self.template_config["template_path"]
-        
-        # Search in predefined locations
-        template_name = self.template_config.get("template_name", "SPP_Template.xlsm")
-        search_paths = self.template_config.get("search_paths", [])
-        
-        for search_path in search_paths:
-            template_path = os.path.join(search_path, template_name)
-            if os.path.exists(template_path):
-                self.logger.info(f"Found template at: {template_path}")
-                return template_path
-        
-        self.logger.warning(f"Template file '{template_name}' not found in any search paths")
-        return None
+        """
+        Find template file using configured path or search paths.
+        
+        The result is kept by self.template_cache until the template
+        configuration changes, so the search paths are not re-statted for
+        every report.
+        """
+        return self.template_cache.resolve(self.template_config)
     
     def connect_to_snowflake(self) -> bool:
         """
         Establish authenticated connection to Snowflake cloud data warehouse.
         
         Uses external browser authentication (SSO) for secure access without
-        storing passwords. Opens system browser for authentication, then
-        establishes database connection with configured warehouse, database,
-        and role settings.
+        storing passwords. The first call opens the system browser for
+        authentication and sets the warehouse, database, and role context;
+        later calls reuse the same session through self.session, so a batch of
+        reports costs a single login.
         
         Authentication Flow:
         -------------------
         1. Validates user email is present
-        2. Opens system browser for SSO authentication
-        3. User completes authentication in browser (2-minute timeout)
+        2. Reuses the live session if it passes the health check
+        3. Otherwise opens system browser for SSO authentication (2-minute timeout)
         4. Connection established upon successful auth
-        5. Sets database context (warehouse, database, role)
+        5. Sets database context (warehouse, database, role) on new sessions only
         
         Returns:
             bool: True if connection successful, False otherwise
@@ -336,6 +485,7 @@ class SPPAutomationEnhanced:
             - Authenticator: externalbrowser (SSO)
             - Insecure Mode: True (for internal network compatibility)
             - Login Timeout: 120 seconds
+            - Session Keep-Alive: heartbeat every 900 seconds (or from config)
         
         Database Context:
             - Warehouse: WH_SUPPLYCHAIN_ANALYST_XSMALL (or from config)
@@ -347,37 +497,15 @@ class SPPAutomationEnhanced:
             for user feedback. Returns False on any failure.
         """
         try:
-            settings = self.snowflake_config.copy()
             self.last_error = ""
-            self.context_warnings = []
 
-            user = self.user_email or settings.get("user")
+            user = self.user_email or self.snowflake_config.get("user")
             if not user:
                 self.last_error = "HD Supply email address is required for Snowflake authentication."
                 self.logger.error(self.last_error)
                 return False
 
-            account = settings.get("account", "HDSUPPLY-DATA")
-            authenticator = settings.get("authenticator", "externalbrowser")
-            insecure_mode = settings.get("insecure_mode", True)
-
-            self.logger.info(
-                "Connecting to Snowflake | user=%s account=%s authenticator=%s insecure_mode=%s",
-                user,
-                account,
-                authenticator,
-                insecure_mode,
-            )
-
-            connect_kwargs = {
-                "user": user,
-                "account": account,
-                "authenticator": authenticator,
-                "insecure_mode": insecure_mode,
-                "login_timeout": 120,
-            }
-
-            self.connection = snowflake.connector.connect(**connect_kwargs)
+            self.connection = self.session.get_connection()
 
             if not self.connection:
                 self.last_error = "Snowflake connection returned None." \
@@ -385,58 +513,108 @@ class SPPAutomationEnhanced:
                 self.logger.error(self.last_error)
                 return False
 
-            cursor = self.connection.cursor()
-            try:
-                cursor.execute("SELECT CURRENT_USER(), CURRENT_ACCOUNT(), CURRENT_ROLE()")
-                current_details = cursor.fetchone()
-                if current_details:
-                    self.logger.info(
-                        "Authenticated as user=%s | account=%s | role=%s",
-                        current_details[0],
-                        current_details[1],
-                        current_details[2],
-                    )
-
-                context_commands = []
-                if settings.get("database"):
-                    context_commands.append((
-                        f"USE DATABASE {settings['database']}",
-                        f"database {settings['database']}"
-                    ))
-                if settings.get("warehouse"):
-                    context_commands.append((
-                        f"USE WAREHOUSE {settings['warehouse']}",
-                        f"warehouse {settings['warehouse']}"
-                    ))
-                if settings.get("role"):
-                    context_commands.append((
-                        f"USE ROLE {settings['role']}",
-                        f"role {settings['role']}"
-                    ))
-
-                for command, description in context_commands:
-                    try:
-                        cursor.execute(command)
-                        self.logger.info("Context set: %s", description)
-                    except Exception as context_error:
-                        warning_msg = f"Unable to set {description}: {context_error}"
-                        self.logger.warning(warning_msg)
-
-            finally:
-                cursor.close()
-
             self.last_error = ""
-
-            self.logger.info("Snowflake connection established successfully")
             return True
 
         except Exception as e:
+            self.connection = None
             self.last_error = f"Failed to connect to Snowflake: {e}"
             self.logger.error(self.last_error)
             self.logger.error("Error type: %s", type(e).__name__)
             return False
+
+    def _open_snowflake_connection(self) -> snowflake.connector.SnowflakeConnection:
+        """
+        Open a new Snowflake connection and set its database context.
+        
+        Used as the connect factory of self.session; only called when there is
+        no reusable session. Raises on authentication failure.
+        """
+        settings = self.snowflake_config.copy()
+        self.context_warnings = []
+
+        user = self.user_email or settings.get("user")
+        account = settings.get("account", "HDSUPPLY-DATA")
+        authenticator = settings.get("authenticator", "externalbrowser")
+        insecure_mode = settings.get("insecure_mode", True)
+
+        self.logger.info(
+            "Connecting to Snowflake | user=%s account=%s authenticator=%s insecure_mode=%s",
+            user,
+            account,
+            authenticator,
+            insecure_mode,
+        )
+
+        connect_kwargs = {
+            "user": user,
+            "account": account,
+            "authenticator": authenticator,
+            "insecure_mode": insecure_mode,
+            "login_timeout": 120,
+            "client_session_keep_alive": settings.get("keep_alive", True),
+            "client_session_keep_alive_heartbeat_frequency": settings.get("heartbeat_frequency", 900),
+            "client_store_temporary_credential": settings.get("cache_sso_token", True),
+            "client_prefetch_threads": self.performance_config.get("prefetch_threads", 4),
+            # Server-side binding for the parameterized tab queries (:1, :2, ...)
+            "paramstyle": PARAMSTYLE,
+        }
+
+        connection = snowflake.connector.connect(**connect_kwargs)
+        if not connection:
+            return connection
+
+        cursor = connection.cursor()
+        try:
+            cursor.execute("SELECT CURRENT_USER(), CURRENT_ACCOUNT(), CURRENT_ROLE()")
+            current_details = cursor.fetchone()
+            if current_details:
+                self.logger.info(
+                    "Authenticated as user=%s | account=%s | role=%s",
+                    current_details[0],
+                    current_details[1],
+                    current_details[2],
+                )
+
+            context_commands = []
+            if settings.get("database"):
+                context_commands.append((
+                    f"USE DATABASE {settings['database']}",
+                    f"database {settings['database']}"
+                ))
+            if settings.get("warehouse"):
+                context_commands.append((
+                    f"USE WAREHOUSE {settings['warehouse']}",
+                    f"warehouse {settings['warehouse']}"
+                ))
+            if settings.get("role"):
+                context_commands.append((
+                    f"USE ROLE {settings['role']}",
+                    f"role {settings['role']}"
+                ))
+
+            for command, description in context_commands:
+                try:
+                    cursor.execute(command)
+                    self.logger.info("Context set: %s", description)
+                except Exception as context_error:
+                    warning_msg = f"Unable to set {description}: {context_error}"
+                    self.logger.warning(warning_msg)
+                    self.context_warnings.append(warning_msg)
+
+        finally:
+            cursor.close()
+
+        self.logger.info("Snowflake connection established successfully")
+        return connection
+
+    def close_connection(self) -> None:
+        """Close the reusable Snowflake session (call when the engine is no longer needed)."""
+        self.session.close()
+        self.connection = None
     
-    def get_query_0_summary_metrics(self, vendor_numbers: List[str], report_month: str, date_filter: str) -> str:
+    def get_query_0_summary_metrics(self, vendor_numbers: List[str], report_month: Union[str, List[str]],
+                                    date_filter: str, asn_dates: Optional[ErdatRange] = None) -> BoundQuery:
         """
         Generate SQL query for Tab1 - Summary Metrics with KPI percentages.
         
@@ -448,11 +626,16 @@ class SPPAutomationEnhanced:
         
         Args:
             vendor_numbers (List[str]): List of vendor numbers to filter (e.g., ["13479", "52889"])
-            report_month (str): Fiscal report month in format "FY2026-JAN"
+            report_month (Union[str, List[str]]): Fiscal report month in format "FY2026-JAN",
+                or a list of months for a multi-month range run
             date_filter (str): Date filter in YYYYMM format (e.g., "202601")
+            asn_dates (Optional[ErdatRange]): ERDAT range overriding the one derived
+                from date_filter (multi-month range runs)
         
         Returns:
-            str: Formatted SQL query string ready for execution
+            BoundQuery: SQL text with bind values (vendors :1, month(s) :2, padded
+            LIFNR values :3, ERDAT range :4 - :5; without the vendor binds while
+            the run key tables are loaded)
         
         Data Sources:
             - DM_SUPPLYCHAIN.VENDOR_PERFORMANCE.COMBINED_IPR_IB_VENDOR_PERFORMANCE (Metrics)
@@ -464,10 +647,16 @@ class SPPAutomationEnhanced:
             - CTE 3 (ASN_Metric): Calculated ASN success rate
             - Final: UNION ALL to combine metrics with ASN rate
         """
-        # Join vendor numbers into SQL-safe comma-separated string
-        vendor_filter = "', '".join(vendor_numbers)
+        # Vendor list is bound as one JSON array (or read from the run key
+        # table) so the statement text never changes
+        asn_dates = asn_dates or erdat_range(report_month, date_filter)
+        binds = QueryBinds()
+        vendor_filter = self._vendor_filter(binds, vendor_numbers)
+        month_filter = binds.add_month(report_month)
+        lifnr_filter = self._vendor_filter(binds, vendor_numbers, lifnr=True)
+        erdat_start, erdat_end = binds.add(asn_dates.start), binds.add(asn_dates.end)
         
-        return f"""
+        sql = f"""
 WITH Metric_Data AS (
     SELECT
         RPT_MONTH,
@@ -481,13 +670,49 @@ WITH Metric_Data AS (
         TO_CHAR((SUM(METRIC_NUMERATOR)/SUM(METRIC_DENOMINATOR)) * 100, 'FM999.9') || '%' AS Metric_Percentage
     FROM DM_SUPPLYCHAIN.VENDOR_PERFORMANCE.COMBINED_IPR_IB_VENDOR_PERFORMANCE
     WHERE 
-        VENDOR_NUMBER IN ('{vendor_filter}')  -- Metric Data Vendor Filter
-        AND RPT_MONTH like '{report_month}' -- Metric Data Month Filter
+        VENDOR_NUMBER IN {vendor_filter}  -- Metric Data Vendor Filter
+        AND {month_filter} -- Metric Data Month Filter
         AND METRIC IN ('First_Receipt_FR_B1D', 'First_Receipt_FR_B28D', 'Units_On_Time_Complete')
     GROUP BY RPT_MONTH, VENDOR_NUMBER, VENDOR_NAME, MetricType
 ),
 
-ASN_Data AS (
+{self._asn_metric_ctes(lifnr_filter, erdat_start, erdat_end)}
+
+SELECT * FROM Metric_Data
+UNION ALL
+SELECT * FROM ASN_Metric
+ORDER BY VENDOR_NUMBER, MetricType
+"""
+        return binds.query(sql, self._key_table_context(vendor_numbers))
+
+    def get_query_0_asn_success_rate(self, vendor_numbers: List[str], report_month: Union[str, List[str]],
+                                     date_filter: str, asn_dates: Optional[ErdatRange] = None) -> BoundQuery:
+        """
+        Generate the ASN Success Rate rows of Tab1 on their own.
+        
+        Used when the other summary KPIs are derived locally (see
+        derive_summary_metrics()): the rate counts every inbound line of
+        LIKP/LIPS, including materials without a MARA record, which the
+        Tab3 query drops, so it cannot be computed from Tab3. Same rows,
+        columns and binds (without the month) as the ASN_Metric part of
+        get_query_0_summary_metrics().
+        """
+        asn_dates = asn_dates or erdat_range(report_month, date_filter)
+        binds = QueryBinds()
+        lifnr_filter = self._vendor_filter(binds, vendor_numbers, lifnr=True)
+        erdat_start, erdat_end = binds.add(asn_dates.start), binds.add(asn_dates.end)
+        
+        sql = f"""
+WITH {self._asn_metric_ctes(lifnr_filter, erdat_start, erdat_end)}
+
+SELECT * FROM ASN_Metric
+ORDER BY VENDOR_NUMBER, MetricType
+"""
+        return binds.query(sql, self._key_table_context(vendor_numbers))
+    
+    def _asn_metric_ctes(self, lifnr_filter: str, erdat_start: str, erdat_end: str) -> str:
+        """ASN_Data and ASN_Metric CTEs of the summary queries."""
+        return f"""ASN_Data AS (
     SELECT
         LTRIM(IH.LIFNR, 0) AS Vendor_Number,
         V.NAME1 AS Vendor_Name,
@@ -513,8 +738,8 @@ ASN_Data AS (
         AND IH.VBELN = IL.VBELN
     WHERE IH.MANDT = '300'
         AND IH.LFART = 'ZEL'
-        AND LTRIM(IH.LIFNR, 0) IN ('{vendor_filter}') -- ASN Supplier Filter
-        AND IH.ERDAT LIKE '{date_filter}%' -- ASN Month Filter
+        AND IH.LIFNR IN {lifnr_filter} -- ASN Supplier Filter (padded LIFNR)
+        AND IH.ERDAT >= {erdat_start} AND IH.ERDAT < {erdat_end} -- ASN Month Filter (prunable range)
 ),
 
 ASN_Metric AS (
@@ -527,19 +752,88 @@ ASN_Metric AS (
     FROM ASN_Data
     
     GROUP BY RPT_MONTH, Vendor_Number, Vendor_Name
-)
+)"""
+    
+    def get_query_1_basic_metrics(self, vendor_numbers: List[str], report_month: Union[str, List[str]],
+                                  scoped_receipts: Optional[bool] = None) -> BoundQuery:
+        """
+        Generate Query 1 - Enhanced Basic Metrics with receipt data and updated metric names.
+        
+        In scoped receipts mode (``scoped_receipts`` in the [PERFORMANCE] section,
+        default on) the EKBE and PO visibility receipt scans are restricted to the
+        PO/USN keys present in primary_metric instead of aggregating every receipt
+        before the left join. The result is the same either way. A list of
+        report months selects all of them (multi-month range runs). While the
+        run key tables are loaded the keys come from SPP_RUN_PO_KEYS.
+        """
+        binds = QueryBinds()
+        vendor_filter = self._vendor_filter(binds, vendor_numbers)
+        month_filter = binds.add_month(report_month)
+        if scoped_receipts is None:
+            scoped_receipts = self.performance_config.get("scoped_receipts", True)
+        
+        if scoped_receipts:
+            if self.key_tables_active:
+                # PO/USN keys were loaded once for the run
+                receipt_keys = f"SELECT PO_NUMBER, METRIC_CONCATENATE AS Metric_Concatenate FROM {RUN_PO_KEY_TABLE}"
+            else:
+                receipt_keys = """SELECT DISTINCT
+        TO_CHAR(PO_NUMBER) AS PO_NUMBER,
+        Metric_Concatenate
+    FROM primary_metric"""
+            receipt_ctes = f"""
+receipt_keys AS (
+    {receipt_keys}
+),
 
-SELECT * FROM Metric_Data
-UNION ALL
-SELECT * FROM ASN_Metric
-ORDER BY VENDOR_NUMBER, MetricType
-"""
+hds_receipts AS (
+    SELECT 
+        CONCAT(e.ebeln, ':', LTRIM(e.MATNR, '0')) AS Metric_Concatenate,
+        MAX(TRY_TO_DATE(TO_CHAR(e.budat), 'yyyymmdd')) AS receipt_date,
+        a.MIC
+    FROM EDP.STD_ECC.EKBE e
+    LEFT JOIN DM_SUPPLYCHAIN.IA_ATLAS.ATLAS a
+        ON LTRIM(e.MATNR, '0') = LTRIM(a.MATERIAL, '0')
+    WHERE e.bwart IN ('101', '102')
+        AND e.ebeln IN (SELECT PO_NUMBER FROM receipt_keys) -- Scope to reported POs
+        AND CONCAT(e.ebeln, ':', LTRIM(e.MATNR, '0')) IN (SELECT Metric_Concatenate FROM receipt_keys)
+    GROUP BY e.ebeln, e.MATNR, a.MIC
+),
+
+hdp_receipts AS (
+    SELECT
+        CONCAT(PO_NUMBER, ':', USN) AS Metric_Concatenate,
+        MAX(TO_DATE(DATE_RECEIVED)) AS receipt_date,
+        MANUFACTURER_PART_NUMBER AS MIC
+    FROM DM_SUPPLYCHAIN.PRO_INVENTORY_ANALYTICS.REPORT_PURCHASE_ORDER_VISIBILITY_SHIPMENTS
+    WHERE TO_CHAR(PO_NUMBER) IN (SELECT PO_NUMBER FROM receipt_keys) -- Scope to reported POs
+        AND CONCAT(PO_NUMBER, ':', USN) IN (SELECT Metric_Concatenate FROM receipt_keys)
+    GROUP BY PO_NUMBER, USN, MANUFACTURER_PART_NUMBER
+),"""
+        else:
+            receipt_ctes = """
+hds_receipts AS (
+    SELECT 
+        CONCAT(e.ebeln, ':', LTRIM(e.MATNR, '0')) AS Metric_Concatenate,
+        MAX(TRY_TO_DATE(TO_CHAR(e.budat), 'yyyymmdd')) AS receipt_date,
+        a.MIC
+    FROM EDP.STD_ECC.EKBE e
+    LEFT JOIN DM_SUPPLYCHAIN.IA_ATLAS.ATLAS a
+        ON LTRIM(e.MATNR, '0') = LTRIM(a.MATERIAL, '0')
+    WHERE e.bwart IN ('101', '102')
+    GROUP BY e.ebeln, e.MATNR, a.MIC
+),
 
-    def get_query_1_basic_metrics(self, vendor_numbers: List[str], report_month: str) -> str:
-        """Generate Query 1 - Enhanced Basic Metrics with receipt data and updated metric names."""
-        vendor_filter = "', '".join(vendor_numbers)
+hdp_receipts AS (
+    SELECT
+        CONCAT(PO_NUMBER, ':', USN) AS Metric_Concatenate,
+        MAX(TO_DATE(DATE_RECEIVED)) AS receipt_date,
+        MANUFACTURER_PART_NUMBER AS MIC
+    FROM DM_SUPPLYCHAIN.PRO_INVENTORY_ANALYTICS.REPORT_PURCHASE_ORDER_VISIBILITY_SHIPMENTS
+    GROUP BY PO_NUMBER, USN, MANUFACTURER_PART_NUMBER
+),"""
         
-        return f"""
+        sql = f"""
 WITH primary_metric AS (
     SELECT
         VENDOR_NUMBER,
@@ -567,31 +861,11 @@ WITH primary_metric AS (
         NETWORK
     FROM DM_SUPPLYCHAIN.VENDOR_PERFORMANCE.COMBINED_IPR_IB_VENDOR_PERFORMANCE
     WHERE 
-        VENDOR_NUMBER IN ('{vendor_filter}') -- Supplier Filter
-        AND RPT_MONTH LIKE '{report_month}' -- Month Filter
+        VENDOR_NUMBER IN {vendor_filter} -- Supplier Filter
+        AND {month_filter} -- Month Filter
         AND METRIC IN ('First_Receipt_FR_B1D', 'First_Receipt_FR_B28D', 'Units_On_Time_Complete')
 ),
-
-hds_receipts AS (
-    SELECT 
-        CONCAT(e.ebeln, ':', LTRIM(e.MATNR, '0')) AS Metric_Concatenate,
-        MAX(TRY_TO_DATE(TO_CHAR(e.budat), 'yyyymmdd')) AS receipt_date,
-        a.MIC
-    FROM EDP.STD_ECC.EKBE e
-    LEFT JOIN DM_SUPPLYCHAIN.IA_ATLAS.ATLAS a
-        ON LTRIM(e.MATNR, '0') = LTRIM(a.MATERIAL, '0')
-    WHERE e.bwart IN ('101', '102')
-    GROUP BY e.ebeln, e.MATNR, a.MIC
-),
-
-hdp_receipts AS (
-    SELECT
-        CONCAT(PO_NUMBER, ':', USN) AS Metric_Concatenate,
-        MAX(TO_DATE(DATE_RECEIVED)) AS receipt_date,
-        MANUFACTURER_PART_NUMBER AS MIC
-    FROM DM_SUPPLYCHAIN.PRO_INVENTORY_ANALYTICS.REPORT_PURCHASE_ORDER_VISIBILITY_SHIPMENTS
-    GROUP BY PO_NUMBER, USN, MANUFACTURER_PART_NUMBER
-),
+{receipt_ctes}
 
 combined_receipts AS (
     SELECT
@@ -631,12 +905,25 @@ FROM primary_metric pm
 LEFT JOIN combined_receipts cr
     ON pm.Metric_Concatenate = cr.Metric_Concatenate
 """
+        return binds.query(sql, self._key_table_context(vendor_numbers))
     
-    def get_query_2_asn_data(self, vendor_numbers: List[str], date_filter: str) -> str:
-        """Generate Query 2 - ASN Data using LIKP/LIPS/LFA1 delivery tables."""
-        vendor_filter = "', '".join(vendor_numbers)
+    def get_query_2_asn_data(self, vendor_numbers: List[str], date_filter: str,
+                             report_month: Optional[str] = None,
+                             asn_dates: Optional[ErdatRange] = None) -> BoundQuery:
+        """
+        Generate Query 2 - ASN Data using LIKP/LIPS/LFA1 delivery tables.
+        
+        LIKP is filtered on the stored (zero-padded) LIFNR and an explicit ERDAT
+        range so Snowflake can prune partitions; report_month is only used for
+        the range when date_filter is empty. asn_dates overrides both
+        (multi-month range runs).
+        """
+        asn_dates = asn_dates or erdat_range(report_month, date_filter)
+        binds = QueryBinds()
+        vendor_filter = self._vendor_filter(binds, vendor_numbers, lifnr=True)
+        erdat_start, erdat_end = binds.add(asn_dates.start), binds.add(asn_dates.end)
         
-        return f"""
+        sql = f"""
 SELECT
     CASE 
         WHEN IH.VBELN LIKE '06%' AND IH.ERNAM IN ('BPAREMOTE', 'SCEBATCH', 'P2P_IDOC', 'P2PBATCH') THEN 'ASN'
@@ -680,11 +967,12 @@ INNER JOIN EDP.STD_ECC.MARA M
 
 WHERE IH.MANDT = '300'
     AND IH.LFART = 'ZEL'
-    AND LTRIM(IH.LIFNR, 0) IN ('{vendor_filter}') -- Ensure you're filtering the trimmed version
-    AND IH.ERDAT LIKE '{date_filter}%' -- Filter for December 2024
+    AND IH.LIFNR IN {vendor_filter} -- Supplier Filter (padded LIFNR)
+    AND IH.ERDAT >= {erdat_start} AND IH.ERDAT < {erdat_end} -- Month Filter (prunable range)
 """
+        return binds.query(sql, self._key_table_context(vendor_numbers))
     
-    def get_query_3_pdh_compliance(self, vendor_numbers: List[str]) -> str:
+    def get_query_3_pdh_compliance(self, vendor_numbers: List[str]) -> BoundQuery:
         """
         Generate SQL query for Tab4 - PDH (Product Data Hub) Compliance Tracking.
         
@@ -709,7 +997,7 @@ WHERE IH.MANDT = '300'
             vendor_numbers (List[str]): List of vendor numbers to filter (e.g., ["13479"])
         
         Returns:
-            str: Formatted SQL query string for PDH compliance data
+            BoundQuery: SQL text with the vendor list bound as :1
         
         Data Sources:
             - EDP.STD_ENABLE.EW_VW_MAINTENANCE_REQUESTS_STG (Request records)
@@ -732,10 +1020,11 @@ WHERE IH.MANDT = '300'
             - Days_Past: Lesser of the two above (first action taken)
             - Days_Since_Request: Days from request to current date
         """
-        # Join vendor numbers into SQL-safe comma-separated string for IN clause
-        vendor_filter = "', '".join(vendor_numbers)
+        # Vendor list is bound as one JSON array for the IN clause
+        binds = QueryBinds()
+        vendor_filter = self._vendor_filter(binds, vendor_numbers)
         
-        return f"""
+        sql = f"""
 With primary_request As (
     Select
         InternalRecordID,
@@ -747,7 +1036,7 @@ With primary_request As (
         Request_Type
     From EDP.STD_ENABLE.EW_VW_MAINTENANCE_REQUESTS_STG
     Where REQUEST_INITITATOR_TYPE = 'HDS Initiated'
-    And Supplier_Name in ('{vendor_filter}')
+    And Supplier_Name in {vendor_filter}
 ),
 
 primary_approval As (
@@ -919,9 +1208,69 @@ Supplier_Action
 FROM split_rows
 ORDER BY Request_ID, token_index
 """
+        return binds.query(sql, self._key_table_context(vendor_numbers))
     
-    def execute_query(self, query: str) -> pd.DataFrame:
-        """Execute a query and return results as DataFrame."""
+    def _vendor_filter(self, binds: QueryBinds, vendor_numbers: List[str], lifnr: bool = False) -> str:
+        """IN-list subquery of the run's vendors (or their padded LIFNR values)."""
+        if self.key_tables_active:
+            return run_vendor_list("LIFNR" if lifnr else "VENDOR_NUMBER")
+        values = bind_lifnr_list(vendor_numbers) if lifnr else bind_vendor_list(vendor_numbers)
+        return vendor_in_list(binds.add(values))
+    
+    def _key_table_context(self, vendor_numbers: List[str]) -> Tuple:
+        """Result cache context of a query reading the run key tables."""
+        return (bind_vendor_list(vendor_numbers),) if self.key_tables_active else ()
+    
+    def load_run_key_tables(self, vendor_numbers: List[str], report_month: Union[str, List[str]]) -> bool:
+        """
+        Load the vendors and the PO/USN keys of the run into session temporary tables.
+        
+        While they are loaded (key_tables_active) every tab query reads
+        SPP_RUN_VENDORS / SPP_RUN_PO_KEYS instead of binding the vendor list
+        itself. If the tables cannot be created (e.g. no current schema to
+        hold them) the queries keep their JSON binds.
+        
+        Returns:
+            bool: True if the key tables are loaded
+        """
+        self.key_tables_active = False
+        if not self.performance_config.get("run_key_tables", True) or not self.connection:
+            return False
+        
+        vendor_table, po_key_table = RUN_KEY_TABLE_STATEMENTS
+        month_filter, month_value = month_predicate(report_month, ":1")
+        try:
+            cursor = self.connection.cursor()
+            try:
+                cursor.execute(vendor_table, (bind_run_vendors(vendor_numbers),))
+                cursor.execute(po_key_table.format(month_filter=month_filter), (month_value,))
+            finally:
+                cursor.close()
+        except Exception as e:
+            self.logger.warning(f"Could not load run key tables, binding vendor lists per query: {e}")
+            return False
+        
+        self.key_tables_active = True
+        self.logger.info(f"Loaded run key tables for {len(vendor_numbers)} vendors")
+        return True
+    
+    def drop_run_key_tables(self) -> None:
+        """Drop the run key tables; the tab queries go back to binding vendor lists."""
+        if not self.key_tables_active:
+            return
+        self.key_tables_active = False
+        try:
+            cursor = self.connection.cursor()
+            try:
+                for statement in DROP_RUN_KEY_TABLES:
+                    cursor.execute(statement)
+            finally:
+                cursor.close()
+        except Exception as e:
+            self.logger.warning(f"Could not drop run key tables: {e}")
+    
+    def execute_query(self, query: BoundQuery, name: str = "query") -> pd.DataFrame:
+        """Execute a query with its bind values and return results as DataFrame."""
         try:
             if not self.connection:
                 raise Exception("No active Snowflake connection")
@@ -930,16 +1279,10 @@ ORDER BY Request_ID, token_index
             cursor = self.connection.cursor()
             
             # Execute query - now single statement since database context is set in connection
-            cursor.execute(query)
-            
-            # Get column names
-            columns = [desc[0] for desc in cursor.description] if cursor.description else []
+            cursor.execute(query.sql, query.params)
             
-            # Fetch data
-            data = cursor.fetchall()
-            
-            # Create DataFrame
-            df = pd.DataFrame(data, columns=columns)
+            df = self.fetch_engine.fetch_dataframe(cursor, self.tab_column_types(name), name)
+            self.profiler.record(name, getattr(cursor, "sfqid", None), rows=len(df))
             
             self.logger.info(f"Query executed successfully. Retrieved {len(df)} rows.")
             cursor.close()
@@ -950,6 +1293,313 @@ ORDER BY Request_ID, token_index
             self.logger.error(f"Error executing query: {e}")
             raise
     
+    def execute_query_arrow(self, query: BoundQuery):
+        """Execute a query and return results as a columnar pyarrow.Table."""
+        try:
+            if not self.connection:
+                raise Exception("No active Snowflake connection")
+            
+            self.logger.info("Executing Snowflake query (Arrow)...")
+            cursor = self.connection.cursor()
+            try:
+                cursor.execute(query.sql, query.params)
+                table = self.fetch_engine.fetch_table(cursor)
+            finally:
+                cursor.close()
+            
+            self.logger.info(f"Query executed successfully. Retrieved {table.num_rows} rows.")
+            return table
+            
+        except Exception as e:
+            self.logger.error(f"Error executing query: {e}")
+            raise
+    
+    def tab_column_types(self, name: str) -> Optional[Dict[str, str]]:
+        """Column dtypes a tab's result is converted to at fetch time (None when typed_results is off)."""
+        if not self.performance_config.get("typed_results", True):
+            return None
+        return TAB_COLUMN_TYPES.get(name)
+    
+    def build_tab_queries(self, vendor_numbers: List[str], report_month: Union[str, List[str]],
+                          date_filter: str, include_summary: bool = True,
+                          asn_dates: Optional[ErdatRange] = None) -> Dict[str, BoundQuery]:
+        """
+        Build the tab queries keyed by data_dict name, in tab order.
+        
+        With include_summary=False the Summary_Metrics query is replaced by
+        the ASN_Success_Rate query because the other KPIs of the tab are
+        derived locally (see derive_summary_metrics()). A list of report
+        months plus an asn_dates range builds the queries of a multi-month
+        range run (see run_range_automation()).
+        """
+        queries = {}
+        if include_summary:
+            queries['Summary_Metrics'] = self.get_query_0_summary_metrics(vendor_numbers, report_month, date_filter,
+                                                                          asn_dates)
+        else:
+            queries['ASN_Success_Rate'] = self.get_query_0_asn_success_rate(vendor_numbers, report_month,
+                                                                            date_filter, asn_dates)
+        queries['Basic_Metrics'] = self.get_query_1_basic_metrics(vendor_numbers, report_month)
+        asn_month = report_month if isinstance(report_month, str) else None
+        queries['ASN_Data'] = self.get_query_2_asn_data(vendor_numbers, date_filter, asn_month, asn_dates)
+        queries['PDH_Compliance'] = self.get_query_3_pdh_compliance(vendor_numbers)
+        return queries
+    
+    def fetch_tab_results(self, vendor_numbers: List[str], report_month: Union[str, List[str]],
+                          date_filter: str, asn_dates: Optional[ErdatRange] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch all four tabs for a report, keyed by data_dict name in tab order.
+        
+        The summary tab is derived from Tab2 and the ASN success rate query
+        unless local_summary is off.
+        With incremental_asn enabled, ASN lines come from the local extract
+        store and only the ERDAT days not yet settled there are queried
+        (bypass_result_cache forces a full re-fetch of the window). With
+        run_key_tables enabled the vendor and PO/USN keys are loaded into
+        session temporary tables while the queries not served from the
+        result cache run; a fully cached run never creates them.
+        """
+        local_summary = self.performance_config.get("local_summary", True)
+        asn_window = asn_fetch = None
+        if self.asn_store.enabled:
+            asn_window = asn_dates or erdat_range(report_month if isinstance(report_month, str) else None, date_filter)
+            asn_fetch = self.asn_store.plan(vendor_numbers, asn_window, refresh=self.bypass_result_cache)
+        
+        def build_queries() -> Dict[str, BoundQuery]:
+            queries = self.build_tab_queries(vendor_numbers, report_month, date_filter,
+                                             include_summary=not local_summary, asn_dates=asn_dates)
+            if asn_window is not None and asn_fetch is None:
+                del queries['ASN_Data']
+            elif asn_window is not None:
+                queries['ASN_Data'] = self.get_query_2_asn_data(vendor_numbers, date_filter, asn_dates=asn_fetch)
+            return queries
+        
+        with self.profiler.phase("queries"):
+            # Looked up with the vendor list bound into each query, the form results are cached under
+            queries = build_queries()
+            results, missing = self.cached_tab_results(queries)
+            if missing:
+                self.load_run_key_tables(vendor_numbers, report_month)
+                try:
+                    # Rebuilt so that they read the key tables when those could be loaded
+                    to_execute = build_queries()
+                    fetched = self._execute_tab_queries({name: to_execute[name] for name in missing})
+                finally:
+                    self.drop_run_key_tables()
+                for name, df in fetched.items():
+                    self.result_cache.put(queries[name], df)
+                    results[name] = df
+            
+            if asn_window is not None:
+                merged = self.asn_store.merge(vendor_numbers, asn_window, asn_fetch, results.get('ASN_Data'))
+                # Extracts stored before typed_results was enabled still hold date/Decimal objects
+                results['ASN_Data'] = materialize_types(merged, self.tab_column_types('ASN_Data'), self.logger,
+                                                        'ASN_Data')
+            if local_summary:
+                results['Summary_Metrics'] = self.derive_summary_metrics(results['Basic_Metrics'],
+                                                                         results['ASN_Success_Rate'])
+        
+        return {name: results[name] for name in TAB_SHEETS}
+    
+    def run_tab_queries(self, queries: Dict[str, BoundQuery]) -> Dict[str, pd.DataFrame]:
+        """
+        Execute the tab queries and return their results keyed by tab.
+        
+        Results still fresh in the local result cache are served from disk
+        (unless bypass_result_cache is set); only the remaining queries go to
+        Snowflake, and their results are written back to the cache.
+        """
+        results, missing = self.cached_tab_results(queries)
+        if missing:
+            for name, df in self._execute_tab_queries({name: queries[name] for name in missing}).items():
+                self.result_cache.put(queries[name], df)
+                results[name] = df
+        
+        return {name: results[name] for name in queries}
+    
+    def cached_tab_results(self, queries: Dict[str, BoundQuery]) -> Tuple[Dict[str, pd.DataFrame], List[str]]:
+        """
+        Serve the tab queries still fresh in the result cache.
+        
+        Returns:
+            Tuple[Dict[str, pd.DataFrame], List[str]]: Cached results by tab
+            and the names of the queries that have to run on Snowflake
+        """
+        results: Dict[str, pd.DataFrame] = {}
+        missing: List[str] = []
+        for name, query in queries.items():
+            cached = None if self.bypass_result_cache else self.result_cache.get(query)
+            if cached is not None:
+                self.logger.info(f"{name} served from result cache ({len(cached)} rows)")
+                self.profiler.record(name, rows=len(cached), source="result_cache")
+                # Entries cached before typed_results was enabled are typed on the way out
+                results[name] = materialize_types(cached, self.tab_column_types(name), self.logger, name)
+            else:
+                missing.append(name)
+        return results, missing
+    
+    def _execute_tab_queries(self, queries: Dict[str, BoundQuery]) -> Dict[str, pd.DataFrame]:
+        """
+        Run queries against Snowflake.
+        
+        Uses execute_queries_concurrently() when concurrent_queries is enabled
+        in the [PERFORMANCE] config, otherwise runs the queries one after
+        another. Per-query timing is logged in both modes.
+        """
+        if self.performance_config.get("concurrent_queries", True) and len(queries) > 1:
+            return self.execute_queries_concurrently(queries)
+        
+        results = {}
+        for name, query in queries.items():
+            self.logger.info(f"Executing {name} query...")
+            started = time.perf_counter()
+            results[name] = self.execute_query(query, name)
+            self.logger.info(f"{name} query finished in {time.perf_counter() - started:.2f}s")
+        return results
+    
+    def execute_queries_concurrently(self, queries: Dict[str, BoundQuery]) -> Dict[str, pd.DataFrame]:
+        """
+        Submit all queries at once with Snowflake async execution and collect
+        each result as soon as its query finishes.
+        
+        Every query is submitted with execute_async(); the returned query IDs
+        are polled with get_query_status_throw_if_error() until they leave the
+        running state, so total wall time is close to the slowest query rather
+        than the sum of all of them. If any query fails, the ones still
+        running are cancelled and the error is re-raised.
+        
+        Args:
+            queries (Dict[str, BoundQuery]): Bound queries keyed by tab name
+        
+        Returns:
+            Dict[str, pd.DataFrame]: Results in the same key order as queries
+        """
+        if not self.connection:
+            raise Exception("No active Snowflake connection")
+        
+        poll_interval = self.performance_config.get("poll_interval", 1.0)
+        run_started = time.perf_counter()
+        pending: Dict[str, Tuple[str, float]] = {}
+        results: Dict[str, pd.DataFrame] = {}
+        
+        try:
+            for name, query in queries.items():
+                pending[name] = (self._submit_async_query(name, query), time.perf_counter())
+            
+            while pending:
+                for name, (query_id, started) in list(pending.items()):
+                    status = self.connection.get_query_status_throw_if_error(query_id)
+                    if self.connection.is_still_running(status):
+                        continue
+                    
+                    cursor = self.connection.cursor()
+                    try:
+                        cursor.get_results_from_sfqid(query_id)
+                        results[name] = self.fetch_engine.fetch_dataframe(cursor, self.tab_column_types(name), name)
+                    finally:
+                        cursor.close()
+                    del pending[name]
+                    self.profiler.record(name, query_id, rows=len(results[name]))
+                    self.logger.info(
+                        f"{name} query finished in {time.perf_counter() - started:.2f}s "
+                        f"with {len(results[name])} rows (query ID {query_id})"
+                    )
+                
+                if pending:
+                    time.sleep(poll_interval)
+        
+        except Exception as e:
+            self.logger.error(f"Error executing concurrent queries: {e}")
+            self._cancel_queries([query_id for query_id, _ in pending.values()])
+            raise
+        
+        self.logger.info(
+            f"All {len(queries)} queries finished concurrently in {time.perf_counter() - run_started:.2f}s"
+        )
+        return {name: results[name] for name in queries}
+    
+    def iter_tab_cursors(self, queries: Dict[str, BoundQuery]) -> Iterator[Tuple[str, Any]]:
+        """
+        Yield (tab name, executed cursor) pairs in tab order for streaming.
+        
+        In concurrent mode every query is submitted up front and each cursor
+        is yielded once its own query has finished, so the warehouse work
+        still overlaps while results are consumed one tab at a time. The
+        caller closes each cursor. Queries still pending when the consumer
+        stops early are cancelled.
+        """
+        if not self.connection:
+            raise Exception("No active Snowflake connection")
+        
+        if not (self.performance_config.get("concurrent_queries", True) and len(queries) > 1):
+            for name, query in queries.items():
+                self.logger.info(f"Executing {name} query...")
+                cursor = self.connection.cursor()
+                cursor.execute(query.sql, query.params)
+                self.profiler.record(name, getattr(cursor, "sfqid", None))
+                yield name, cursor
+            return
+        
+        poll_interval = self.performance_config.get("poll_interval", 1.0)
+        pending: Dict[str, str] = {}
+        try:
+            for name, query in queries.items():
+                pending[name] = self._submit_async_query(name, query)
+            
+            for name in queries:
+                query_id = pending[name]
+                started = time.perf_counter()
+                while self.connection.is_still_running(
+                        self.connection.get_query_status_throw_if_error(query_id)):
+                    time.sleep(poll_interval)
+                self.logger.info(f"{name} query ready after {time.perf_counter() - started:.2f}s wait (query ID {query_id})")
+                
+                cursor = self.connection.cursor()
+                cursor.get_results_from_sfqid(query_id)
+                del pending[name]
+                self.profiler.record(name, query_id)
+                yield name, cursor
+        finally:
+            if pending:
+                self._cancel_queries(list(pending.values()))
+    
+    def _submit_async_query(self, name: str, query: BoundQuery) -> str:
+        """Submit one query with execute_async() and return its query ID."""
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute_async(query.sql, query.params)
+            query_id = cursor.sfqid
+        finally:
+            cursor.close()
+        self.logger.info(f"Submitted {name} query (query ID {query_id})")
+        return query_id
+    
+    def _cancel_queries(self, query_ids: List[str]) -> None:
+        """Best-effort cancellation of still-running async queries."""
+        for query_id in query_ids:
+            try:
+                cursor = self.connection.cursor()
+                try:
+                    cursor.execute(f"SELECT SYSTEM$CANCEL_QUERY('{query_id}')")
+                finally:
+                    cursor.close()
+                self.logger.info(f"Cancelled query {query_id}")
+            except Exception as e:
+                self.logger.warning(f"Could not cancel query {query_id}: {e}")
+    
+    def derive_summary_metrics(self, df_basic: pd.DataFrame, df_asn_rates: pd.DataFrame) -> pd.DataFrame:
+        """
+        Compute the Summary_Metrics tab locally from Basic_Metrics and the ASN success rates.
+        
+        Produces the same rows, percentage format and ordering as
+        get_query_0_summary_metrics() without re-scanning the vendor
+        performance view; the ASN success rates come from
+        get_query_0_asn_success_rate().
+        """
+        df_summary = derive_summary_metrics(df_basic, df_asn_rates)
+        self.logger.info(f"Derived {len(df_summary)} summary metrics locally from Basic Metrics and ASN success rates")
+        return df_summary
+    
     def create_output_directory(self) -> str:
         """Create output directory with timestamp."""
         output_dir = "Output"
@@ -1011,65 +1661,90 @@ ORDER BY Request_ID, token_index
                 self.logger.warning("No template file found, will create standard Excel file")
                 return False
             
-            shutil.copy2(template_path, output_path)
+            if self.template_cache.enabled:
+                # Written from the in-memory copy; re-read only when the template changed
+                self.template_cache.copy_to(template_path, output_path)
+            else:
+                shutil.copy2(template_path, output_path)
             self.logger.info(f"Template copied from {template_path} to {output_path}")
             return True
             
         except Exception as e:
             self.logger.error(f"Error copying template: {e}")
+            self.template_cache.invalidate()
             return False
     
+    def plan_tab_sheets(self, output_path: str, data_dict: Dict[str, pd.DataFrame]) -> List[SheetPlan]:
+        """
+        Sheets to write for data_dict, checked against Excel's row limit up front.
+        
+        Tabs with more rows than fit on a sheet are split over continuation
+        sheets (Tab2_Basic_Metrics_2, ...) or, with row_overflow = sidecar,
+        written in full next to output_path with a preview in the workbook
+        (see spp_excel_writers.plan_sheets()).
+        """
+        return plan_sheets(data_dict, overflow=self.performance_config["row_overflow"],
+                           sidecar_base=os.path.splitext(output_path)[0], logger=self.logger)
+    
     def populate_template_tabs(self, output_path: str, data_dict: Dict[str, pd.DataFrame]) -> bool:
-        """Populate template with data in different tabs."""
+        """
+        Populate template with data in different tabs.
+        
+        With template_injection enabled (default) the new rows are streamed
+        straight into the tab sheet parts of the copied file (see
+        spp_excel_writers.inject_sheet_data()), leaving VBA, styles and every
+        other part as they are. Files written by copy_template_file() are
+        injected from the template parsed by self.template_cache rather than
+        re-parsed. Templates without all the tab sheets are loaded and
+        populated with openpyxl. Tabs too large for one sheet are handled
+        before anything is written (see plan_tab_sheets()).
+        """
+        try:
+            sheets = self.plan_tab_sheets(output_path, data_dict)
+        except Exception as e:
+            self.logger.error(f"Error populating template: {e}")
+            return False
+        
+        if self.performance_config.get("template_injection", True):
+            try:
+                package = self.template_cache.package_for(output_path)
+                if inject_sheet_data(output_path, data_dict, logger=self.logger, package=package, sheets=sheets):
+                    self.logger.info(f"Template populated successfully: {output_path}")
+                    return True
+            except Exception as e:
+                self.logger.warning(f"Sheet injection failed ({e}) - populating template with openpyxl")
+        
         try:
             workbook = openpyxl.load_workbook(output_path, keep_vba=True)
             
-            # Define tab mapping - Summary first, then others
-            tab_mapping = {
-                'Summary_Metrics': 'Tab1_Summary_Metrics',
-                'Basic_Metrics': 'Tab2_Basic_Metrics',
-                'ASN_Data': 'Tab3_ASN_Data',
-                'PDH_Compliance': 'Tab4_PDH_Compliance'
-            }
-            
-            for data_key, sheet_name in tab_mapping.items():
-                if data_key in data_dict and not data_dict[data_key].empty:
-                    df = data_dict[data_key]
-                    
-                    # Create or get worksheet
-                    if sheet_name in workbook.sheetnames:
-                        worksheet = workbook[sheet_name]
-                        # Clear existing data but keep formatting
-                        for row in worksheet.iter_rows():
-                            for cell in row:
-                                if cell.row and cell.row > 1:  # Keep header row
-                                    cell.value = None
-                    else:
-                        worksheet = workbook.create_sheet(sheet_name)
-                    
-                    # Write data starting from row 2 (assuming row 1 has headers)
-                    start_row = 2 if sheet_name in workbook.sheetnames else 1
-                    
-                    # Write headers if new sheet
-                    if start_row == 1:
-                        for col, column_name in enumerate(df.columns, 1):
-                            worksheet.cell(row=1, column=col, value=column_name)
-                        start_row = 2
-                    
-                    # Write data
-                    for row_idx, row_data in enumerate(df.itertuples(index=False), start_row):
-                        for col_idx, value in enumerate(row_data, 1):
-                            # Handle datetime objects
-                            if pd.isna(value):
-                                cell_value = None
-                            elif isinstance(value, pd.Timestamp):
-                                cell_value = value.strftime('%Y-%m-%d')
-                            else:
-                                cell_value = value
-                            
-                            worksheet.cell(row=row_idx, column=col_idx, value=cell_value)
-                    
-                    self.logger.info(f"Populated {sheet_name} with {len(df)} rows")
+            # Summary first, then others; continuation sheets follow their tab
+            template_cells_by_sheet = {}
+            for plan in sheets:
+                if plan.df.empty:
+                    continue
+                sheet_name, df = plan.sheet_name, plan.df
+                
+                # Create or get worksheet
+                if sheet_name in workbook.sheetnames:
+                    worksheet = workbook[sheet_name]
+                    # Drop last month's rows below the header, keeping its formatting
+                    template_cells = clear_data_rows(worksheet)
+                elif plan.template_sheet != sheet_name and plan.template_sheet in workbook.sheetnames:
+                    # Continuation sheet: header row and column widths of its tab
+                    worksheet = workbook.create_sheet(sheet_name)
+                    copy_header_row(workbook[plan.template_sheet], worksheet)
+                    template_cells = template_cells_by_sheet.get(plan.template_sheet, {})
+                else:
+                    worksheet = workbook.create_sheet(sheet_name)
+                    for col, column_name in enumerate(df.columns, 1):
+                        worksheet.cell(row=1, column=col, value=column_name)
+                    template_cells = {}
+                template_cells_by_sheet[sheet_name] = template_cells
+                
+                # Write data - values converted once per column, dates as Excel serials
+                write_frame_rows(worksheet, df, 2, template_cells)
+                
+                self.logger.info(f"Populated {sheet_name} with {len(df)} rows")
             
             # Remove default sheet if it exists and is empty
             if 'Sheet' in workbook.sheetnames and len(workbook.sheetnames) > 1:
@@ -1085,22 +1760,33 @@ ORDER BY Request_ID, token_index
             return False
     
     def create_standard_excel_file(self, output_path: str, data_dict: Dict[str, pd.DataFrame]) -> bool:
-        """Create standard Excel file without template."""
+        """
+        Create standard Excel file without template.
+        
+        With write_only_excel enabled (default) the tabs are appended in tab
+        order to a write-only workbook, chunk by chunk, so memory stays flat
+        for large vendors. Otherwise the workbook is built in memory with
+        pd.ExcelWriter. Sheet names and order are the same either way; tabs
+        too large for one sheet are handled first (see plan_tab_sheets()).
+        """
         try:
+            sheets = self.plan_tab_sheets(output_path, data_dict)
+            
+            if self.performance_config.get("write_only_excel", True):
+                writer = StreamingWorkbookWriter(output_path, logger=self.logger)
+                for plan in sheets:
+                    writer.write_sheet(plan.sheet_name, plan.df)
+                if not writer.save():
+                    self.logger.error("Error creating standard Excel file: no tab has any rows")
+                    return False
+                return True
+            
             with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
                 # Write each DataFrame to a separate sheet - Summary first, then others
-                sheet_mapping = {
-                    'Summary_Metrics': 'Tab1_Summary_Metrics',
-                    'Basic_Metrics': 'Tab2_Basic_Metrics',
-                    'ASN_Data': 'Tab3_ASN_Data',
-                    'PDH_Compliance': 'Tab4_PDH_Compliance'
-                }
-                
-                for data_key, sheet_name in sheet_mapping.items():
-                    if data_key in data_dict and not data_dict[data_key].empty:
-                        df = data_dict[data_key]
-                        df.to_excel(writer, sheet_name=sheet_name, index=False)
-                        self.logger.info(f"Created sheet {sheet_name} with {len(df)} rows")
+                for plan in sheets:
+                    if not plan.df.empty:
+                        plan.df.to_excel(writer, sheet_name=plan.sheet_name, index=False)
+                        self.logger.info(f"Created sheet {plan.sheet_name} with {len(plan.df)} rows")
             
             self.logger.info(f"Standard Excel file created successfully: {output_path}")
             return True
@@ -1120,54 +1806,96 @@ ORDER BY Request_ID, token_index
             self.logger.info(f"Report Month: {report_month}")
             self.logger.info(f"Date Filter: {date_filter}")
             
-            # Connect to Snowflake
+            # Connect to Snowflake (reuses the authenticated session if still alive)
             if not self.connect_to_snowflake():
                 return "", "Failed to connect to Snowflake"
             
-            # Execute queries
-            self.logger.info("Executing Summary Metrics query...")
-            query0 = self.get_query_0_summary_metrics(vendor_numbers, report_month, date_filter)
-            df_summary = self.execute_query(query0)
-            
-            self.logger.info("Executing Basic Metrics query...")
-            query1 = self.get_query_1_basic_metrics(vendor_numbers, report_month)
-            df_basic = self.execute_query(query1)
-            
-            self.logger.info("Executing ASN Data query...")
-            query2 = self.get_query_2_asn_data(vendor_numbers, date_filter)
-            df_asn = self.execute_query(query2)
-            
-            self.logger.info("Executing PDH Compliance query...")
-            query3 = self.get_query_3_pdh_compliance(vendor_numbers)
-            df_pdh = self.execute_query(query3)
-            
-            if df_summary.empty and df_basic.empty and df_asn.empty and df_pdh.empty:
-                return "", "No data found for the specified criteria"
-            
-            # Get vendor name
-            vendor_name = (self.get_vendor_name_from_data(df_summary) or 
-                          self.get_vendor_name_from_data(df_basic) or 
-                          self.get_vendor_name_from_data(df_asn) or 
-                          self.get_vendor_name_from_data(df_pdh) or 
-                          "Unknown_Vendor")
-            
-            # Create output directory and filename
-            output_dir = self.create_output_directory()
-            filename = self.generate_filename(vendor_numbers, vendor_name, report_month)
-            output_path = os.path.join(output_dir, filename)
-            
-            # Prepare data dictionary with summary as first tab
-            data_dict = {
-                'Summary_Metrics': df_summary,
-                'Basic_Metrics': df_basic,
-                'ASN_Data': df_asn,
-                'PDH_Compliance': df_pdh
-            }
-            
-            # Create output file based on template configuration
+            # Tag the run's queries and write their profile even if the run fails
+            self.profiler.start_run(self.connection, vendors=vendor_numbers,
+                                    report_month=report_month, date_filter=date_filter)
+            try:
+                return self._run_report(vendor_numbers, report_month, date_filter)
+            finally:
+                self.profiler.finish_run(self.connection)
+        except Exception as e:
+            error_msg = f"Automation failed: {str(e)}"
+            self.logger.error(error_msg)
+            return "", error_msg
+    
+    def _run_report(self, vendor_numbers: List[str], report_month: str, date_filter: str) -> Tuple[str, str]:
+        """
+        Query the tabs and write the report for run_full_automation().
+        
+        Expects a live connection. Returns: (output_file_path, status_message)
+        """
+        # Streaming mode writes result batches straight into the sheets
+        if self.performance_config.get("stream_to_sheets", False) and \
+                not self.template_config.get("use_template", False) and not self.export_formats:
+            return self.run_streaming_automation(vendor_numbers, report_month, date_filter)
+        
+        # Execute queries (concurrently unless disabled in config)
+        results = self.fetch_tab_results(vendor_numbers, report_month, date_filter)
+        df_summary = results['Summary_Metrics']
+        df_basic = results['Basic_Metrics']
+        df_asn = results['ASN_Data']
+        df_pdh = results['PDH_Compliance']
+        
+        if df_summary.empty and df_basic.empty and df_asn.empty and df_pdh.empty:
+            return "", "No data found for the specified criteria"
+        
+        # Prepare data dictionary with summary as first tab
+        data_dict = {
+            'Summary_Metrics': df_summary,
+            'Basic_Metrics': df_basic,
+            'ASN_Data': df_asn,
+            'PDH_Compliance': df_pdh
+        }
+        return self.write_report(vendor_numbers, report_month, data_dict)
+    
+    def write_report(self, vendor_numbers: List[str], report_month: str,
+                     data_dict: Dict[str, pd.DataFrame]) -> Tuple[str, str]:
+        """
+        Write one report workbook (template or standard Excel) for data_dict.
+        
+        The file is named with generate_filename() from vendor_numbers and the
+        vendor name found in the data. Returns: (output_file_path, status_message)
+        """
+        df_summary = data_dict['Summary_Metrics']
+        df_basic = data_dict['Basic_Metrics']
+        df_asn = data_dict['ASN_Data']
+        df_pdh = data_dict['PDH_Compliance']
+        
+        # Get vendor name
+        vendor_name = (self.get_vendor_name_from_data(df_summary) or 
+                      self.get_vendor_name_from_data(df_basic) or 
+                      self.get_vendor_name_from_data(df_asn) or 
+                      self.get_vendor_name_from_data(df_pdh) or 
+                      "Unknown_Vendor")
+        
+        # Create output directory and filename
+        output_dir = self.create_output_directory()
+        filename = self.generate_filename(vendor_numbers, vendor_name, report_month)
+        output_path = os.path.join(output_dir, filename)
+        
+        # Export sinks (export_formats) write on a background thread while the workbook is written
+        export = start_export(data_dict, os.path.splitext(output_path)[0], self.export_formats, self.logger) \
+            if self.export_formats else None
+        if export is not None and self.export_only:
+            with self.profiler.phase("export"):
+                try:
+                    exported = export.result()
+                except Exception as e:
+                    self.logger.error(f"Error exporting report data: {e}")
+                    return "", f"Failed to export report data: {e}"
+            self.logger.info("=== Automation Complete ===")
+            self.logger.info(f"Output files: {', '.join(exported)}")
+            return exported[0], f"Exported {len(exported)} files ({', '.join(self.export_formats)}) without an Excel workbook"
+        
+        # Create output file based on template configuration
+        with self.profiler.phase("excel"):
             success = False
             creation_method = ""
-            
+        
             if self.template_config.get("use_template", False):
                 # Try to use template
                 template_path = self.find_template_file()
@@ -1175,7 +1903,7 @@ ORDER BY Request_ID, token_index
                     # Ensure output path has .xlsm extension for macro-enabled templates
                     if not output_path.endswith('.xlsm'):
                         output_path = output_path.replace('.xlsx', '.xlsm')
-                    
+                
                     if self.copy_template_file(output_path):
                         success = self.populate_template_tabs(output_path, data_dict)
                         creation_method = "macro-enabled template (.xlsm)"
@@ -1204,28 +1932,234 @@ ORDER BY Request_ID, token_index
                 output_path = output_path.replace('.xlsm', '.xlsx')
                 success = self.create_standard_excel_file(output_path, data_dict)
                 creation_method = "standard Excel"
+        
+        exported = []
+        if export is not None:
+            with self.profiler.phase("export"):
+                try:
+                    exported = export.result()
+                except Exception as e:
+                    self.logger.error(f"Error exporting report data: {e}")
+        
+        if success:
+            status_msg = f"Successfully created {creation_method} file with {len(df_summary)} summary records, {len(df_basic)} basic metrics records, {len(df_asn)} ASN records, and {len(df_pdh)} PDH compliance records"
+            if exported:
+                status_msg += f" (also exported {len(exported)} {'/'.join(self.export_formats)} files)"
+            self.logger.info("=== Automation Complete ===")
+            self.logger.info(f"Output file: {output_path}")
+            return output_path, status_msg
+        else:
+            return "", "Failed to create output file"
+    
+    def run_batch_automation(self, vendor_numbers: List[str], report_month: str,
+                             date_filter: str) -> Dict[str, Tuple[str, str]]:
+        """
+        Produce one workbook per vendor from a single query pass.
+        
+        Each tab query runs once for the whole vendor set; the results are
+        partitioned by vendor in memory (see spp_batch.partition_by_vendor())
+        and written with write_report() on a process pool (batch_workers in
+        config, see spp_batch_writer.BatchWorkbookWriter), so files are named by
+        generate_filename() exactly as single-vendor runs are. A failure while
+        writing one vendor's workbook does not stop the others. Batch runs
+        always materialize results (stream_to_sheets is ignored).
+        
+        Returns:
+            Dict[str, Tuple[str, str]]: vendor number -> (output_file_path,
+            status_message); the path is empty for vendors that failed or had
+            no data
+        """
+        try:
+            self.logger.info("=== Starting SPP Batch Automation Process ===")
+            self.logger.info(f"Vendors: {len(vendor_numbers)} ({', '.join(vendor_numbers)})")
+            self.logger.info(f"Report Month: {report_month}")
+            self.logger.info(f"Date Filter: {date_filter}")
+            
+            if not self.connect_to_snowflake():
+                return {vendor: ("", "Failed to connect to Snowflake") for vendor in vendor_numbers}
             
-            if success:
-                status_msg = f"Successfully created {creation_method} file with {len(df_summary)} summary records, {len(df_basic)} basic metrics records, {len(df_asn)} ASN records, and {len(df_pdh)} PDH compliance records"
-                self.logger.info(f"=== Automation Complete ===")
-                self.logger.info(f"Output file: {output_path}")
-                return output_path, status_msg
+            self.profiler.start_run(self.connection, vendors=vendor_numbers, report_month=report_month,
+                                    date_filter=date_filter, mode="batch")
+            try:
+                return self._run_batch(vendor_numbers, report_month, date_filter)
+            finally:
+                self.profiler.finish_run(self.connection)
+        except Exception as e:
+            error_msg = f"Batch automation failed: {str(e)}"
+            self.logger.error(error_msg)
+            return {vendor: ("", error_msg) for vendor in vendor_numbers}
+    
+    def _run_batch(self, vendor_numbers: List[str], report_month: str,
+                   date_filter: str) -> Dict[str, Tuple[str, str]]:
+        """Query all vendors once and write a workbook per vendor for run_batch_automation()."""
+        results = self.fetch_tab_results(vendor_numbers, report_month, date_filter)
+        with self.profiler.phase("partition"):
+            partitions = partition_by_vendor(results, vendor_numbers)
+        
+        outcomes: Dict[str, Tuple[str, str]] = {}
+        to_write: Dict[str, Dict[str, pd.DataFrame]] = {}
+        for vendor, data_dict in partitions.items():
+            if all(df.empty for df in data_dict.values()):
+                outcomes[vendor] = ("", "No data found for the specified criteria")
+                self.logger.info(f"Vendor {vendor}: no data")
             else:
-                return "", "Failed to create output file"
-                
+                to_write[vendor] = data_dict
+        
+        # Workbooks are written on a process pool (batch_workers in config)
+        with self.profiler.phase("excel"):
+            writer = BatchWorkbookWriter(self, max_workers=self.performance_config.get("batch_workers", 0))
+            outcomes.update(writer.write_all(report_month, to_write))
+        outcomes = {vendor: outcomes[vendor] for vendor in vendor_numbers}
+        
+        written = sum(1 for path, _ in outcomes.values() if path)
+        self.logger.info(f"=== Batch Complete: {written} of {len(vendor_numbers)} vendor workbooks created ===")
+        return outcomes
+    
+    def run_range_automation(self, vendor_numbers: List[str], start_month: str, end_month: str,
+                             start_date_filter: Optional[str] = None, end_date_filter: Optional[str] = None,
+                             split_months: bool = True) -> Dict[str, Tuple[str, str]]:
+        """
+        Report a run of months (e.g. FY2025-JAN through FY2025-DEC) from one query pass.
+        
+        Each tab query runs once for all months (RPT_MONTH IN (...) and one
+        ERDAT range spanning the months) instead of once per month. The
+        results are then either split locally into one workbook per month
+        (split_months=True, see spp_batch.partition_by_month()) or written as
+        a single multi-month workbook.
+        
+        Args:
+            vendor_numbers (List[str]): Vendors to report together
+            start_month (str): First report month, e.g. "FY2025-JAN"
+            end_month (str): Last report month (inclusive), e.g. "FY2025-DEC"
+            start_date_filter (Optional[str]): Date filter overriding the ERDAT
+                start (defaults to the first day of start_month)
+            end_date_filter (Optional[str]): Date filter overriding the ERDAT
+                end (defaults to the last day of end_month)
+            split_months (bool): One workbook per month (True) or one workbook
+                for the whole range (False)
+        
+        Returns:
+            Dict[str, Tuple[str, str]]: report month (or "<start> to <end>" for
+            a combined workbook) -> (output_file_path, status_message)
+        """
+        range_label = f"{start_month} to {end_month}"
+        try:
+            self.logger.info("=== Starting SPP Range Automation Process ===")
+            self.logger.info(f"Vendors: {vendor_numbers}")
+            self.logger.info(f"Report Months: {range_label} ({'per month' if split_months else 'combined'})")
+            
+            report_months = report_months_between(start_month, end_month)
+            asn_dates = erdat_span(report_months, start_date_filter, end_date_filter)
+            self.logger.info(f"ERDAT Range: {asn_dates.start} - {asn_dates.end} (exclusive)")
+            
+            if not self.connect_to_snowflake():
+                return {range_label: ("", "Failed to connect to Snowflake")}
+            
+            self.profiler.start_run(self.connection, vendors=vendor_numbers, report_month=range_label,
+                                    date_filter=f"{asn_dates.start}-{asn_dates.end}", mode="range")
+            try:
+                return self._run_range(vendor_numbers, report_months, asn_dates, split_months)
+            finally:
+                self.profiler.finish_run(self.connection)
         except Exception as e:
-            error_msg = f"Automation failed: {str(e)}"
+            error_msg = f"Range automation failed: {str(e)}"
             self.logger.error(error_msg)
-            return "", error_msg
+            return {range_label: ("", error_msg)}
+    
+    def _run_range(self, vendor_numbers: List[str], report_months: List[str], asn_dates: ErdatRange,
+                   split_months: bool) -> Dict[str, Tuple[str, str]]:
+        """Query all months once and write the outputs for run_range_automation()."""
+        results = self.fetch_tab_results(vendor_numbers, report_months, report_month_date_filter(report_months[0]),
+                                         asn_dates=asn_dates)
+        
+        if not split_months:
+            range_label = f"{report_months[0]} to {report_months[-1]}"
+            if all(df.empty for df in results.values()):
+                return {range_label: ("", "No data found for the specified criteria")}
+            # generate_filename() keeps labels without "-" as they are
+            file_label = f"{readable_month(report_months[0])} to {readable_month(report_months[-1])}"
+            return {range_label: self.write_report(vendor_numbers, file_label, results)}
+        
+        outcomes: Dict[str, Tuple[str, str]] = {}
+        for month, data_dict in partition_by_month(results, report_months).items():
+            if all(data_dict[name].empty for name in ('Summary_Metrics', 'Basic_Metrics', 'ASN_Data')):
+                outcomes[month] = ("", "No data found for the specified criteria")
+                self.logger.info(f"{month}: no data")
+                continue
+            try:
+                outcomes[month] = self.write_report(vendor_numbers, month, data_dict)
+            except Exception as e:
+                self.logger.error(f"{month}: failed to write report: {e}")
+                outcomes[month] = ("", f"Failed to create output file: {e}")
+        
+        written = sum(1 for path, _ in outcomes.values() if path)
+        self.logger.info(f"=== Range Complete: {written} of {len(report_months)} monthly workbooks created ===")
+        return outcomes
+    
+    def run_streaming_automation(self, vendor_numbers: List[str], report_month: str,
+                                 date_filter: str) -> Tuple[str, str]:
+        """
+        Stream every tab from the cursor straight into a write-only workbook.
+        
+        Used by run_full_automation() when stream_to_sheets is enabled and
+        neither a template nor an export sink is in use. Result batches are appended to their sheet as
+        they arrive, so no tab is ever materialized as a full DataFrame and
+        memory stays bounded by the batch size. The workbook is written under
+        a temporary name and renamed once the vendor name is known. The
+        result cache is not used in streaming mode, and Tab1 always comes
+        from the summary query because Tab2/Tab3 are never held in memory.
+        
+        Returns: (output_file_path, status_message)
+        """
+        queries = self.build_tab_queries(vendor_numbers, report_month, date_filter)
+        output_dir = self.create_output_directory()
+        temp_path = os.path.join(output_dir, f"~streaming_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx")
+        writer = StreamingWorkbookWriter(temp_path, logger=self.logger)
+        vendor_name = None
         
+        try:
+            for name, cursor in self.iter_tab_cursors(queries):
+                try:
+                    for batch in self.fetch_engine.iter_dataframes(cursor, column_types=self.tab_column_types(name)):
+                        if vendor_name is None:
+                            vendor_name = self.get_vendor_name_from_data(batch)
+                        writer.write_batch(name, batch)
+                finally:
+                    cursor.close()
+                self.profiler.record(name, rows=writer.row_counts[name])
+                self.logger.info(f"Streamed {writer.row_counts[name]} rows into {TAB_SHEETS[name]}")
+            
+            if not writer.save():
+                return "", "No data found for the specified criteria"
+            
+            filename = self.generate_filename(vendor_numbers, vendor_name or "Unknown_Vendor", report_month)
+            output_path = os.path.join(output_dir, filename).replace('.xlsm', '.xlsx')
+            os.replace(temp_path, output_path)
         finally:
-            if self.connection:
-                self.connection.close()
-                self.logger.info("Snowflake connection closed")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        
+        counts = writer.row_counts
+        status_msg = f"Successfully created streaming standard Excel file with {counts['Summary_Metrics']} summary records, {counts['Basic_Metrics']} basic metrics records, {counts['ASN_Data']} ASN records, and {counts['PDH_Compliance']} PDH compliance records"
+        self.logger.info("=== Automation Complete ===")
+        self.logger.info(f"Output file: {output_path}")
+        return output_path, status_msg
     
     def test_connection(self) -> Tuple[bool, str]:
         """Test Snowflake connection."""
         try:
+            # Check the live session first instead of paying for another SSO login
+            if self.session.connection is not None and self.connect_to_snowflake():
+                cursor = self.connection.cursor()
+                try:
+                    cursor.execute("SELECT CURRENT_VERSION()")
+                    result = cursor.fetchone()
+                finally:
+                    cursor.close()
+                if result:
+                    return True, f"Connection successful. Snowflake version: {result[0]}"
+                return False, "No result from test query"
+            
             # Use EXACT same connection parameters as the working test script
             test_conn = snowflake.connector.connect(
                 user=self.user_email,
@@ -1261,10 +2195,9 @@ ORDER BY Request_ID, token_index
             # Test basic metrics query
             query = self.get_query_1_basic_metrics(vendor_numbers, report_month)
             cursor = self.connection.cursor()
-            cursor.execute(f"SELECT COUNT(*) FROM ({query})")
+            cursor.execute(f"SELECT COUNT(*) FROM ({query.sql})", query.params)
             result = cursor.fetchone()
             cursor.close()
-            self.connection.close()
             
             if result:
                 count = result[0]
@@ -1291,11 +2224,78 @@ def run_spp_automation(vendor_numbers: List[str], report_month: str, date_filter
             output_format="xlsm"
         )
     
-    return automation.run_full_automation(vendor_numbers, report_month, date_filter)
+    try:
+        return automation.run_full_automation(vendor_numbers, report_month, date_filter)
+    finally:
+        automation.close_connection()
+
+
+def run_spp_batch_automation(vendor_numbers: List[str], report_month: str, date_filter: str,
+                             user_email: str, template_path: str = "") -> Dict[str, Tuple[str, str]]:
+    """
+    Convenience function to produce one workbook per vendor from a single query pass.
+    """
+    automation = SPPAutomationEnhanced(user_email=user_email)
+    
+    # Configure template if provided
+    if template_path:
+        automation.update_template_config(
+            template_path=template_path,
+            use_template=True,
+            output_format="xlsm"
+        )
+    
+    try:
+        return automation.run_batch_automation(vendor_numbers, report_month, date_filter)
+    finally:
+        automation.close_connection()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point: run a report (or a batch) for the given vendors and month."""
+    parser = argparse.ArgumentParser(description="SPP Automation Enhanced - vendor scorecard reports")
+    parser.add_argument("--vendors", nargs="+", help="Vendor numbers (space-separated)")
+    parser.add_argument("--month", help="Report month (e.g., FY2025-APR)")
+    parser.add_argument("--date-filter", help="Date filter (YYYYMM, default: derived from --month)")
+    parser.add_argument("--email", help="HD Supply email for SSO authentication")
+    parser.add_argument("--config", default="config.ini", help="Configuration file path")
+    parser.add_argument("--template", default="", help="Macro template path (default: template_config.json)")
+    parser.add_argument("--batch", action="store_true", help="One workbook per vendor (batch mode)")
+    parser.add_argument("--export", nargs="+", choices=list(EXPORT_FORMATS), metavar="FORMAT",
+                        help=f"Also write the tabs as {', '.join(EXPORT_FORMATS)} (default: export_formats in config)")
+    parser.add_argument("--export-only", action="store_true", help="Write the --export files without a workbook")
+    args = parser.parse_args(argv)
+    
+    automation = SPPAutomationEnhanced(config_file=args.config, user_email=args.email)
+    if not args.vendors:
+        print("SPP Automation Enhanced - Ready for use")
+        print(f"Template config: {automation.template_config_file}")
+        print(f"Current template setting: {automation.template_config}")
+        return 0
+    if not args.month:
+        parser.error("--month is required with --vendors")
+    if args.export_only and not (args.export or automation.export_formats):
+        parser.error("--export-only needs --export (or export_formats in config)")
+    
+    if args.template:
+        automation.update_template_config(template_path=args.template, use_template=True, output_format="xlsm")
+    if args.export:
+        automation.export_formats = parse_export_formats(args.export)
+    automation.export_only = args.export_only or automation.export_only
+    date_filter = args.date_filter or report_month_date_filter(args.month)
+    
+    try:
+        if args.batch:
+            outcomes = automation.run_batch_automation(args.vendors, args.month, date_filter)
+            for vendor, (path, message) in outcomes.items():
+                print(f"{vendor}: {path or message}")
+            return 0 if any(path for path, _ in outcomes.values()) else 1
+        path, message = automation.run_full_automation(args.vendors, args.month, date_filter)
+        print(path or message)
+        return 0 if path else 1
+    finally:
+        automation.close_connection()
+
 
 if __name__ == "__main__":
-    # Example usage
-    automation = SPPAutomationEnhanced()
-    print("SPP Automation Enhanced - Ready for use")
-    print(f"Template config: {automation.template_config_file}")
-    print(f"Current template setting: {automation.template_config}")
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""
+SPP Batch Partitioning
+======================
+
+Splits the tab results of one query pass into one ``data_dict`` per vendor
+(batch mode) or per report month (multi-month range mode), so a monthly
+cycle of hundreds of vendors, or a twelve-month review, costs a single set
+of tab queries instead of one set per output.
+
+Vendor Keys:
+-----------
+Each tab identifies its vendor in a different column (``VENDOR_KEY_COLUMNS``):
+
+- Summary_Metrics / ASN_Data: ``VENDOR_NUMBER``
+- Basic_Metrics: ``VENDOR`` in "NUMBER - NAME" form
+- PDH_Compliance: ``SUPPLIER_NUMBER``
+
+Keys are compared after trimming whitespace and the leading zeros of numeric
+vendor numbers, so "0052889" and "52889" name the same vendor.
+
+Month Keys:
+----------
+Summary_Metrics and Basic_Metrics carry their report month; ASN_Data rows
+are assigned the month of their CREATE_DATE. PDH_Compliance is a rolling
+28-day view without a month, so every month gets the full PDH tab.
+
+Developer: Ben F. Benjamaa
+Team: HD Supply Chain Excellence
+"""
+
+from typing import Dict, List
+
+import pandas as pd
+
+from spp_fiscal_calendar import report_month_labels
+
+# data_dict key -> column holding the vendor number
+VENDOR_KEY_COLUMNS: Dict[str, str] = {
+    'Summary_Metrics': 'VENDOR_NUMBER',
+    'Basic_Metrics': 'VENDOR',
+    'ASN_Data': 'VENDOR_NUMBER',
+    'PDH_Compliance': 'SUPPLIER_NUMBER'
+}
+
+# data_dict key -> column holding the report month (None: not month-specific)
+MONTH_KEY_COLUMNS: Dict[str, str] = {
+    'Summary_Metrics': 'RPT_MONTH',
+    'Basic_Metrics': 'REPORT_MONTH',
+    'ASN_Data': 'CREATE_DATE',
+    'PDH_Compliance': None
+}
+
+
+def vendor_key(vendor_number) -> str:
+    """Canonical form of a vendor number for matching rows to vendors."""
+    vendor = str(vendor_number).strip()
+    if vendor.isdigit():
+        return vendor.lstrip('0') or '0'
+    return vendor.upper()
+
+
+def tab_vendor_keys(data_key: str, df: pd.DataFrame) -> pd.Series:
+    """Vendor key of every row of a tab result."""
+    column = VENDOR_KEY_COLUMNS[data_key]
+    values = df[column].astype('string')
+    if data_key == 'Basic_Metrics':
+        # "52889 - BOXER HOME LLC" -> "52889"
+        values = values.str.split(' - ', n=1).str[0]
+    values = values.str.strip().str.upper()
+    numeric = values.str.fullmatch(r'\d+').fillna(False)
+    values = values.mask(numeric, values.str.lstrip('0').replace('', '0'))
+    return values
+
+
+def partition_by_vendor(results: Dict[str, pd.DataFrame],
+                        vendor_numbers: List[str]) -> Dict[str, Dict[str, pd.DataFrame]]:
+    """
+    Split tab results into one data_dict per requested vendor.
+
+    Every tab is grouped once; vendors without rows in a tab get an empty
+    frame with the tab's columns. Rows of vendors that were not requested are
+    dropped.
+
+    Args:
+        results (Dict[str, pd.DataFrame]): Tab results of the whole vendor set
+        vendor_numbers (List[str]): Vendors to produce a data_dict for
+
+    Returns:
+        Dict[str, Dict[str, pd.DataFrame]]: vendor number -> data_dict, in
+        the order of vendor_numbers
+    """
+    grouped: Dict[str, Dict[str, pd.DataFrame]] = {}
+    for data_key, df in results.items():
+        if df.empty or VENDOR_KEY_COLUMNS[data_key] not in df.columns:
+            grouped[data_key] = {}
+            continue
+        keys = tab_vendor_keys(data_key, df)
+        grouped[data_key] = {
+            key: group.reset_index(drop=True)
+            for key, group in df.groupby(keys, sort=False, dropna=True)
+        }
+
+    partitions = {}
+    for vendor in vendor_numbers:
+        key = vendor_key(vendor)
+        partitions[vendor] = {
+            data_key: grouped[data_key].get(key, df.iloc[:0])
+            for data_key, df in results.items()
+        }
+    return partitions
+
+
+def partition_by_month(results: Dict[str, pd.DataFrame],
+                       report_months: List[str]) -> Dict[str, Dict[str, pd.DataFrame]]:
+    """
+    Split tab results of a multi-month query pass into one data_dict per month.
+
+    Args:
+        results (Dict[str, pd.DataFrame]): Tab results covering all months
+        report_months (List[str]): Months to produce a data_dict for
+            ("FY2025-JAN", ...)
+
+    Returns:
+        Dict[str, Dict[str, pd.DataFrame]]: report month -> data_dict, in the
+        order of report_months
+    """
+    grouped: Dict[str, Dict[str, pd.DataFrame]] = {}
+    for data_key, df in results.items():
+        column = MONTH_KEY_COLUMNS[data_key]
+        if column is None:
+            continue
+        if df.empty or column not in df.columns:
+            grouped[data_key] = {}
+            continue
+        if data_key == 'ASN_Data':
+            keys = report_month_labels(df[column])
+        else:
+            keys = df[column].astype('string').str.strip().str.upper()
+        grouped[data_key] = {
+            key: group.reset_index(drop=True)
+            for key, group in df.groupby(keys, sort=False, dropna=True)
+        }
+
+    partitions = {}
+    for month in report_months:
+        # Tabs without a month (PDH) are shared by every month
+        partitions[month] = {
+            data_key: grouped[data_key].get(month, df.iloc[:0]) if data_key in grouped else df
+            for data_key, df in results.items()
+        }
+    return partitions
@@ -0,0 +1,115 @@
+"""
+SPP Batch Workbook Writer
+=========================
+
+Writes the per-vendor workbooks of a batch run (see
+SPPAutomationEnhanced.run_batch_automation()) on a pool of worker processes.
+
+Template population and standard Excel creation are CPU-bound openpyxl work,
+so writing hundreds of workbooks on one core dominates a monthly batch once
+the data is fetched. Each worker process builds its own engine once (no
+Snowflake connection) and writes the vendors it is handed with the same
+write_report() the single-vendor run uses.
+
+Key Features:
+------------
+- **Configurable Pool**: ``batch_workers`` in the [PERFORMANCE] section of
+  config.ini (0 = one worker per CPU core, 1 = write in-process)
+- **Per-Vendor Results**: ``(output_file_path, status_message)`` for every
+  vendor; a worker exception is reported against its vendor only
+- **Shared Log**: Workers append to the log file of the parent engine
+
+Note:
+    Frozen Windows executables must call ``multiprocessing.freeze_support()``
+    at startup (the GUI entry point does) for worker processes to start.
+
+Developer: Ben F. Benjamaa
+Team: HD Supply Chain Excellence
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+# Engine of the current worker process, built once by _init_worker()
+_worker_engine = None
+
+
+def _init_worker(config_file: str, user_email: Optional[str], log_file: Optional[str],
+                 template_config: Dict[str, Any], export_formats: List[str], export_only: bool) -> None:
+    """Build the worker's engine with the parent's configuration."""
+    global _worker_engine
+    from spp_automation_enhanced import SPPAutomationEnhanced
+
+    _worker_engine = SPPAutomationEnhanced(config_file=config_file, user_email=user_email, log_file=log_file)
+    _worker_engine.template_config = template_config
+    _worker_engine.export_formats = export_formats
+    _worker_engine.export_only = export_only
+
+
+def _write_vendor_report(vendor: str, report_month: str,
+                         data_dict: Dict[str, pd.DataFrame]) -> Tuple[str, str]:
+    """Worker task: write one vendor's workbook."""
+    return _worker_engine.write_report([vendor], report_month, data_dict)
+
+
+class BatchWorkbookWriter:
+    """
+    Writes one workbook per vendor, in parallel when more than one worker is configured.
+
+    Attributes:
+        engine (SPPAutomationEnhanced): Parent engine (configuration, logger,
+            in-process writing)
+        max_workers (int): Number of worker processes
+    """
+
+    def __init__(self, engine, max_workers: int = 0):
+        self.engine = engine
+        self.max_workers = max_workers if max_workers > 0 else (os.cpu_count() or 1)
+
+    def write_all(self, report_month: str,
+                  partitions: Dict[str, Dict[str, pd.DataFrame]]) -> Dict[str, Tuple[str, str]]:
+        """
+        Write a workbook for every vendor in partitions.
+
+        Args:
+            report_month (str): Report month used in the file names
+            partitions (Dict[str, Dict[str, pd.DataFrame]]): vendor -> data_dict
+
+        Returns:
+            Dict[str, Tuple[str, str]]: vendor -> (output_file_path,
+            status_message) in the order of partitions
+        """
+        workers = min(self.max_workers, len(partitions))
+        if workers <= 1:
+            return {vendor: self._write_in_process(vendor, report_month, data_dict)
+                    for vendor, data_dict in partitions.items()}
+
+        self.engine.logger.info(f"Writing {len(partitions)} workbooks on {workers} worker processes")
+        outcomes: Dict[str, Tuple[str, str]] = {}
+        initargs = (self.engine.config_file, self.engine.user_email, self.engine.log_file,
+                    dict(self.engine.template_config), list(self.engine.export_formats), self.engine.export_only)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as pool:
+            futures = {
+                pool.submit(_write_vendor_report, vendor, report_month, data_dict): vendor
+                for vendor, data_dict in partitions.items()
+            }
+            for future in as_completed(futures):
+                vendor = futures[future]
+                try:
+                    outcomes[vendor] = future.result()
+                except Exception as e:
+                    self.engine.logger.error(f"Vendor {vendor}: failed to write report: {e}")
+                    outcomes[vendor] = ("", f"Failed to create output file: {e}")
+
+        return {vendor: outcomes[vendor] for vendor in partitions}
+
+    def _write_in_process(self, vendor: str, report_month: str,
+                          data_dict: Dict[str, pd.DataFrame]) -> Tuple[str, str]:
+        try:
+            return self.engine.write_report([vendor], report_month, data_dict)
+        except Exception as e:
+            self.engine.logger.error(f"Vendor {vendor}: failed to write report: {e}")
+            return "", f"Failed to create output file: {e}"
@@ -42,7 +42,7 @@ Authentication:
 --------------
 - Uses Snowflake external browser authentication (SSO)
 - Credentials validated via HD Supply identity provider
-- Authentication persists for session duration
+- Authentication persists for session duration (one login serves every report)
 - No passwords stored locally
 
 Thread Safety:
@@ -93,6 +93,7 @@ Release Date: January 7, 2026
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import threading
+import multiprocessing
 import os
 import json
 import traceback
@@ -108,6 +109,7 @@ try:
 except ImportError as e:
     print(f"Error importing automation module: {e}")
     SPPAutomationEnhanced = None
+from spp_export import EXPORT_FORMATS
 
 # Set up logging
 log_file = f"spp_gui_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
@@ -207,6 +209,10 @@ class SPPEnhancedGUI:
         self.template_path_var = tk.StringVar()
         self.use_template_var = tk.BooleanVar(value=False)
         self.output_format_var = tk.StringVar(value="xlsx")
+        self.bypass_cache_var = tk.BooleanVar(value=False)
+        self.batch_mode_var = tk.BooleanVar(value=False)
+        self.export_vars = {export_format: tk.BooleanVar(value=False) for export_format in EXPORT_FORMATS}
+        self.export_only_var = tk.BooleanVar(value=False)
         
         try:
             self.setup_styles()
@@ -469,6 +475,42 @@ class SPPEnhancedGUI:
         date_entry.pack(side='left', padx=(10, 5))
         ttk.Label(date_frame, text="(YYYYMM format)", style='Info.TLabel').pack(side='left', padx=5)
         
+        # Result cache bypass
+        cache_frame = ttk.Frame(input_frame, style='Section.TFrame')
+        cache_frame.pack(fill='x', pady=5)
+        
+        cache_check = ttk.Checkbutton(cache_frame,
+                                      text="Bypass result cache (always query Snowflake)",
+                                      variable=self.bypass_cache_var,
+                                      style='Custom.TCheckbutton')
+        cache_check.pack(side='left')
+        
+        # Batch mode: one query pass, one workbook per vendor
+        batch_frame = ttk.Frame(input_frame, style='Section.TFrame')
+        batch_frame.pack(fill='x', pady=5)
+        
+        batch_check = ttk.Checkbutton(batch_frame,
+                                      text="One workbook per vendor (batch mode)",
+                                      variable=self.batch_mode_var,
+                                      style='Custom.TCheckbutton')
+        batch_check.pack(side='left')
+        
+        # Export sinks: Parquet/CSV/Feather/SQLite copies of the tabs for analysts
+        export_frame = ttk.Frame(input_frame, style='Section.TFrame')
+        export_frame.pack(fill='x', pady=5)
+        
+        ttk.Label(export_frame, text="Also export:", style='Field.TLabel').pack(side='left')
+        export_labels = {"parquet": "Parquet", "csv": "CSV", "feather": "Feather", "sqlite": "SQLite"}
+        for export_format, export_var in self.export_vars.items():
+            ttk.Checkbutton(export_frame,
+                            text=export_labels.get(export_format, export_format),
+                            variable=export_var,
+                            style='Custom.TCheckbutton').pack(side='left', padx=(10, 0))
+        ttk.Checkbutton(export_frame,
+                        text="Skip Excel workbook",
+                        variable=self.export_only_var,
+                        style='Custom.TCheckbutton').pack(side='left', padx=(20, 0))
+        
         # Control Buttons Section
         control_frame = ttk.Frame(scrollable_frame, style='Section.TFrame', padding=15)
         control_frame.pack(fill='x', padx=10, pady=10)
@@ -554,6 +596,11 @@ class SPPEnhancedGUI:
                 self.use_template_var.set(self.template_config.get('use_template', False))
                 self.output_format_var.set(self.template_config.get('output_format', 'xlsx'))
                 
+                # Export sinks start from export_formats / export_only in config.ini
+                for export_format, export_var in self.export_vars.items():
+                    export_var.set(export_format in temp_automation.export_formats)
+                self.export_only_var.set(temp_automation.export_only)
+                
                 self.log_message(f"Template configuration loaded: {len(self.template_config)} settings")
                 self.on_template_toggle()  # Update UI state
         except Exception as e:
@@ -647,6 +694,10 @@ class SPPEnhancedGUI:
             if not self.user_email:
                 self.user_email = self._sanitize_email(self.email_var.get())
             
+            # Re-authenticating replaces the engine, so end the previous session first
+            if self.automation:
+                self.automation.close_connection()
+            
             self.log_message(f"Creating automation instance for {self.user_email}")
             self.automation = SPPAutomationEnhanced(user_email=self.user_email)
             
@@ -796,12 +847,20 @@ class SPPEnhancedGUI:
         self.log_message(f"Report Month: {report_month}")
         self.log_message(f"Date Filter: {date_filter}")
         self.log_message(f"Use Template: {self.use_template_var.get()}")
+        self.log_message(f"Bypass Result Cache: {self.bypass_cache_var.get()}")
+        self.log_message(f"Batch Mode: {self.batch_mode_var.get()}")
+        self.log_message(f"Export: {', '.join(self.selected_export_formats()) or 'none'}"
+                         f"{' (no Excel workbook)' if self.export_only_var.get() else ''}")
         self.log_message("Generating 4 tabs: Summary, Basic Metrics, ASN Data, PDH Compliance")
         
         # Run automation in background
         threading.Thread(target=self._run_automation_thread, 
                         args=(vendor_numbers, report_month, date_filter), daemon=True).start()
     
+    def selected_export_formats(self):
+        """Export formats ticked in the GUI, in EXPORT_FORMATS order."""
+        return [export_format for export_format, export_var in self.export_vars.items() if export_var.get()]
+    
     def _run_automation_thread(self, vendor_numbers, report_month, date_filter):
         """Background automation thread."""
         try:
@@ -814,6 +873,14 @@ class SPPEnhancedGUI:
                 use_template=self.use_template_var.get(),
                 output_format=self.output_format_var.get()
             )
+            self.automation.bypass_result_cache = self.bypass_cache_var.get()
+            self.automation.export_formats = self.selected_export_formats()
+            self.automation.export_only = self.export_only_var.get() and bool(self.automation.export_formats)
+            
+            if self.batch_mode_var.get():
+                outcomes = self.automation.run_batch_automation(vendor_numbers, report_month, date_filter)
+                self.root.after(0, self._handle_batch_result, outcomes)
+                return
             
             # Run automation
             output_file, status_message = self.automation.run_full_automation(
@@ -837,14 +904,18 @@ class SPPEnhancedGUI:
             self.log_message(f"✓ {message}")
             self.log_message(f"Output file: {output_file}")
             
-            # Ask if user wants to open the file
+            # Ask if user wants to open the file (the folder when only export files were written)
+            is_workbook = output_file.lower().endswith(('.xlsx', '.xlsm'))
             result = messagebox.askyesno(
                 "Success!", 
-                f"Report generated successfully!\\n\\n{message}\\n\\nWould you like to open the output file?",
+                f"Report generated successfully!\\n\\n{message}\\n\\n"
+                f"Would you like to open the output {'file' if is_workbook else 'folder'}?",
                 icon='question'
             )
             
-            if result:
+            if result and not is_workbook:
+                self.open_output_folder()
+            elif result:
                 try:
                     os.startfile(output_file)
                 except Exception as e:
@@ -854,6 +925,29 @@ class SPPEnhancedGUI:
             self.log_message(f"✗ {message}")
             self.show_error("Automation Failed", message)
     
+    def _handle_batch_result(self, outcomes):
+        """Handle batch automation result (one entry per vendor)."""
+        # Stop progress and re-enable button
+        self.progress.stop()
+        self.run_btn.config(state='normal')
+        
+        written = [path for path, _ in outcomes.values() if path]
+        for vendor, (path, message) in outcomes.items():
+            if path:
+                self.log_message(f"✓ {vendor}: {os.path.basename(path)}")
+            else:
+                self.log_message(f"✗ {vendor}: {message}")
+        
+        summary = f"{len(written)} of {len(outcomes)} vendor workbooks created"
+        if written:
+            self.log_message(f"=== Batch Completed: {summary} ===")
+            if messagebox.askyesno("Batch Complete", f"{summary}.\n\nWould you like to open the output folder?",
+                                   icon='question'):
+                self.open_output_folder()
+        else:
+            self.log_message(f"=== Batch Failed: {summary} ===")
+            self.show_error("Batch Failed", summary)
+    
     def open_output_folder(self):
         """Open the output folder."""
         try:
@@ -904,6 +998,8 @@ def main():
         def on_closing():
             if messagebox.askokcancel("Quit", "Do you want to quit?"):
                 logger.info("Application closing")
+                if app.automation:
+                    app.automation.close_connection()
                 root.destroy()
         
         root.protocol("WM_DELETE_WINDOW", on_closing)
@@ -922,4 +1018,6 @@ def main():
             print(f"FATAL ERROR: {error_msg}")
 
 if __name__ == "__main__":
+    # Required for batch writer worker processes in the frozen Windows build
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,842 @@
+"""
+SPP Excel Writers
+=================
+
+Workbook writers used by the SPP automation engine in addition to the
+template and standard writers on SPPAutomationEnhanced.
+
+Key Features:
+------------
+- **Streaming Writer**: ``StreamingWorkbookWriter`` appends result batches
+  straight into a write-only workbook as they arrive from the cursor, so a
+  tab is never held in memory as a full DataFrame
+- **Constant-Memory Standard Output**: ``write_frame()`` appends a complete
+  tab in chunks of WRITE_CHUNK_ROWS rows; create_standard_excel_file() uses
+  it (``write_only_excel`` in config.ini) instead of building the workbook in
+  memory with ``pd.ExcelWriter``. Rows go to the sheet's temporary XML file
+  as they are appended, so memory stays flat regardless of row count
+- **Template Sheet Injection**: ``inject_sheet_data()`` writes the tabs of a
+  copied template without loading it into openpyxl. The workbook is treated
+  as a zip: only the sheetData of the Tab1 - Tab4 sheet parts is replaced
+  (keeping the template's header row), every other part - vbaProject.bin,
+  styles, shared strings, pivots - is copied through unchanged. The parsed
+  package (``TemplatePackage``) can come from the in-memory template cache
+- **Row Limit Overflow**: ``plan_sheets()`` sizes every tab to Excel's
+  1,048,576-row limit before anything is written, splitting a larger tab
+  over continuation sheets (Tab2_Basic_Metrics_2, ...) or spilling it to a
+  Parquet/CSV sidecar file with a preview and an OVERFLOW_SHEET pointer
+  (``row_overflow`` in config.ini)
+- **Bounded Template Clearing**: when a template is populated with openpyxl,
+  ``clear_data_rows()`` drops last month's rows below the header in one pass
+  and ``write_frame_rows()`` writes the new ones with the styles of the
+  template's first data row
+
+Tab Layout:
+----------
+``TAB_SHEETS`` maps the ``data_dict`` keys used throughout the engine to the
+sheet names of the report, in tab order (Tab1 - Tab4).
+
+Developer: Ben F. Benjamaa
+Team: HD Supply Chain Excellence
+"""
+
+import io
+import logging
+import math
+import os
+import posixpath
+import re
+import time
+import zipfile
+from copy import copy
+from decimal import Decimal
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, Tuple, Union
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape, unescape
+
+import numpy as np
+import openpyxl
+import pandas as pd
+from openpyxl.cell import Cell, WriteOnlyCell
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.styles import Alignment, Border, Font, Side
+from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format
+from openpyxl.utils import get_column_letter
+
+# data_dict key -> sheet name, Summary first, then others
+TAB_SHEETS: Dict[str, str] = {
+    'Summary_Metrics': 'Tab1_Summary_Metrics',
+    'Basic_Metrics': 'Tab2_Basic_Metrics',
+    'ASN_Data': 'Tab3_ASN_Data',
+    'PDH_Compliance': 'Tab4_PDH_Compliance'
+}
+
+# Rows converted and appended at a time by StreamingWorkbookWriter.write_sheet()
+WRITE_CHUNK_ROWS = 50000
+
+# Rows per worksheet, header included (Excel's limit)
+EXCEL_MAX_ROWS = 1048576
+
+# Handling of tabs with more rows than fit on a sheet (row_overflow in config.ini)
+OVERFLOW_MODES = ("split", "sidecar")
+
+# Sheet listing the sidecar files of tabs too large for the workbook
+OVERFLOW_SHEET = "Overflow_Files"
+
+# Header cell style of DataFrame.to_excel(), kept for write-only sheets
+_THIN = Side(style="thin")
+HEADER_FONT = Font(bold=True)
+HEADER_BORDER = Border(left=_THIN, right=_THIN, top=_THIN, bottom=_THIN)
+HEADER_ALIGNMENT = Alignment(horizontal="center", vertical="top")
+
+# Number format of every date cell written by the workbook writers
+DATE_FORMAT = "yyyy-mm-dd"
+
+_EXCEL_EPOCH = np.datetime64("1899-12-30", "us")
+# pd.api.types.infer_dtype() kinds of object columns holding dates / numbers
+DATE_KINDS = ("date", "datetime", "datetime64")
+NUMERIC_KINDS = ("decimal", "integer", "floating", "mixed-integer-float")
+
+_MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_DOC_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+_ROW_TAG_RE = re.compile(rb'<row\b[^>]*?\br="(\d+)"[^>]*?(/?)>')
+_CELL_TAG_RE = re.compile(rb'<c\b[^>]*>')
+_CELL_REF_RE = re.compile(rb'\br="([A-Z]+)\d+"')
+_CELL_STYLE_RE = re.compile(rb'\bs="(\d+)"')
+_DIMENSION_RE = re.compile(rb'<dimension\b[^>]*/>')
+_NUM_FMT_TAG_RE = re.compile(rb'<numFmt\b[^>]*>')
+_NUM_FMTS_RE = re.compile(rb'<numFmts\b')
+_XF_TAG_RE = re.compile(rb'<xf\b[^>]*>')
+_ATTRIBUTE_RE = re.compile(rb'([\w:]+)="([^"]*)"')
+_WORKSHEET_TAG_RE = re.compile(rb'<worksheet\b[^>]*>')
+_COLS_RE = re.compile(rb'<cols>.*?</cols>', re.S)
+
+_WORKSHEET_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"
+_WORKSHEET_REL_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"
+
+
+def dataframe_rows(df: pd.DataFrame) -> Iterator[tuple]:
+    """
+    Yield DataFrame rows as tuples with NaN/NaT replaced by None.
+
+    datetime64 columns holding whole days are yielded as ``datetime.date``
+    values, which openpyxl writes with DATE_FORMAT (Timestamps would get
+    ``yyyy-mm-dd h:mm:ss``), matching the fetched date objects of untyped
+    results.
+    """
+    values = df.astype(object).where(df.notna(), None)
+    for index, dtype in enumerate(df.dtypes):
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            series = df.iloc[:, index]
+            stamps = series.dropna()
+            if (stamps == stamps.dt.normalize()).all():
+                values.iloc[:, index] = series.dt.date.where(series.notna(), None)
+    return values.itertuples(index=False, name=None)
+
+
+def date_columns(df: pd.DataFrame) -> List[bool]:
+    """Per column: True when it holds dates (datetime64, or date/datetime/Timestamp objects)."""
+    flags = []
+    for column in df.columns:
+        series = df[column]
+        if pd.api.types.is_datetime64_any_dtype(series.dtype):
+            flags.append(True)
+        elif series.dtype == object:
+            flags.append(pd.api.types.infer_dtype(series, skipna=True) in DATE_KINDS)
+        else:
+            flags.append(False)
+    return flags
+
+
+def excel_columns(df: pd.DataFrame, dates: Optional[List[bool]] = None) -> List[list]:
+    """
+    Convert df once per column into lists of values ready to be written.
+
+    Missing values (NaN/NaT/None/pd.NA) become None, Decimal and other
+    numeric object columns become int/float, and date columns (see
+    date_columns(); pass it to keep chunks of one frame consistent) become
+    Excel date serials - int for whole days - to be written with
+    DATE_FORMAT. ``zip(*excel_columns(df))`` gives the rows.
+    """
+    dates = date_columns(df) if dates is None else dates
+    return [_excel_column(df[column], is_date) for column, is_date in zip(df.columns, dates)]
+
+
+def _excel_column(series: pd.Series, is_date: bool) -> list:
+    if is_date:
+        return _date_serials(series)
+
+    if pd.api.types.is_bool_dtype(series.dtype) or pd.api.types.is_integer_dtype(series.dtype):
+        if not series.hasnans:
+            return series.tolist()
+    elif series.dtype == object and pd.api.types.infer_dtype(series, skipna=True) in NUMERIC_KINDS:
+        series = pd.to_numeric(series, errors="coerce")
+
+    if pd.api.types.is_float_dtype(series.dtype):
+        values = series.to_numpy(dtype=float)
+        missing = ~np.isfinite(values)
+        if not missing.any():
+            return values.tolist()
+        return np.where(missing, None, values.astype(object)).tolist()
+    return series.astype(object).where(series.notna(), None).tolist()
+
+
+def _date_serials(series: pd.Series) -> list:
+    """Excel (1900 date system) serials of a date column; None for missing dates."""
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        if getattr(series.dt, "tz", None) is not None:
+            series = series.dt.tz_localize(None)
+        stamps = series.to_numpy().astype("datetime64[us]")
+    else:
+        converted = pd.to_datetime(series, errors="coerce")
+        stamps = converted.to_numpy().astype("datetime64[us]")
+        # pandas < 2 only has nanosecond datetimes and coerces dates past 2262 (SAP's 9999-12-31) to NaT
+        lost = np.flatnonzero(converted.isna().to_numpy() & series.notna().to_numpy())
+        for index in lost:
+            try:
+                stamps[index] = np.datetime64(series.iloc[index], "us")
+            except (TypeError, ValueError):
+                pass
+    # Microsecond units cover every date Excel can hold (nanoseconds overflow after 2262-04-11)
+    serials = (stamps - _EXCEL_EPOCH) / np.timedelta64(1, "D")
+    missing = np.isnan(serials)
+    if not (serials[~missing] % 1).any():
+        values = np.where(missing, 0, serials).astype(np.int64).astype(object)
+    else:
+        values = serials.astype(object)
+    values[missing] = None
+    return values.tolist()
+
+
+def clear_data_rows(worksheet, header_rows: int = 1) -> Dict[int, Cell]:
+    """
+    Remove every row below the header of an openpyxl worksheet in bulk.
+
+    Cells, row dimensions and merged ranges below the header are dropped
+    from the sheet directly instead of setting each cell of the used range
+    to None, so no phantom rows are left behind and the saved dimension ends
+    at the last row written afterwards. Header cells and the workbook's
+    defined names are not touched.
+
+    Returns:
+        Dict[int, Cell]: column index -> cell of the first data row as the
+        template had it, for write_frame_rows() to copy its style from
+    """
+    cells = worksheet._cells
+    first_row = {column: cell for (row, column), cell in cells.items()
+                 if row == header_rows + 1 and cell.has_style}
+    worksheet._cells = {coordinate: cell for coordinate, cell in cells.items() if coordinate[0] <= header_rows}
+    for row in [row for row in worksheet.row_dimensions if row > header_rows]:
+        del worksheet.row_dimensions[row]
+    for merged in [merged for merged in worksheet.merged_cells.ranges if merged.max_row > header_rows]:
+        worksheet.merged_cells.remove(merged)
+    return first_row
+
+
+def copy_header_row(source, worksheet) -> None:
+    """Copy the header row (values and styles) and the column widths of source to worksheet."""
+    for cell in next(source.iter_rows(min_row=1, max_row=1), ()):
+        target = worksheet.cell(row=1, column=cell.column, value=cell.value)
+        if cell.has_style:
+            target._style = copy(cell._style)
+    for letter, dimension in source.column_dimensions.items():
+        if dimension.width:
+            worksheet.column_dimensions[letter].width = dimension.width
+
+
+def write_frame_rows(worksheet, df: pd.DataFrame, start_row: int = 2,
+                     template_cells: Optional[Dict[int, Cell]] = None) -> None:
+    """
+    Write the rows of df into an openpyxl worksheet from start_row on.
+
+    Values are converted once per column (excel_columns()). Each column takes
+    the style of its template cell (see clear_data_rows()); date columns are
+    given DATE_FORMAT unless that style already has a date format.
+    """
+    template_cells = template_cells or {}
+    dates = date_columns(df)
+    styles, formats = [], []
+    for column, is_date in enumerate(dates, 1):
+        template = template_cells.get(column)
+        styles.append(template._style if template is not None else None)
+        formats.append(DATE_FORMAT if is_date and not (template is not None and
+                                                       is_date_format(template.number_format)) else None)
+
+    for row_idx, row_data in enumerate(zip(*excel_columns(df, dates)), start_row):
+        for col_idx, value in enumerate(row_data, 1):
+            cell = worksheet.cell(row=row_idx, column=col_idx, value=value)
+            if styles[col_idx - 1] is not None:
+                cell._style = copy(styles[col_idx - 1])
+            if formats[col_idx - 1] and value is not None:
+                cell.number_format = formats[col_idx - 1]
+
+
+class SheetPlan(NamedTuple):
+    """
+    One worksheet to write.
+
+    template_sheet is the tab sheet a continuation sheet takes its header
+    row and column styles from (the sheet itself for a tab's first sheet,
+    None for the OVERFLOW_SHEET).
+    """
+    sheet_name: str
+    df: pd.DataFrame
+    template_sheet: Optional[str]
+
+
+def continuation_sheet_name(sheet_name: str, part: int) -> str:
+    """Name of the part-th sheet of a tab: Tab2_Basic_Metrics, Tab2_Basic_Metrics_2, ..."""
+    return sheet_name if part == 1 else f"{sheet_name}_{part}"
+
+
+def plan_sheets(data_dict: Dict[str, pd.DataFrame], overflow: str = "split",
+                sidecar_base: Optional[str] = None, logger: Optional[logging.Logger] = None) -> List[SheetPlan]:
+    """
+    Sheets to write for data_dict, in tab order, sized to Excel's row limit.
+
+    Tabs with more rows than fit on one sheet (EXCEL_MAX_ROWS with the
+    header) are found before anything is written and handled by overflow:
+
+    - ``split``: the rows continue on Tab2_Basic_Metrics_2, _3, ... sheets
+    - ``sidecar``: the whole tab is written next to the workbook (see
+      write_sidecar(), ``<sidecar_base> - <sheet>``), the sheet keeps the
+      first rows as a preview and an OVERFLOW_SHEET lists the files
+
+    Raises:
+        ValueError: overflow is not one of OVERFLOW_MODES, or sidecar_base
+        is missing when a sidecar is needed
+    """
+    if overflow not in OVERFLOW_MODES:
+        raise ValueError(f"row_overflow must be one of {', '.join(OVERFLOW_MODES)}, not '{overflow}'")
+    logger = logger or logging.getLogger("spp_automation")
+    capacity = EXCEL_MAX_ROWS - 1
+
+    plans, sidecars = [], []
+    for data_key, sheet_name in TAB_SHEETS.items():
+        if data_key not in data_dict:
+            continue
+        df = data_dict[data_key]
+        if len(df) <= capacity:
+            plans.append(SheetPlan(sheet_name, df, sheet_name))
+            continue
+
+        if overflow == "split":
+            parts = -(-len(df) // capacity)
+            logger.warning(f"{sheet_name} has {len(df):,} rows, more than fit on one sheet - "
+                           f"splitting it over {parts} sheets")
+            for part in range(1, parts + 1):
+                plans.append(SheetPlan(continuation_sheet_name(sheet_name, part),
+                                       df.iloc[(part - 1) * capacity:part * capacity], sheet_name))
+        else:
+            if not sidecar_base:
+                raise ValueError("sidecar_base is required for row_overflow = sidecar")
+            path = write_sidecar(df, f"{sidecar_base} - {sheet_name}")
+            logger.warning(f"{sheet_name} has {len(df):,} rows, more than fit on one sheet - "
+                           f"full data written to {path}, first {capacity:,} rows kept in the workbook")
+            plans.append(SheetPlan(sheet_name, df.iloc[:capacity], sheet_name))
+            sidecars.append({"SHEET": sheet_name, "TOTAL_ROWS": len(df), "ROWS_IN_WORKBOOK": capacity,
+                             "FILE": os.path.basename(path)})
+
+    if sidecars:
+        plans.append(SheetPlan(OVERFLOW_SHEET, pd.DataFrame(sidecars), None))
+    return plans
+
+
+def write_sidecar(df: pd.DataFrame, base_path: str) -> str:
+    """
+    Write df next to the workbook as Parquet, or CSV without pyarrow.
+
+    Returns:
+        str: Path of the file written (base_path plus its extension)
+    """
+    path = f"{base_path}.parquet"
+    try:
+        df.to_parquet(path, index=False)
+        return path
+    except (ImportError, TypeError, ValueError):
+        # No pyarrow, or object columns Parquet cannot type
+        if os.path.exists(path):
+            os.remove(path)
+    path = f"{base_path}.csv"
+    df.to_csv(path, index=False)
+    return path
+
+
+class StreamingWorkbookWriter:
+    """
+    Write-only workbook that receives each tab in batches.
+
+    Sheets are created lazily on the first non-empty batch of a tab, so tabs
+    without data are left out exactly like create_standard_excel_file() does.
+    Batches must arrive in tab order (all of Tab1, then Tab2, ...) to keep the
+    sheet order of the report. A tab whose batches go past Excel's row limit
+    continues on a continuation sheet (Tab2_Basic_Metrics_2, ...).
+
+    Attributes:
+        output_path (str): Destination .xlsx path
+        row_counts (Dict[str, int]): Data rows written per data_dict key
+        logger (logging.Logger): Logger for sheet creation messages
+    """
+
+    def __init__(self, output_path: str, logger: Optional[logging.Logger] = None):
+        self.output_path = output_path
+        self.logger = logger or logging.getLogger("spp_automation")
+        self.row_counts: Dict[str, int] = {key: 0 for key in TAB_SHEETS}
+
+        self._workbook = openpyxl.Workbook(write_only=True)
+        self._sheets = {}  # data_dict key -> sheets of the tab
+        self._sheet_rows: Dict[str, int] = {}  # sheet title -> data rows
+
+    def write_batch(self, data_key: str, df: pd.DataFrame) -> None:
+        """Append one result batch to the sheet of ``data_key``."""
+        capacity = EXCEL_MAX_ROWS - 1
+        start = 0
+        while start < len(df):
+            sheets = self._sheets.setdefault(data_key, [])
+            if not sheets or self._sheet_rows[sheets[-1].title] >= capacity:
+                sheet_name = continuation_sheet_name(TAB_SHEETS[data_key], len(sheets) + 1)
+                if sheets:
+                    self.logger.warning(f"{TAB_SHEETS[data_key]} reached the sheet row limit - "
+                                        f"continuing on {sheet_name}")
+                sheets.append(self._create_sheet(sheet_name, df.columns))
+            worksheet = sheets[-1]
+            rows = df.iloc[start:start + capacity - self._sheet_rows[worksheet.title]]
+            for row in dataframe_rows(rows):
+                worksheet.append(row)
+            self._sheet_rows[worksheet.title] += len(rows)
+            self.row_counts[data_key] += len(rows)
+            start += len(rows)
+
+    def write_sheet(self, sheet_name: str, df: pd.DataFrame) -> None:
+        """
+        Write a whole sheet, converting and writing WRITE_CHUNK_ROWS rows at a time.
+
+        Raises:
+            ValueError: df has more rows than fit on a sheet (see plan_sheets())
+        """
+        if df.empty:
+            return
+        if len(df) >= EXCEL_MAX_ROWS:
+            raise ValueError(f"{sheet_name}: {len(df):,} rows do not fit on one sheet")
+
+        # The size is known up front: record it, since write-only sheets
+        # are started before their rows and otherwise carry no dimension
+        worksheet = self._create_sheet(sheet_name, df.columns,
+                                       f"A1:{get_column_letter(max(1, len(df.columns)))}{len(df) + 1}")
+        for start in range(0, len(df), WRITE_CHUNK_ROWS):
+            for row in dataframe_rows(df.iloc[start:start + WRITE_CHUNK_ROWS]):
+                worksheet.append(row)
+        self._sheet_rows[sheet_name] = len(df)
+
+    def _create_sheet(self, sheet_name: str, columns, dimension: Optional[str] = None):
+        worksheet = self._workbook.create_sheet(sheet_name)
+        if dimension:
+            worksheet.calculate_dimension = lambda: dimension
+        worksheet.append(self._header_cells(worksheet, columns))
+        self._sheet_rows[sheet_name] = 0
+        return worksheet
+
+    def _header_cells(self, worksheet, columns) -> list:
+        cells = []
+        for column_name in columns:
+            cell = WriteOnlyCell(worksheet, value=column_name)
+            cell.font = HEADER_FONT
+            cell.border = HEADER_BORDER
+            cell.alignment = HEADER_ALIGNMENT
+            cells.append(cell)
+        return cells
+
+    def save(self) -> bool:
+        """Save the workbook; returns False when no tab received any rows."""
+        if not self._sheet_rows:
+            return False
+
+        for sheet_name, rows in self._sheet_rows.items():
+            self.logger.info(f"Created sheet {sheet_name} with {rows} rows")
+        self._workbook.save(self.output_path)
+        self.logger.info(f"Streaming Excel file created successfully: {self.output_path}")
+        return True
+
+
+class TemplatePackage:
+    """
+    A template's zip package with the workbook structure injection needs.
+
+    Built from the template file's path, or from its bytes so that one
+    parsed copy can be injected into every output of a batch (see
+    spp_template_cache.TemplateCache).
+
+    Attributes:
+        source (Union[str, bytes]): Package path or content
+        workbook_part (str): Path of the workbook part
+        workbook_rels_part (str): Path of the workbook's relationships part
+        sheet_parts (Dict[str, str]): Sheet name -> worksheet part path
+        sheet_ids (Dict[str, str]): Sheet name -> sheetId
+        rel_ids (Set[str]): Relationship ids of the workbook
+        styles_part (Optional[str]): Path of the styles part
+        formula_sheet_ids (Set[str]): sheetIds with cells in the calculation chain
+    """
+
+    def __init__(self, source: Union[str, bytes]):
+        self.source = source
+        self._date_style: Optional[Tuple[bytes, int, Set[int]]] = None
+        with self.open() as archive:
+            self._read_workbook(archive)
+            self.formula_sheet_ids = _calc_chain_sheet_ids(archive)
+            self.part_names = set(archive.namelist())
+
+    def open(self) -> zipfile.ZipFile:
+        return zipfile.ZipFile(io.BytesIO(self.source) if isinstance(self.source, bytes) else self.source)
+
+    def date_style(self, archive: zipfile.ZipFile) -> Tuple[bytes, int, Set[int]]:
+        """_date_style() of the styles part, worked out once per package."""
+        if self._date_style is None:
+            self._date_style = _date_style(archive.read(self.styles_part))
+        return self._date_style
+
+    def _read_workbook(self, archive: zipfile.ZipFile) -> None:
+        root_rels = ElementTree.fromstring(archive.read("_rels/.rels"))
+        self.workbook_part = next(rel.get("Target").lstrip("/")
+                                  for rel in root_rels.iter(f"{_PKG_REL_NS}Relationship")
+                                  if rel.get("Type", "").endswith("/officeDocument"))
+        workbook_dir = posixpath.dirname(self.workbook_part)
+        self.workbook_rels_part = posixpath.join(workbook_dir, "_rels",
+                                                 posixpath.basename(self.workbook_part) + ".rels")
+
+        targets, self.styles_part = {}, None
+        for rel in ElementTree.fromstring(archive.read(self.workbook_rels_part)).iter(f"{_PKG_REL_NS}Relationship"):
+            target = rel.get("Target")
+            target = target.lstrip("/") if target.startswith("/") else \
+                posixpath.normpath(posixpath.join(workbook_dir, target))
+            targets[rel.get("Id")] = target
+            if rel.get("Type", "").endswith("/styles"):
+                self.styles_part = target
+        self.rel_ids = set(targets)
+
+        self.sheet_parts, self.sheet_ids = {}, {}
+        for sheet in ElementTree.fromstring(archive.read(self.workbook_part)).iter(f"{_MAIN_NS}sheet"):
+            name = sheet.get("name")
+            self.sheet_parts[name] = targets.get(sheet.get(f"{_DOC_REL_NS}id"))
+            self.sheet_ids[name] = sheet.get("sheetId")
+
+
+def inject_sheet_data(workbook_path: str, data_dict: Dict[str, pd.DataFrame],
+                      logger: Optional[logging.Logger] = None,
+                      package: Optional[TemplatePackage] = None,
+                      sheets: Optional[List[SheetPlan]] = None) -> bool:
+    """
+    Replace the data rows of the tab sheets of a copied template in place.
+
+    Every non-empty tab of data_dict is written below the template's header
+    row (row 1, kept byte for byte) of its sheet; tabs without rows are left
+    as the template has them, like populate_template_tabs() does. Strings
+    are written inline so the shared strings part stays untouched, and each
+    column takes the style of the template's first data row. Dates are
+    written as Excel date serials with one shared DATE_FORMAT cell style;
+    only if the template has no such style is it appended to the styles
+    part (existing styles keep their indices).
+
+    Sheets the template does not have - continuation sheets of a tab too
+    large for one sheet, the OVERFLOW_SHEET - are added after the last sheet,
+    with the header row and column widths of their tab's template sheet.
+
+    Args:
+        package (TemplatePackage, optional): Template the file at
+            workbook_path was copied from; its parts are read from there
+            instead of re-reading and re-parsing the copy
+        sheets (List[SheetPlan], optional): plan_sheets() of data_dict, when
+            the caller already made it; by default tabs are split
+
+    Returns:
+        bool: False (file unchanged) when the template cannot take the data
+        this way: a tab sheet is missing, or a tab sheet has formulas in the
+        calculation chain. The caller then populates it with openpyxl.
+    """
+    logger = logger or logging.getLogger("spp_automation")
+    package = package or TemplatePackage(workbook_path)
+    sheets = [plan for plan in (plan_sheets(data_dict, logger=logger) if sheets is None else sheets)
+              if not plan.df.empty]
+    added = [plan for plan in sheets if plan.sheet_name not in package.sheet_parts]
+
+    missing = list(dict.fromkeys(plan.template_sheet for plan in added
+                                 if plan.template_sheet is not None and plan.template_sheet not in package.sheet_parts))
+    if missing:
+        logger.info(f"Template has no {', '.join(missing)} sheet - populating it with openpyxl")
+        return False
+    if package.formula_sheet_ids & {package.sheet_ids[plan.sheet_name] for plan in sheets if plan not in added}:
+        logger.info("Template tab sheets contain formulas - populating it with openpyxl")
+        return False
+
+    dates = [date_columns(plan.df) for plan in sheets]
+    new_parts, registration = _register_sheets(package, [plan.sheet_name for plan in added])
+    targets = {package.sheet_parts.get(plan.sheet_name) or new_parts[plan.sheet_name]: index
+               for index, plan in enumerate(sheets)}
+
+    temp_path = f"{workbook_path}.inject"
+    try:
+        with package.open() as archive, zipfile.ZipFile(temp_path, "w", zipfile.ZIP_DEFLATED) as output:
+            styles_xml, date_style, date_styles = None, None, set()
+            if any(any(flags) for flags in dates):
+                styles_xml, date_style, date_styles = package.date_style(archive)
+            changed = dict(registration)
+            if styles_xml is not None:
+                changed[package.styles_part] = styles_xml
+
+            for info in archive.infolist():
+                if info.filename in targets:
+                    _inject_sheet(output, info, archive.read(info.filename), sheets[targets[info.filename]],
+                                  dates[targets[info.filename]], date_style, date_styles, logger)
+                elif info.filename in changed:
+                    output.writestr(info, _insert_before(archive.read(info.filename), *changed[info.filename])
+                                    if isinstance(changed[info.filename], tuple) else changed[info.filename])
+                else:
+                    output.writestr(info, archive.read(info.filename))
+
+            for plan in added:
+                index = sheets.index(plan)
+                xml = _continuation_sheet(archive.read(package.sheet_parts[plan.template_sheet])) \
+                    if plan.template_sheet else _plain_sheet(plan.df.columns)
+                info = zipfile.ZipInfo(new_parts[plan.sheet_name], date_time=time.localtime()[:6])
+                _inject_sheet(output, info, xml, plan, dates[index], date_style, date_styles, logger)
+        # The source archive is closed first so the copy can be replaced on Windows too
+        os.replace(temp_path, workbook_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return True
+
+
+def _inject_sheet(output: zipfile.ZipFile, info: zipfile.ZipInfo, xml: bytes, plan: SheetPlan,
+                  dates: List[bool], date_style: Optional[int], date_styles: Set[int],
+                  logger: logging.Logger) -> None:
+    part = zipfile.ZipInfo(info.filename, date_time=info.date_time)
+    part.compress_type = zipfile.ZIP_DEFLATED
+    # The part's size is unknown until it is written and a full tab can pass zipfile's 2 GiB entry limit
+    with output.open(part, "w", force_zip64=True) as stream:
+        _write_sheet_part(stream, xml, plan.df, dates, date_style, date_styles)
+    logger.info(f"Populated {plan.sheet_name} with {len(plan.df)} rows")
+
+
+def _register_sheets(package: TemplatePackage,
+                     sheet_names: List[str]) -> Tuple[Dict[str, str], Dict[str, Tuple[bytes, bytes]]]:
+    """
+    Part paths for new sheets and the additions that register them.
+
+    Returns:
+        Tuple[Dict[str, str], Dict[str, Tuple[bytes, bytes]]]: sheet name ->
+        new worksheet part, and part -> (closing tag, XML to insert before it)
+        for the content types, the workbook relationships and the workbook
+    """
+    if not sheet_names:
+        return {}, {}
+    workbook_dir = posixpath.dirname(package.workbook_part)
+    next_id = max((int(sheet_id) for sheet_id in package.sheet_ids.values()), default=0) + 1
+    new_parts, types, rels, entries = {}, [], [], []
+    number = 0
+    for offset, sheet_name in enumerate(sheet_names):
+        number += 1
+        while posixpath.join(workbook_dir, "worksheets", f"sheet{number}.xml") in package.part_names or \
+                f"rIdSpp{number}" in package.rel_ids:
+            number += 1
+        part = posixpath.join(workbook_dir, "worksheets", f"sheet{number}.xml")
+        rel_id = f"rIdSpp{number}"
+        new_parts[sheet_name] = part
+        types.append(f'<Override PartName="/{part}" ContentType="{_WORKSHEET_CONTENT_TYPE}"/>')
+        rels.append(f'<Relationship Id="{rel_id}" Type="{_WORKSHEET_REL_TYPE}" '
+                    f'Target="{posixpath.relpath(part, workbook_dir)}"/>')
+        entries.append(f'<sheet xmlns:r="{_DOC_REL_NS[1:-1]}" name="{escape(sheet_name, {chr(34): "&quot;"})}" '
+                       f'sheetId="{next_id + offset}" r:id="{rel_id}"/>')
+    return new_parts, {
+        "[Content_Types].xml": (b"</Types>", "".join(types).encode("utf-8")),
+        package.workbook_rels_part: (b"</Relationships>", "".join(rels).encode("utf-8")),
+        package.workbook_part: (b"</sheets>", "".join(entries).encode("utf-8")),
+    }
+
+
+def _insert_before(xml: bytes, closing_tag: bytes, addition: bytes) -> bytes:
+    position = xml.rfind(closing_tag)
+    if position < 0:
+        raise ValueError(f"part has no {closing_tag.decode()}")
+    return xml[:position] + addition + xml[position:]
+
+
+def _continuation_sheet(template_xml: bytes) -> bytes:
+    """Worksheet with the template sheet's header row, data row styles and column widths only."""
+    root = _WORKSHEET_TAG_RE.search(template_xml)
+    start = template_xml.find(b"<sheetData")
+    if root is None or start < 0:
+        raise ValueError("worksheet part has no sheetData")
+    open_end = template_xml.find(b">", start) + 1
+    end = open_end if template_xml[open_end - 2:open_end - 1] == b"/" else \
+        template_xml.find(b"</sheetData>", open_end) + len(b"</sheetData>")
+    cols = _COLS_RE.search(template_xml)
+    return (template_xml[:root.end()] + b'<dimension ref="A1"/>' + (cols.group(0) if cols else b"") +
+            template_xml[start:end] + b"</worksheet>")
+
+
+def _plain_sheet(columns) -> bytes:
+    """Worksheet with columns as an unstyled header row."""
+    cells = "".join(f'<c r="{get_column_letter(index)}1"{_inline_string(str(name))}'
+                    for index, name in enumerate(columns, 1))
+    return (f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<worksheet xmlns="{_MAIN_NS[1:-1]}">'
+            f'<dimension ref="A1"/><sheetData><row r="1">{cells}</row></sheetData></worksheet>').encode("utf-8")
+
+
+def _calc_chain_sheet_ids(archive: zipfile.ZipFile) -> Set[str]:
+    """sheetIds that have cells in the calculation chain (formulas)."""
+    if "xl/calcChain.xml" not in archive.namelist():
+        return set()
+    ids, current = set(), None
+    for cell in ElementTree.fromstring(archive.read("xl/calcChain.xml")).iter(f"{_MAIN_NS}c"):
+        current = cell.get("i", current)  # i carries over from the previous cell when omitted
+        ids.add(current)
+    return ids
+
+
+def _date_style(styles_xml: bytes) -> Tuple[bytes, int, Set[int]]:
+    """
+    Shared date cell style of a styles part.
+
+    Returns:
+        Tuple[bytes, int, Set[int]]: The styles part (with the DATE_FORMAT
+        style appended if it had none), the cellXfs index of that style and
+        the indices of every date-formatted cellXfs entry
+    """
+    formats = dict(BUILTIN_FORMATS)
+    for tag in _NUM_FMT_TAG_RE.findall(styles_xml):
+        attributes = dict(_ATTRIBUTE_RE.findall(tag))
+        formats[int(attributes[b"numFmtId"])] = unescape(attributes.get(b"formatCode", b"").decode("utf-8"))
+
+    xfs_start = styles_xml.find(b"<cellXfs")
+    xfs_end = styles_xml.find(b"</cellXfs>", xfs_start)
+    if xfs_start < 0 or xfs_end < 0:
+        raise ValueError("styles part has no cellXfs")
+
+    xf_tags = _XF_TAG_RE.findall(styles_xml, xfs_start, xfs_end)
+    date_styles, shared = set(), None
+    for index, tag in enumerate(xf_tags):
+        attributes = dict(_ATTRIBUTE_RE.findall(tag))
+        code = formats.get(int(attributes.get(b"numFmtId", b"0")))
+        if code and is_date_format(code):
+            date_styles.add(index)
+            plain = all(attributes.get(name, b"0") == b"0" for name in (b"fontId", b"fillId", b"borderId"))
+            if shared is None and plain and tag.endswith(b"/>") and code.lower() == DATE_FORMAT:
+                shared = index
+    if shared is not None:
+        return styles_xml, shared, date_styles
+
+    format_id = next((number for number, code in formats.items() if code.lower() == DATE_FORMAT), None)
+    shared = len(xf_tags)
+    xf = '<xf numFmtId="{}" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    if format_id is None:
+        format_id = max([number for number in formats if number >= 164] + [163]) + 1
+        styles_xml = _append_child(styles_xml, b"cellXfs", xf.format(format_id).encode())
+        num_fmt = f'<numFmt numFmtId="{format_id}" formatCode="{DATE_FORMAT}"/>'.encode()
+        if _NUM_FMTS_RE.search(styles_xml):
+            styles_xml = _append_child(styles_xml, b"numFmts", num_fmt)
+        else:
+            # numFmts must be the first child of styleSheet
+            sheet_start = styles_xml.find(b">", styles_xml.find(b"<styleSheet")) + 1
+            styles_xml = styles_xml[:sheet_start] + b'<numFmts count="1">' + num_fmt + b"</numFmts>" + \
+                styles_xml[sheet_start:]
+    else:
+        styles_xml = _append_child(styles_xml, b"cellXfs", xf.format(format_id).encode())
+    date_styles.add(shared)
+    return styles_xml, shared, date_styles
+
+
+def _append_child(xml: bytes, element: bytes, child: bytes) -> bytes:
+    """Append child to the (first) element of the given name and bump its count attribute."""
+    match = re.search(rb"<" + element + rb"\b([^>]*?)(/?)>", xml)
+    count = re.search(rb'\bcount="(\d+)"', match.group(1))
+    attributes = re.sub(rb'\s*\bcount="\d+"', b"", match.group(1))
+    opening = b'<%s%s count="%d">' % (element, attributes, (int(count.group(1)) if count else 0) + 1)
+    if match.group(2):
+        return xml[:match.start()] + opening + child + b"</" + element + b">" + xml[match.end():]
+    close = xml.find(b"</" + element + b">", match.end())
+    return xml[:match.start()] + opening + xml[match.end():close] + child + xml[close:]
+
+
+def _write_sheet_part(stream, xml: bytes, df: pd.DataFrame, dates: List[bool],
+                      date_style: Optional[int], date_styles: Set[int]) -> None:
+    """Write a worksheet part with the template's header row and df as the data rows."""
+    start = xml.find(b"<sheetData")
+    if start < 0:
+        raise ValueError("worksheet part has no sheetData")
+    open_end = xml.find(b">", start) + 1
+    if xml[open_end - 2:open_end - 1] == b"/":
+        body_end = suffix_start = open_end
+    else:
+        body_end = xml.find(b"</sheetData>", open_end)
+        suffix_start = body_end + len(b"</sheetData>")
+
+    header, header_width = b"", 0
+    styles: Dict[int, int] = {}
+    for match in _ROW_TAG_RE.finditer(xml, open_end, body_end):
+        row_number = int(match.group(1))
+        row_end = match.end() if match.group(2) else xml.find(b"</row>", match.end()) + len(b"</row>")
+        cells = _CELL_TAG_RE.findall(xml, match.end(), row_end)
+        if row_number == 1:
+            header = xml[match.start():row_end]
+            header_width = max((_column_index(tag) for tag in cells), default=0)
+        else:
+            if row_number == 2:
+                styles = {_column_index(tag): int(style.group(1))
+                          for tag in cells for style in [_CELL_STYLE_RE.search(tag)] if style}
+            break
+
+    width = max(header_width, len(df.columns))
+    dimension = f'<dimension ref="A1:{get_column_letter(max(width, 1))}{len(df) + 1}"/>'.encode()
+    stream.write(_DIMENSION_RE.sub(lambda _: dimension, xml[:start], count=1))
+    stream.write(b"<sheetData>")
+    stream.write(header)
+
+    letters = [get_column_letter(index) for index in range(1, len(df.columns) + 1)]
+    cell_styles = []
+    for index, is_date in enumerate(dates, 1):
+        style = styles.get(index)
+        if is_date and style not in date_styles:
+            style = date_style
+        cell_styles.append(f' s="{style}"' if style is not None else "")
+
+    for chunk_start in range(0, len(df), WRITE_CHUNK_ROWS):
+        chunk = df.iloc[chunk_start:chunk_start + WRITE_CHUNK_ROWS]
+        columns = [[_cell_xml(value) for value in values] for values in excel_columns(chunk, dates)]
+        lines = []
+        for row_number, values in enumerate(zip(*columns), chunk_start + 2):
+            cells = "".join(f'<c r="{letters[i]}{row_number}"{cell_styles[i]}{value}'
+                            for i, value in enumerate(values) if value is not None)
+            lines.append(f'<row r="{row_number}">{cells}</row>')
+        stream.write("".join(lines).encode("utf-8"))
+
+    stream.write(b"</sheetData>")
+    stream.write(xml[suffix_start:])
+
+
+def _column_index(cell_tag: bytes) -> int:
+    reference = _CELL_REF_RE.search(cell_tag)
+    if not reference:
+        return 0
+    index = 0
+    for letter in reference.group(1):
+        index = index * 26 + letter - 64
+    return index
+
+
+def _cell_xml(value) -> Optional[str]:
+    """Cell XML after the r/s attributes of a converted value (None: no cell is written)."""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return f' t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float, Decimal)):
+        return f"><v>{value}</v></c>" if math.isfinite(value) else None
+    return _inline_string(str(value))
+
+
+def _inline_string(text: str) -> str:
+    text = escape(ILLEGAL_CHARACTERS_RE.sub("", text))
+    space = ' xml:space="preserve"' if text != text.strip() else ""
+    return f' t="inlineStr"><is><t{space}>{text}</t></is></c>'
@@ -0,0 +1,149 @@
+"""
+SPP Export Sinks
+================
+
+Columnar and tabular copies of a report's tabs for analysts who load the
+results into pandas or Power BI, written alongside the Excel workbook or
+instead of it.
+
+Loading ``Output/*.xlsm`` files is slow and lossy (dates and quantities come
+back as whatever Excel made of them); these files keep the tab data as the
+engine produced it.
+
+Key Features:
+------------
+- **Formats**: ``parquet`` (zstd-compressed), ``csv``, ``feather``
+  (zstd-compressed) and ``sqlite`` (one database per report, one table per
+  tab), see EXPORT_FORMATS
+- **Naming**: Files sit next to the workbook and are named after it:
+  ``<report> - Tab2_Basic_Metrics - export.parquet``, ``<report>.sqlite``
+  (the suffix keeps them apart from the ``row_overflow = sidecar`` files,
+  which are written at the same time)
+- **Parallel**: ``start_export()`` writes on a background thread while the
+  workbook is being written
+- **Typed Columns**: Decimal and other numeric object columns are written
+  as numbers and date columns as datetimes
+
+Parquet and Feather require pyarrow.
+
+Developer: Ben F. Benjamaa
+Team: HD Supply Chain Excellence
+"""
+
+import logging
+import os
+import re
+import sqlite3
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Union
+
+import pandas as pd
+
+from spp_excel_writers import DATE_KINDS, NUMERIC_KINDS, TAB_SHEETS
+from spp_fetch import materialize_types
+
+# Export format -> file extension
+EXPORT_FORMATS: Dict[str, str] = {
+    "parquet": "parquet",
+    "csv": "csv",
+    "feather": "feather",
+    "sqlite": "sqlite",
+}
+
+# Ends the per-tab file names, before the extension
+EXPORT_SUFFIX = " - export"
+
+
+def parse_export_formats(formats: Union[str, Iterable[str]]) -> List[str]:
+    """
+    Export formats from a comma/space separated string or a list, in order.
+
+    Raises:
+        ValueError: An entry is not one of EXPORT_FORMATS
+    """
+    if isinstance(formats, str):
+        formats = re.split(r"[\s,]+", formats)
+    wanted = list(dict.fromkeys(entry.strip().lower() for entry in formats if entry and entry.strip()))
+    unknown = [entry for entry in wanted if entry not in EXPORT_FORMATS]
+    if unknown:
+        raise ValueError(f"Unknown export format(s) {', '.join(unknown)} - "
+                         f"choose from {', '.join(EXPORT_FORMATS)}")
+    return wanted
+
+
+def export_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Copy of df with object columns typed for columnar files (numbers, datetimes, strings)."""
+    column_types: Dict[str, str] = {}
+    strings = []
+    for column in df.columns:
+        if df[column].dtype != object:
+            continue
+        kind = pd.api.types.infer_dtype(df[column], skipna=True)
+        if kind in DATE_KINDS:
+            column_types[column] = "datetime64"
+        elif kind in NUMERIC_KINDS:
+            column_types[column] = "int64" if kind == "integer" else "float64"
+        elif kind != "empty":
+            strings.append(column)
+
+    typed = materialize_types(df, column_types)
+    return typed.assign(**{column: typed[column].astype("string") for column in strings})
+
+
+def export_data(data_dict: Dict[str, pd.DataFrame], base_path: str, formats: List[str],
+                logger: Optional[logging.Logger] = None) -> List[str]:
+    """
+    Write every tab of data_dict in each of formats.
+
+    Args:
+        data_dict (Dict[str, pd.DataFrame]): Tabs keyed like TAB_SHEETS
+        base_path (str): Workbook path without its extension
+        formats (List[str]): Entries of EXPORT_FORMATS
+
+    Returns:
+        List[str]: Paths of the files written
+    """
+    logger = logger or logging.getLogger("spp_automation")
+    started = time.perf_counter()
+    frames = {sheet_name: export_frame(data_dict[data_key])
+              for data_key, sheet_name in TAB_SHEETS.items() if data_key in data_dict}
+
+    paths = []
+    for export_format in formats:
+        if export_format == "sqlite":
+            path = f"{base_path}.sqlite"
+            if os.path.exists(path):
+                os.remove(path)
+            connection = sqlite3.connect(path)
+            try:
+                for sheet_name, df in frames.items():
+                    df.to_sql(sheet_name, connection, index=False)
+                connection.commit()
+            finally:
+                connection.close()
+            paths.append(path)
+            continue
+
+        for sheet_name, df in frames.items():
+            path = f"{base_path} - {sheet_name}{EXPORT_SUFFIX}.{EXPORT_FORMATS[export_format]}"
+            if export_format == "parquet":
+                df.to_parquet(path, index=False, compression="zstd")
+            elif export_format == "feather":
+                df.reset_index(drop=True).to_feather(path, compression="zstd")
+            else:
+                df.to_csv(path, index=False)
+            paths.append(path)
+
+    logger.info(f"Exported {len(paths)} files ({', '.join(formats)}) in {time.perf_counter() - started:.2f}s")
+    return paths
+
+
+def start_export(data_dict: Dict[str, pd.DataFrame], base_path: str, formats: List[str],
+                 logger: Optional[logging.Logger] = None) -> "Future[List[str]]":
+    """Run export_data() on a background thread; the future's result is the list of paths."""
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="spp-export")
+    try:
+        return executor.submit(export_data, data_dict, base_path, formats, logger)
+    finally:
+        executor.shutdown(wait=False)
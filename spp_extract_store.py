@@ -0,0 +1,205 @@
+"""
+SPP Incremental Extract Store
+=============================
+
+Local per-vendor store of raw ASN delivery lines (LIKP/LIPS by ERDAT) with a
+high-water mark, so a mid-month re-run only asks Snowflake for the days
+since the last sync instead of the whole month.
+
+How a Sync Works:
+----------------
+1. ``plan()`` works out, per vendor, from which ERDAT the stored lines can no
+   longer be trusted: the watermark, moved back ``overlap_days`` from the
+   day of the last sync so late-arriving (replicated) deliveries are picked
+   up. Vendors without a usable store need the whole window.
+2. The ASN query runs once for all vendors from the earliest such date (or
+   not at all if every vendor is settled for the window).
+3. ``merge()`` replaces each vendor's stored lines in the fetched ERDAT range
+   with the fetched ones, advances the watermark and returns the window's
+   lines from the store.
+
+Each vendor covers one contiguous ERDAT interval ``[covered_start,
+watermark)``. A window that starts before it or beyond it resets the
+vendor's store to the freshly fetched window.
+
+Storage:
+-------
+``<store_dir>/<vendor>.parquet`` (lines) and ``<vendor>.json`` (covered_start,
+watermark, synced_on). Requires pyarrow; without it the store stays disabled
+and the full window is fetched as before.
+
+Developer: Ben F. Benjamaa
+Team: HD Supply Chain Excellence
+"""
+
+import json
+import logging
+import os
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from spp_batch import tab_vendor_keys, vendor_key
+from spp_fiscal_calendar import ErdatRange
+from spp_result_cache import PARQUET_AVAILABLE
+
+# ASN_Data column holding the delivery creation date (ERDAT)
+DATE_COLUMN = 'CREATE_DATE'
+
+
+def _yyyymmdd(day: date) -> str:
+    return day.strftime("%Y%m%d")
+
+
+def _parse(value: str) -> date:
+    return datetime.strptime(value, "%Y%m%d").date()
+
+
+class IncrementalExtractStore:
+    """
+    Watermarked per-vendor store of ASN lines.
+
+    Attributes:
+        store_dir (Path): Directory of the per-vendor Parquet/JSON files
+        overlap_days (int): Days before the last sync that are always re-fetched
+        enabled (bool): False when pyarrow is missing or the store is switched off
+        logger (logging.Logger): Logger for sync decisions
+    """
+
+    def __init__(self, store_dir: str, overlap_days: int = 3, enabled: bool = True,
+                 logger: Optional[logging.Logger] = None):
+        self.store_dir = Path(store_dir)
+        self.overlap_days = overlap_days
+        self.enabled = enabled and PARQUET_AVAILABLE
+        self.logger = logger or logging.getLogger("spp_automation")
+
+    def plan(self, vendor_numbers: List[str], window: ErdatRange,
+             refresh: bool = False) -> Optional[ErdatRange]:
+        """
+        ERDAT range that must be fetched from Snowflake for window.
+
+        Returns None when every vendor's stored lines are settled for the
+        whole window. With refresh=True the whole window is fetched.
+        """
+        if refresh:
+            return window
+
+        fetch_start = window.end
+        for vendor in vendor_numbers:
+            fetch_start = min(fetch_start, self._vendor_fetch_start(vendor, window))
+
+        if fetch_start >= window.end:
+            self.logger.info(f"ASN lines for {window.start}-{window.end} served from the extract store")
+            return None
+
+        fetch = ErdatRange(fetch_start, window.end)
+        if fetch_start > window.start:
+            self.logger.info(f"Incremental ASN sync: fetching ERDAT {fetch.start}-{fetch.end} only")
+        return fetch
+
+    def merge(self, vendor_numbers: List[str], window: ErdatRange, fetched: Optional[ErdatRange],
+              df_fetched: Optional[pd.DataFrame]) -> pd.DataFrame:
+        """
+        Merge freshly fetched lines into the store and return the window's lines.
+
+        Args:
+            vendor_numbers (List[str]): Vendors of the run
+            window (ErdatRange): ERDAT window of the report
+            fetched (Optional[ErdatRange]): Range that was fetched (None: nothing)
+            df_fetched (Optional[pd.DataFrame]): ASN lines of the fetched range
+
+        Returns:
+            pd.DataFrame: ASN lines of all vendors inside window
+        """
+        keys = tab_vendor_keys('ASN_Data', df_fetched) if fetched is not None and not df_fetched.empty else None
+        frames = []
+        for vendor in vendor_numbers:
+            if fetched is not None:
+                rows = df_fetched[keys == vendor_key(vendor)] if keys is not None else df_fetched.iloc[:0]
+                vendor_rows = self._merge_vendor(vendor, fetched, rows)
+            else:
+                vendor_rows = self._load_rows(vendor)
+            if vendor_rows is not None:
+                dates = self._dates(vendor_rows)
+                frames.append(vendor_rows[(dates >= window.start) & (dates < window.end)])
+
+        non_empty = [frame for frame in frames if not frame.empty]
+        if non_empty:
+            return pd.concat(non_empty, ignore_index=True)
+        if frames:
+            return frames[0]
+        return df_fetched if df_fetched is not None else pd.DataFrame()
+
+    def _vendor_fetch_start(self, vendor: str, window: ErdatRange) -> str:
+        meta = self._load_meta(vendor)
+        if meta is None or not self._path(vendor, ".parquet").exists() or \
+                not (meta["covered_start"] <= window.start <= meta["watermark"]):
+            return window.start
+
+        # Lines created before the last sync minus the overlap are settled
+        settled = _yyyymmdd(_parse(meta["synced_on"]) - timedelta(days=self.overlap_days))
+        return max(window.start, min(meta["watermark"], settled))
+
+    def _merge_vendor(self, vendor: str, fetched: ErdatRange, rows: pd.DataFrame) -> pd.DataFrame:
+        """Replace the vendor's lines in the fetched range; returns all of its lines."""
+        meta = self._load_meta(vendor)
+        stored = self._load_rows(vendor)
+        tomorrow = _yyyymmdd(date.today() + timedelta(days=1))
+        synced_through = min(fetched.end, tomorrow)
+
+        if meta is None or stored is None or not (meta["covered_start"] <= fetched.start <= meta["watermark"]):
+            # No usable history - the store restarts with what was fetched
+            merged = rows
+            meta = {"covered_start": fetched.start, "watermark": synced_through}
+        else:
+            dates = self._dates(stored)
+            keep = stored[(dates < fetched.start) | (dates >= fetched.end)]
+            merged = pd.concat([frame for frame in (keep, rows) if not frame.empty] or [rows], ignore_index=True)
+            meta["watermark"] = max(meta["watermark"], synced_through)
+        meta["synced_on"] = _yyyymmdd(date.today())
+
+        try:
+            self.store_dir.mkdir(parents=True, exist_ok=True)
+            path = self._path(vendor, ".parquet")
+            temp_path = path.with_suffix(".tmp")
+            merged.to_parquet(temp_path, index=False)
+            os.replace(temp_path, path)
+            with open(self._path(vendor, ".json"), "w") as f:
+                json.dump(meta, f)
+        except Exception as e:
+            self.logger.warning(f"Could not update ASN extract store for vendor {vendor}: {e}")
+            self._remove(vendor)
+        return merged
+
+    def _dates(self, df: pd.DataFrame) -> pd.Series:
+        return pd.to_datetime(df[DATE_COLUMN]).dt.strftime("%Y%m%d")
+
+    def _load_meta(self, vendor: str) -> Optional[Dict[str, str]]:
+        try:
+            with open(self._path(vendor, ".json")) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _load_rows(self, vendor: str) -> Optional[pd.DataFrame]:
+        path = self._path(vendor, ".parquet")
+        if not path.exists():
+            return None
+        try:
+            return pd.read_parquet(path)
+        except Exception as e:
+            self.logger.warning(f"Discarding unreadable ASN extract for vendor {vendor}: {e}")
+            self._remove(vendor)
+            return None
+
+    def _path(self, vendor: str, suffix: str) -> Path:
+        return self.store_dir / f"{vendor_key(vendor)}{suffix}"
+
+    def _remove(self, vendor: str) -> None:
+        for suffix in (".parquet", ".json"):
+            try:
+                self._path(vendor, suffix).unlink()
+            except FileNotFoundError:
+                pass
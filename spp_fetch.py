@@ -0,0 +1,324 @@
+"""
+SPP Arrow Fetch Engine
+======================
+
+Fetches Snowflake query results as Arrow record batches instead of
+``cursor.fetchall()`` so large vendors (e.g. 3M) do not create one Python
+object per cell before the DataFrame is built.
+
+Key Features:
+------------
+- **Arrow Batches**: Result chunks are pulled with ``fetch_arrow_batches()``
+  (downloaded in parallel by the connector's prefetch threads, configured with
+  ``prefetch_threads`` in the [PERFORMANCE] section of config.ini)
+- **Columnar Tables**: ``fetch_table()`` hands back a ``pyarrow.Table``;
+  ``fetch_dataframe()`` converts it to pandas in one columnar step
+- **Streaming**: ``iter_dataframes()`` yields one result chunk at a time
+- **Measurable**: Fetch time, row count and the process RSS after the fetch
+  with its change over the fetch are logged and kept in ``stats`` for every
+  query (RSS is read with psutil, or /proc on Linux)
+- **Fallback**: Without pyarrow (or with ``arrow_fetch = False``) the classic
+  ``fetchall()`` path is used
+- **Typed Results**: Given a column type map (see TAB_COLUMN_TYPES), the
+  connector's ``decimal.Decimal`` and ``datetime.date`` object columns are
+  converted to int64/float64/datetime64 as the result is fetched, with the
+  memory of the converted columns logged before and after
+  (``typed_results`` in the [PERFORMANCE] section of config.ini)
+
+Developer: Ben F. Benjamaa
+Team: HD Supply Chain Excellence
+"""
+
+import logging
+import os
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # Optional dependency - fall back to fetchall()
+    pa = None
+
+# Result column -> dtype of each tab query, keyed by data_dict name. "int64"
+# columns fall back to float64 when they hold missing or fractional values.
+TAB_COLUMN_TYPES: Dict[str, Dict[str, str]] = {
+    'Basic_Metrics': {
+        "DATE_ORDERED": "datetime64",
+        "DATE_FIRST_RECEIVED": "datetime64",
+        "DATE_LAST_RECEIVED": "datetime64",
+        "METRIC_UNITS_RECEIVED": "int64",
+        "METRIC_UNITS_ORDERED": "int64",
+    },
+    'ASN_Data': {
+        "CREATE_DATE": "datetime64",
+        "QUANTITY_ORDERED": "float64",
+        "QUANTITY_RECEIVED": "float64",
+    },
+    'PDH_Compliance': {
+        "REQUEST_DATE_DAY": "datetime64",
+        "QUESTION_DATE_DAY": "datetime64",
+        "UPDATE_DATE_DAY": "datetime64",
+        "DAYS_SINCE_REQUEST": "int64",
+    },
+}
+
+COLUMN_TYPES = ("int64", "float64", "datetime64")
+
+# Object columns longer than this have their memory estimated from a sample
+_MEMORY_SAMPLE_ROWS = 10000
+
+
+def current_rss_mb() -> Optional[float]:
+    """Return the current resident set size of this process in MB, if measurable."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        pass
+
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def peak_rss_mb() -> Optional[float]:
+    """
+    Return the peak resident set size of this process in MB, if measurable.
+
+    The peak covers the whole life of the process, so it only describes one
+    piece of work when that work has a process to itself (see
+    spp_writer_benchmark.py); use current_rss_mb() around it otherwise.
+    """
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS, kilobytes on Linux
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        pass
+
+    try:
+        import psutil
+        memory = psutil.Process().memory_info()
+        return getattr(memory, "peak_wset", memory.rss) / (1024 * 1024)
+    except ImportError:
+        return None
+
+
+def column_memory_mb(series: pd.Series) -> float:
+    """
+    Memory held by a column in MB, including the Python objects of an object column.
+
+    Long object columns are measured on an even sample and scaled, so the
+    figure stays cheap to compute for millions of rows.
+    """
+    if series.dtype != object or len(series) <= _MEMORY_SAMPLE_ROWS:
+        return series.memory_usage(index=False, deep=True) / (1024 * 1024)
+    sample = series.iloc[::len(series) // _MEMORY_SAMPLE_ROWS]
+    return sample.memory_usage(index=False, deep=True) * len(series) / len(sample) / (1024 * 1024)
+
+
+def materialize_types(df: pd.DataFrame, column_types: Optional[Dict[str, str]],
+                      logger: Optional[logging.Logger] = None, name: str = "result") -> pd.DataFrame:
+    """
+    Convert the columns of df named in column_types to native dtypes.
+
+    Each column is converted in one vectorized step: ``"datetime64"`` with
+    ``pd.to_datetime`` to microsecond datetimes, ``"float64"`` and ``"int64"`` with ``pd.to_numeric``
+    (an int64 column holding missing or fractional values stays float64).
+    Values that cannot be converted become NaN/NaT. Columns that are missing
+    from df or already have their dtype are left alone, so typing a frame
+    twice costs nothing.
+
+    Args:
+        df (pd.DataFrame): Fetched result
+        column_types (Optional[Dict[str, str]]): Column -> one of COLUMN_TYPES
+        logger (Optional[logging.Logger]): Logs the converted columns' memory
+            before and after; nothing is logged without it
+        name (str): Result name used in the log message
+
+    Returns:
+        pd.DataFrame: df itself when nothing needed converting, else a
+        shallow copy with the converted columns
+
+    Raises:
+        ValueError: A column type is not one of COLUMN_TYPES
+    """
+    unknown = sorted(set((column_types or {}).values()) - set(COLUMN_TYPES))
+    if unknown:
+        raise ValueError(f"Unknown column type(s) {', '.join(unknown)} - choose from {', '.join(COLUMN_TYPES)}")
+
+    columns = [column for column, dtype in (column_types or {}).items()
+               if column in df.columns and not _has_type(df[column], dtype)]
+    if not columns:
+        return df
+
+    started = time.perf_counter()
+    before = sum(column_memory_mb(df[column]) for column in columns) if logger else 0.0
+    typed = {column: _convert(df[column], column_types[column]) for column in columns}
+    df = df.assign(**typed)
+
+    if logger:
+        after = sum(column_memory_mb(series) for series in typed.values())
+        logger.info(f"{name}: typed {len(columns)} columns ({', '.join(columns)}) in "
+                    f"{time.perf_counter() - started:.2f}s - memory {before:.1f} MB -> {after:.1f} MB")
+    return df
+
+
+def _has_type(series: pd.Series, dtype: str) -> bool:
+    if dtype == "datetime64":
+        return pd.api.types.is_datetime64_any_dtype(series.dtype)
+    if dtype == "int64":
+        # Integer columns with missing values come out of pandas as float64
+        return pd.api.types.is_integer_dtype(series.dtype) or pd.api.types.is_float_dtype(series.dtype)
+    return pd.api.types.is_float_dtype(series.dtype)
+
+
+def _convert(series: pd.Series, dtype: str) -> pd.Series:
+    if dtype == "datetime64":
+        return _to_datetime(series)
+
+    values = pd.to_numeric(series, errors="coerce")
+    if dtype == "int64":
+        if pd.api.types.is_integer_dtype(values.dtype):
+            return values.astype(np.int64)
+        floats = values.to_numpy(dtype=float)
+        if np.isfinite(floats).all() and (floats == np.floor(floats)).all():
+            return values.astype(np.int64)
+    return values.astype(float)
+
+
+def _to_datetime(series: pd.Series) -> pd.Series:
+    """
+    datetime64[us] column of series; unparseable values become NaT.
+
+    Microseconds keep SAP's open-ended 9999-12-31 dates, which nanosecond
+    datetimes (the only unit of pandas < 2) overflow after 2262-04-11. On
+    pandas < 2 a column holding such dates is left as objects instead.
+    """
+    converted = pd.to_datetime(series, errors="coerce")
+    if converted.dtype.kind != "M":  # tz-aware values keep their dtype
+        return converted
+    stamps = converted.to_numpy().astype("datetime64[us]")
+    lost = np.flatnonzero(converted.isna().to_numpy() & series.notna().to_numpy())
+    for index in lost:
+        try:
+            stamps[index] = np.datetime64(series.iloc[index], "us")
+        except (TypeError, ValueError):
+            pass
+    try:
+        return pd.Series(stamps, index=series.index, name=series.name)
+    except pd.errors.OutOfBoundsDatetime:
+        return series
+
+
+class ArrowFetchEngine:
+    """
+    Turns an executed Snowflake cursor into a columnar result.
+
+    Attributes:
+        use_arrow (bool): Fetch Arrow batches when pyarrow is installed
+        logger (logging.Logger): Logger for per-query fetch statistics
+        stats (List[Dict]): Fetch statistics for every query fetched so far
+    """
+
+    def __init__(self, use_arrow: bool = True, logger: Optional[logging.Logger] = None):
+        self.use_arrow = use_arrow and pa is not None
+        self.logger = logger or logging.getLogger("spp_automation")
+        self.stats: List[Dict[str, Any]] = []
+
+    def fetch_table(self, cursor) -> "pa.Table":
+        """
+        Fetch all result chunks of an executed cursor as one Arrow table.
+
+        Raises:
+            RuntimeError: If pyarrow is not installed
+        """
+        if pa is None:
+            raise RuntimeError("pyarrow is required for Arrow result fetching")
+
+        started, rss_before = time.perf_counter(), current_rss_mb()
+        table = self._concat_batches(cursor)
+        self._record("arrow", table.num_rows, started, rss_before)
+        return table
+
+    def fetch_dataframe(self, cursor, column_types: Optional[Dict[str, str]] = None,
+                        name: str = "result") -> pd.DataFrame:
+        """
+        Fetch all rows of an executed cursor into a DataFrame.
+
+        Columns named in column_types are converted with materialize_types()
+        once the rows are in; name labels its log message.
+        """
+        started, rss_before = time.perf_counter(), current_rss_mb()
+        if self.use_arrow:
+            df = self._concat_batches(cursor).to_pandas()
+            method = "arrow"
+        else:
+            df = pd.DataFrame(cursor.fetchall(), columns=self._column_names(cursor))
+            method = "fetchall"
+        self._record(method, len(df), started, rss_before)
+        return materialize_types(df, column_types, self.logger, name) if column_types else df
+
+    def iter_dataframes(self, cursor, batch_size: int = 50000,
+                        column_types: Optional[Dict[str, str]] = None) -> Iterator[pd.DataFrame]:
+        """
+        Yield the rows of an executed cursor as a sequence of small DataFrames.
+
+        Only one result chunk is held in memory at a time, which lets callers
+        stream a result straight into its destination. Each chunk is typed
+        with column_types (without logging). int64 columns are streamed as
+        float64: whether a column has missing values is only known per chunk,
+        and every chunk of a result must have the same dtypes.
+        """
+        if column_types:
+            column_types = {column: "float64" if dtype == "int64" else dtype for column, dtype in column_types.items()}
+        started, rss_before = time.perf_counter(), current_rss_mb()
+        rows = 0
+        if self.use_arrow:
+            for batch in cursor.fetch_arrow_batches():
+                if batch.num_rows:
+                    rows += batch.num_rows
+                    yield materialize_types(batch.to_pandas(), column_types)
+            method = "arrow stream"
+        else:
+            columns = self._column_names(cursor)
+            while True:
+                chunk = cursor.fetchmany(batch_size)
+                if not chunk:
+                    break
+                rows += len(chunk)
+                yield materialize_types(pd.DataFrame(chunk, columns=columns), column_types)
+            method = "fetchmany stream"
+        self._record(method, rows, started, rss_before)
+
+    def _concat_batches(self, cursor) -> "pa.Table":
+        batches = [batch for batch in cursor.fetch_arrow_batches() if batch.num_rows]
+        if batches:
+            return pa.concat_tables(batches)
+        # Empty results come back without batches - keep the column names
+        return pa.table({name: pa.array([], type=pa.null()) for name in self._column_names(cursor)})
+
+    def _column_names(self, cursor) -> List[str]:
+        return [desc[0] for desc in cursor.description] if cursor.description else []
+
+    def _record(self, method: str, rows: int, started: float, rss_before: Optional[float]) -> None:
+        elapsed = time.perf_counter() - started
+        rss = current_rss_mb()
+        delta = rss - rss_before if rss is not None and rss_before is not None else None
+        self.stats.append({
+            "method": method,
+            "rows": rows,
+            "fetch_seconds": round(elapsed, 3),
+            "rss_mb": round(rss, 1) if rss is not None else None,
+            "rss_delta_mb": round(delta, 1) if delta is not None else None,
+        })
+        rss_text = f"{rss:.1f} MB ({delta:+.1f} MB)" if delta is not None else "n/a"
+        self.logger.info(f"Fetched {rows} rows via {method} in {elapsed:.2f}s (RSS {rss_text})")
@@ -0,0 +1,165 @@
+"""
+SPP Fiscal Calendar
+===================
+
+Turns the report month and date filter entered in the GUI into explicit
+``[start, end)`` ERDAT ranges for the SAP delivery tables (LIKP).
+
+A range predicate on the raw ERDAT column lets Snowflake prune LIKP
+micro-partitions by their min/max metadata, which ``ERDAT LIKE '202504%'``
+does not.
+
+Calendar Conventions:
+--------------------
+- Report months are labelled with the calendar month of the activity:
+  ``"FY2025-APR"`` covers 2025-04-01 through 2025-04-30, the same label the
+  ASN queries build with ``TO_CHAR(ERDAT, '"FY"YYYY-MON')``
+- Date filters are YYYYMMDD prefixes (``"2025"``, ``"202504"`` or
+  ``"20250415"``), matching what the former ``LIKE :n || '%'`` filter accepted
+- ERDAT is stored as a YYYYMMDD string, so range bounds are YYYYMMDD strings
+
+Developer: Ben F. Benjamaa
+Team: HD Supply Chain Excellence
+"""
+
+import re
+from datetime import date, timedelta
+from typing import List, NamedTuple, Optional
+
+import pandas as pd
+
+MONTH_ABBREVIATIONS = ['JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN',
+                       'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC']
+
+_REPORT_MONTH_PATTERN = re.compile(r"^FY(\d{4})-([A-Z]{3})$")
+
+
+class ErdatRange(NamedTuple):
+    """Half-open ERDAT range as YYYYMMDD strings: start <= ERDAT < end."""
+    start: str
+    end: str
+
+
+def _month_start(year: int, month: int) -> date:
+    return date(year + (month - 1) // 12, (month - 1) % 12 + 1, 1)
+
+
+def _range(start: date, end: date) -> ErdatRange:
+    return ErdatRange(start.strftime("%Y%m%d"), end.strftime("%Y%m%d"))
+
+
+def _parse_report_month(report_month: str) -> date:
+    match = _REPORT_MONTH_PATTERN.match((report_month or "").strip().upper())
+    if not match or match.group(2) not in MONTH_ABBREVIATIONS:
+        raise ValueError(f"Report month must look like FY2025-APR, got {report_month!r}")
+    return date(int(match.group(1)), MONTH_ABBREVIATIONS.index(match.group(2)) + 1, 1)
+
+
+def _report_month_label(month_start: date) -> str:
+    return f"FY{month_start.year}-{MONTH_ABBREVIATIONS[month_start.month - 1]}"
+
+
+def report_month_range(report_month: str) -> ErdatRange:
+    """
+    ERDAT range of a report month such as ``"FY2025-APR"``.
+
+    Raises:
+        ValueError: If the report month is not in ``FYYYYY-MON`` format
+    """
+    start = _parse_report_month(report_month)
+    return _range(start, _month_start(start.year, start.month + 1))
+
+
+def report_months_between(start_month: str, end_month: str) -> List[str]:
+    """
+    All report months from start_month through end_month inclusive.
+
+    Example:
+        ``report_months_between("FY2025-NOV", "FY2026-JAN")`` ->
+        ``["FY2025-NOV", "FY2025-DEC", "FY2026-JAN"]``
+
+    Raises:
+        ValueError: If a month is malformed or end_month is before start_month
+    """
+    start = _parse_report_month(start_month)
+    end = _parse_report_month(end_month)
+    if end < start:
+        raise ValueError(f"End month {end_month} is before start month {start_month}")
+
+    months = []
+    current = start
+    while current <= end:
+        months.append(_report_month_label(current))
+        current = _month_start(current.year, current.month + 1)
+    return months
+
+
+def report_month_date_filter(report_month: str) -> str:
+    """YYYYMM date filter of a report month (``"FY2025-APR"`` -> ``"202504"``)."""
+    return _parse_report_month(report_month).strftime("%Y%m")
+
+
+def readable_month(report_month: str) -> str:
+    """Report month as used in file names (``"FY2025-APR"`` -> ``"APR 2025"``)."""
+    start = _parse_report_month(report_month)
+    return f"{MONTH_ABBREVIATIONS[start.month - 1]} {start.year}"
+
+
+def report_month_labels(dates: pd.Series) -> pd.Series:
+    """
+    Report month label of each date, like ``TO_CHAR(ERDAT, '"FY"YYYY-MON')``.
+
+    Missing dates give missing labels.
+    """
+    dates = pd.to_datetime(dates)
+    months = dates.dt.month.map(lambda month: MONTH_ABBREVIATIONS[int(month) - 1] if pd.notna(month) else None)
+    return 'FY' + dates.dt.year.astype('Int64').astype('string') + '-' + months
+
+
+def date_filter_range(date_filter: str) -> ErdatRange:
+    """
+    ERDAT range covered by a YYYY, YYYYMM or YYYYMMDD date filter.
+
+    Raises:
+        ValueError: If the date filter is not a valid date prefix
+    """
+    value = (date_filter or "").strip()
+    if not value.isdigit() or len(value) not in (4, 6, 8):
+        raise ValueError(f"Date filter must be YYYY, YYYYMM or YYYYMMDD, got {date_filter!r}")
+
+    year = int(value[:4])
+    if len(value) == 4:
+        return _range(date(year, 1, 1), date(year + 1, 1, 1))
+
+    month = int(value[4:6])
+    if not 1 <= month <= 12:
+        raise ValueError(f"Invalid month in date filter {date_filter!r}")
+    if len(value) == 6:
+        return _range(_month_start(year, month), _month_start(year, month + 1))
+
+    day = date(year, month, int(value[6:8]))
+    return _range(day, day + timedelta(days=1))
+
+
+def erdat_span(report_months: List[str], start_date_filter: Optional[str] = None,
+               end_date_filter: Optional[str] = None) -> ErdatRange:
+    """
+    ERDAT range covering a run of report months (first to last, inclusive).
+
+    Explicit start/end date filters override the month boundaries.
+    """
+    start = erdat_range(report_months[0], start_date_filter).start
+    end = erdat_range(report_months[-1], end_date_filter).end
+    return ErdatRange(start, end)
+
+
+def erdat_range(report_month: Optional[str], date_filter: Optional[str]) -> ErdatRange:
+    """
+    ERDAT range for the ASN queries.
+
+    The date filter decides the range, as it always has; the report month is
+    used when no date filter was given.
+    """
+    if date_filter and date_filter.strip():
+        return date_filter_range(date_filter)
+    return report_month_range(report_month)
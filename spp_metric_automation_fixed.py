@@ -17,6 +17,9 @@ import re
 import openpyxl
 from openpyxl.utils.dataframe import dataframe_to_rows
 
+from spp_excel_writers import clear_data_rows, write_frame_rows
+from spp_fetch import ArrowFetchEngine
+
 class SPPMetricAutomationFixed:
     """Enhanced SPP Metric Automation with full multi-tab support and ASN integration."""
     
@@ -25,6 +28,7 @@ class SPPMetricAutomationFixed:
         self.user_email = user_email
         self.connection = None
         self.logger = self.setup_logging()
+        self.fetch_engine = ArrowFetchEngine(logger=self.logger)
         
     def setup_logging(self):
         """Set up logging configuration."""
@@ -198,12 +202,8 @@ ORDER BY IH.ERDAT DESC, V.NAME1, ZUKRL
             cursor = self.connection.cursor()
             cursor.execute(query)
             
-            # Fetch results
-            results = cursor.fetchall()
-            columns = [desc[0] for desc in cursor.description]
-            
-            # Create DataFrame
-            df = pd.DataFrame(results, columns=columns)
+            # Fetch results as Arrow batches (falls back to fetchall without pyarrow)
+            df = self.fetch_engine.fetch_dataframe(cursor)
             cursor.close()
             
             self.logger.info(f"Query executed successfully. Retrieved {len(df)} rows.")
@@ -326,20 +326,19 @@ ORDER BY IH.ERDAT DESC, V.NAME1, ZUKRL
                 
                 ws_metric = wb['METRIC DATA']
                 
-                # Clear existing data (preserve macros)
-                for row in ws_metric.iter_rows():
-                    for cell in row:
-                        cell.value = None
+                # Clear existing data below the header in bulk (preserve macros and header formatting)
+                template_cells = clear_data_rows(ws_metric)
                 
                 # Write headers
                 df_metrics = data_dict['METRIC DATA']
                 for col_idx, column in enumerate(df_metrics.columns, 1):
                     ws_metric.cell(row=1, column=col_idx, value=column)
+                for row in ws_metric.iter_rows(min_row=1, max_row=1, min_col=len(df_metrics.columns) + 1):
+                    for cell in row:
+                        cell.value = None
                 
-                # Write data
-                for row_idx, row_data in enumerate(df_metrics.values, 2):
-                    for col_idx, value in enumerate(row_data, 1):
-                        ws_metric.cell(row=row_idx, column=col_idx, value=value)
+                # Write data - values converted once per column, dates as Excel serials
+                write_frame_rows(ws_metric, df_metrics, 2, template_cells)
                 
                 self.logger.info(f"Populated METRIC DATA with {len(df_metrics)} rows")
             
@@ -353,20 +352,19 @@ ORDER BY IH.ERDAT DESC, V.NAME1, ZUKRL
                 
                 ws_asn = wb['ASN Data']
                 
-                # Clear existing data (preserve macros)
-                for row in ws_asn.iter_rows():
-                    for cell in row:
-                        cell.value = None
+                # Clear existing data below the header in bulk (preserve macros and header formatting)
+                template_cells = clear_data_rows(ws_asn)
                 
                 # Write headers
                 df_asn = data_dict['ASN Data']
                 for col_idx, column in enumerate(df_asn.columns, 1):
                     ws_asn.cell(row=1, column=col_idx, value=column)
+                for row in ws_asn.iter_rows(min_row=1, max_row=1, min_col=len(df_asn.columns) + 1):
+                    for cell in row:
+                        cell.value = None
                 
-                # Write data
-                for row_idx, row_data in enumerate(df_asn.values, 2):
-                    for col_idx, value in enumerate(row_data, 1):
-                        ws_asn.cell(row=row_idx, column=col_idx, value=value)
+                # Write data - values converted once per column, dates as Excel serials
+                write_frame_rows(ws_asn, df_asn, 2, template_cells)
                 
                 self.logger.info(f"Populated ASN Data with {len(df_asn)} rows")
             else:
@@ -0,0 +1,619 @@
+"""
+SPP Offline Warehouse
+=====================
+
+Local stand-in for the Snowflake connection, backed by an embedded DuckDB
+database filled by the synthetic data generator (spp_synthetic_data.py).
+It lets run_full_automation() and the batch/range modes run end to end -
+and be benchmarked - on any machine without an HDSUPPLY-DATA login.
+
+Connector Surface:
+-----------------
+``OfflineConnection`` / ``OfflineCursor`` implement the parts of the
+Snowflake connector the engine uses: ``execute`` with numeric binds,
+``description``, ``fetchone`` / ``fetchmany`` / ``fetchall``,
+``fetch_arrow_batches``, ``execute_async`` with ``sfqid``,
+``get_query_status_throw_if_error`` / ``is_still_running`` /
+``get_results_from_sfqid`` and ``SYSTEM$CANCEL_QUERY``. Async queries run
+on a thread pool, so concurrent tab queries overlap as they do on a
+warehouse.
+
+Dialect Translation:
+-------------------
+``translate_sql()`` rewrites the Snowflake constructs of the SPP queries
+for DuckDB: ``:n`` binds, ``FLATTEN(PARSE_JSON(...))`` and ``VALUE:key``
+paths, ``SPLIT_TO_TABLE``, ``TO_CHAR`` / ``TO_DATE`` / ``TRY_TO_DATE``
+formats, ``LTRIM(x, 0)``, ``ZEROIFNULL`` and ``CURRENT_TIMESTAMP()``.
+Temporary tables are created as ordinary tables of the connection's
+private database so async cursors see them, as Snowflake session temp
+tables are. Session statements (``USE``, ``ALTER SESSION``) are accepted,
+``SHOW PARAMETERS LIKE 'QUERY_TAG'`` returns the session's tag and query
+history is answered from the statements the connection ran.
+
+Storage:
+-------
+In memory by default. With ``data_dir`` the source databases are DuckDB
+files in that directory, so a 5M-row dataset is generated once and reused
+(``load_synthetic_warehouse()`` skips generation when the stored dataset
+matches).
+
+Requires the optional ``duckdb`` package (``OFFLINE_AVAILABLE``).
+
+Usage:
+-----
+``python spp_offline.py --rows 100k`` generates a dataset and runs one
+report against it; see ``--help`` for batch runs and persistent datasets.
+
+Developer: Ben F. Benjamaa
+Team: HD Supply Chain Excellence
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import re
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from spp_export import EXPORT_FORMATS
+from spp_synthetic_data import (DEFAULT_REPORT_MONTHS, SyntheticDataset, default_vendor_count, generate_tables,
+                                parse_scale)
+
+try:
+    import duckdb
+    import pyarrow as pa
+    OFFLINE_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    duckdb = None
+    pa = None
+    OFFLINE_AVAILABLE = False
+
+# Databases (Snowflake catalogs) the SPP queries read
+SOURCE_DATABASES = ("EDP", "DM_SUPPLYCHAIN")
+
+# Dataset description stored next to a persistent warehouse
+MANIFEST_FILE = "synthetic_dataset.json"
+
+# Rows per Arrow batch handed out by fetch_arrow_batches()
+ARROW_BATCH_ROWS = 100000
+
+HISTORY_COLUMNS = ("QUERY_ID", "TOTAL_ELAPSED_TIME", "COMPILATION_TIME", "QUEUED_TIME", "EXECUTION_TIME",
+                   "BYTES_SCANNED", "ROWS_PRODUCED", "WAREHOUSE_SIZE")
+
+_SESSION_STATEMENT = re.compile(r"^\s*(USE\s|ALTER\s+SESSION\s)", re.IGNORECASE)
+_QUERY_TAG = re.compile(r"ALTER\s+SESSION\s+SET\s+QUERY_TAG\s*=\s*'([^']*)'", re.IGNORECASE)
+_SHOW_QUERY_TAG = re.compile(r"^\s*SHOW\s+PARAMETERS\s+LIKE\s+'QUERY_TAG'", re.IGNORECASE)
+_CANCEL_QUERY = re.compile(r"SYSTEM\$CANCEL_QUERY\('([^']*)'\)", re.IGNORECASE)
+_CONTEXT_QUERY = re.compile(r"^\s*SELECT\s+CURRENT_USER\(\)", re.IGNORECASE)
+_VALUE_PATH = re.compile(r"(?::(\w+))?::STRING", re.IGNORECASE)
+_FM_NUMBER = re.compile(r"^'FM9*\.?(9*)'$", re.IGNORECASE)
+
+# Snowflake name resolution the translator cannot express generally: the PDH
+# query joins on a select-list alias, which DuckDB only allows in the select list
+_DIALECT_PATCHES = (
+    ("ON TRIMMED_VENDOR = Supplier_Number", "ON TRIMMED_VENDOR = Primary_Request.Supplier_Name"),
+)
+
+
+def _date_format(literal: str) -> Tuple[str, bool]:
+    """strftime format of a Snowflake date format literal; True if it needs upper-casing (MON)."""
+    text = literal[1:-1]
+    parts = re.split(r'("[^"]*")', text)
+    converted = []
+    upper = False
+    for part in parts:
+        if part.startswith('"'):
+            converted.append(part[1:-1].replace("%", "%%"))
+            continue
+        for token, code in (("YYYY", "%Y"), ("MON", "%b"), ("MM", "%m"), ("DD", "%d"),
+                            ("HH24", "%H"), ("MI", "%M"), ("SS", "%S")):
+            if token == "MON" and re.search(token, part, re.IGNORECASE):
+                upper = True
+            part = re.sub(token, code, part, flags=re.IGNORECASE)
+        converted.append(part)
+    return "'" + "".join(converted) + "'", upper
+
+
+def _to_char(args: List[str]) -> str:
+    if len(args) == 1:
+        return f"CAST({args[0]} AS VARCHAR)"
+    number = _FM_NUMBER.match(args[1])
+    if number:
+        return f"printf('%.{len(number.group(1))}f', {args[0]})"
+    fmt, upper = _date_format(args[1])
+    text = f"strftime(CAST({args[0]} AS TIMESTAMP), {fmt})"
+    return f"upper({text})" if upper else text
+
+
+def _to_date(args: List[str], strict: bool = True) -> str:
+    if len(args) == 1:
+        return f"CAST({args[0]} AS DATE)"
+    parse = "strptime" if strict else "try_strptime"
+    fmt, _ = _date_format(args[1])
+    return f"CAST({parse}(CAST({args[0]} AS VARCHAR), {fmt}) AS DATE)"
+
+
+def _flatten(args: List[str]) -> str:
+    source = re.sub(r"^\s*INPUT\s*=>\s*", "", args[0], flags=re.IGNORECASE)
+    return f"(SELECT unnest(from_json({source}, '[\"JSON\"]')) AS VALUE)"
+
+
+def _split_to_table(args: List[str]) -> str:
+    split = f"string_split(CAST({args[0]} AS VARCHAR), {args[1]})"
+    return f'(SELECT generate_subscripts({split}, 1) AS "index", unnest({split}) AS "value")'
+
+
+# Snowflake function -> DuckDB rewrite of its (already translated) arguments
+_FUNCTIONS: Dict[str, Callable[[List[str]], str]] = {
+    "TO_CHAR": _to_char,
+    "TO_DATE": _to_date,
+    "TRY_TO_DATE": lambda args: _to_date(args, strict=False),
+    "LTRIM": lambda args: f"ltrim(CAST({args[0]} AS VARCHAR), CAST({args[1]} AS VARCHAR))" if len(args) > 1
+    else f"ltrim({args[0]})",
+    "ZEROIFNULL": lambda args: f"coalesce({args[0]}, 0)",
+    "DATE": lambda args: f"CAST({args[0]} AS DATE)",
+    "TIME": lambda args: f"CAST({args[0]} AS TIME)",
+    "CURRENT_TIMESTAMP": lambda args: "CAST(current_timestamp AS TIMESTAMP)",
+    "PARSE_JSON": lambda args: args[0],
+    "FLATTEN": _flatten,
+    "TABLE": lambda args: args[0],
+    "SPLIT_TO_TABLE": _split_to_table,
+}
+
+
+def _skip_literal(sql: str, start: int) -> int:
+    """Index after the quoted literal or identifier starting at start."""
+    quote = sql[start]
+    index = start + 1
+    while index < len(sql):
+        if sql[index] == quote:
+            if sql.startswith(quote * 2, index):
+                index += 2
+                continue
+            return index + 1
+        index += 1
+    return index
+
+
+def _split_args(sql: str, start: int) -> Tuple[List[str], int]:
+    """Top-level arguments of the call whose "(" precedes start; returns (args, index after ")")."""
+    args, depth, index, arg_start = [], 0, start, start
+    while index < len(sql):
+        char = sql[index]
+        if char in "'\"":
+            index = _skip_literal(sql, index)
+            continue
+        if sql.startswith("--", index):
+            end = sql.find("\n", index)
+            index = len(sql) if end < 0 else end
+            continue
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            if depth == 0:
+                last = sql[arg_start:index].strip()
+                if last or args:
+                    args.append(last)
+                return args, index + 1
+            depth -= 1
+        elif char == "," and depth == 0:
+            args.append(sql[arg_start:index].strip())
+            arg_start = index + 1
+        index += 1
+    raise ValueError("Unbalanced parentheses in SQL statement")
+
+
+def _translate(sql: str) -> str:
+    out: List[str] = []
+    index = 0
+    length = len(sql)
+    while index < length:
+        char = sql[index]
+        if char in "'\"":
+            end = _skip_literal(sql, index)
+            out.append(sql[index:end])
+            index = end
+        elif sql.startswith("--", index):
+            end = sql.find("\n", index)
+            index = length if end < 0 else end
+        elif char == ":" and sql[index + 1:index + 2].isdigit() and (index == 0 or sql[index - 1] not in ":_" and
+                                                                     not sql[index - 1].isalnum()):
+            end = index + 1
+            while end < length and sql[end].isdigit():
+                end += 1
+            out.append("$" + sql[index + 1:end])
+            index = end
+        elif char.isalpha() or char == "_":
+            end = index
+            while end < length and (sql[end].isalnum() or sql[end] in "_$"):
+                end += 1
+            word = sql[index:end]
+            after = end
+            while after < length and sql[after] in " \t":
+                after += 1
+            qualified = index > 0 and sql[index - 1] == "."
+            if not qualified and after < length and sql[after] == "(" and word.upper() in _FUNCTIONS:
+                args, end = _split_args(sql, after + 1)
+                out.append(_FUNCTIONS[word.upper()]([_translate(arg) for arg in args]))
+            elif word == "VALUE" and not qualified and _VALUE_PATH.match(sql, end):
+                path = _VALUE_PATH.match(sql, end)
+                out.append(f"(VALUE->>'{path.group(1) or '$'}')")
+                end = path.end()
+            else:
+                out.append(word)
+            index = end
+        else:
+            out.append(char)
+            index += 1
+    return "".join(out)
+
+
+@lru_cache(maxsize=256)
+def translate_sql(sql: str) -> str:
+    """
+    Rewrite a Snowflake statement of the SPP engine for DuckDB.
+
+    Statement texts are stable across vendors and months, so translations
+    are cached.
+    """
+    for snowflake_text, duckdb_text in _DIALECT_PATCHES:
+        sql = sql.replace(snowflake_text, duckdb_text)
+    sql = re.sub(r"\bTEMPORARY\s+TABLE\b", "TABLE", sql, flags=re.IGNORECASE)
+    return _translate(sql)
+
+
+def _result_names(sql: str, names: Sequence[str]) -> List[str]:
+    """Column names as Snowflake reports them: unquoted identifiers upper-cased."""
+    quoted = set(re.findall(r'"([^"]+)"', sql))
+    return [name if name in quoted else name.upper() for name in names]
+
+
+class OfflineCursor:
+    """
+    Cursor of an OfflineConnection (Snowflake connector cursor surface).
+
+    Attributes:
+        connection (OfflineConnection): Owning connection
+        description (List[Tuple]): Column descriptions of the last result
+        sfqid (str): Query ID of the last executed or submitted statement
+        rowcount (int): Rows of the last canned result (-1 for queries)
+    """
+
+    def __init__(self, connection: "OfflineConnection"):
+        self.connection = connection
+        self.description: Optional[List[Tuple]] = None
+        self.sfqid: Optional[str] = None
+        self.rowcount = -1
+        self._cursor = None
+        self._rows: Optional[List[Tuple]] = None
+
+    def execute(self, statement: str, params: Optional[Sequence] = None) -> "OfflineCursor":
+        """Run a statement with numeric (``:1``) binds."""
+        self._close_result()
+        self.sfqid = self.connection._next_query_id()
+        canned = self.connection._session_result(statement, params)
+        if canned is not None:
+            columns, self._rows = canned
+            self.description = [(name, None, None, None, None, None, True) for name in columns] or None
+            self.rowcount = len(self._rows)
+            return self
+
+        started = time.perf_counter()
+        self._cursor = self.connection._database.cursor()
+        self._cursor.execute(translate_sql(statement), list(params) if params else None)
+        self.connection._record(self.sfqid, time.perf_counter() - started)
+        if self._cursor.description:
+            names = _result_names(statement, [desc[0] for desc in self._cursor.description])
+            self.description = [(name, *desc[1:]) for name, desc in zip(names, self._cursor.description)]
+        else:
+            self.description = None
+        return self
+
+    def execute_async(self, statement: str, params: Optional[Sequence] = None) -> "OfflineCursor":
+        """Submit a statement to run in the background; its ID is in sfqid."""
+        self.sfqid = self.connection._submit(statement, params)
+        return self
+
+    def get_results_from_sfqid(self, query_id: str) -> None:
+        """Attach the result of a finished async query to this cursor."""
+        finished = self.connection._async_result(query_id)
+        self._close_result()
+        self.sfqid = query_id
+        self._cursor, self._rows = finished._cursor, finished._rows
+        self.description, self.rowcount = finished.description, finished.rowcount
+        finished._cursor = None
+
+    def fetchone(self) -> Optional[Tuple]:
+        if self._rows is not None:
+            return self._rows.pop(0) if self._rows else None
+        return self._cursor.fetchone() if self._cursor else None
+
+    def fetchmany(self, size: int = 1) -> List[Tuple]:
+        if self._rows is not None:
+            chunk, self._rows = self._rows[:size], self._rows[size:]
+            return chunk
+        return self._cursor.fetchmany(size) if self._cursor else []
+
+    def fetchall(self) -> List[Tuple]:
+        if self._rows is not None:
+            rows, self._rows = self._rows, []
+            return rows
+        return self._cursor.fetchall() if self._cursor else []
+
+    def fetch_arrow_batches(self) -> Iterator["pa.Table"]:
+        """Yield the result as pyarrow Tables, like the connector's Arrow fetch."""
+        if self._cursor is None or self.description is None:
+            return
+        names = [desc[0] for desc in self.description]
+        if hasattr(self._cursor, "to_arrow_reader"):
+            reader = self._cursor.to_arrow_reader(ARROW_BATCH_ROWS)
+        else:
+            reader = self._cursor.fetch_record_batch(ARROW_BATCH_ROWS)
+        for batch in reader:
+            yield pa.Table.from_batches([batch]).rename_columns(names)
+
+    def close(self) -> None:
+        self._close_result()
+
+    def _close_result(self) -> None:
+        if self._cursor is not None:
+            self._cursor.close()
+        self._cursor = None
+        self._rows = None
+
+
+class OfflineConnection:
+    """
+    Snowflake connection stand-in over a DuckDB database.
+
+    Attributes:
+        data_dir (Optional[Path]): Directory of the persistent source
+            databases (None: in memory)
+        query_tag (str): Current session QUERY_TAG
+        history (List[Dict]): Statements run, for QUERY_HISTORY_BY_SESSION
+    """
+
+    def __init__(self, data_dir: Optional[str] = None, max_workers: int = 4):
+        if not OFFLINE_AVAILABLE:
+            raise RuntimeError("duckdb and pyarrow are required for the offline warehouse")
+
+        self.data_dir = Path(data_dir) if data_dir else None
+        self._database = duckdb.connect()
+        for database in SOURCE_DATABASES:
+            if self.data_dir:
+                self.data_dir.mkdir(parents=True, exist_ok=True)
+                self._database.execute(f"ATTACH '{self.data_dir / database}.duckdb' AS {database}")
+            else:
+                self._database.execute(f"ATTACH ':memory:' AS {database}")
+
+        self.query_tag = ""
+        self.history: List[Dict[str, Any]] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="offline-query")
+        self._futures: Dict[str, Future] = {}
+        self._closed = False
+
+    def cursor(self) -> OfflineCursor:
+        if self._closed:
+            raise RuntimeError("Offline connection is closed")
+        return OfflineCursor(self)
+
+    def is_closed(self) -> bool:
+        return self._closed
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        self._database.close()
+
+    def get_query_status_throw_if_error(self, query_id: str) -> str:
+        """"RUNNING" or "SUCCESS"; raises the error of a failed async query."""
+        future = self._futures[query_id]
+        if not future.done():
+            return "RUNNING"
+        if future.cancelled():
+            raise RuntimeError(f"Query {query_id} was cancelled")
+        future.result()
+        return "SUCCESS"
+
+    def is_still_running(self, status: str) -> bool:
+        return status == "RUNNING"
+
+    def _next_query_id(self) -> str:
+        with self._lock:
+            return f"offline-{next(self._ids):06d}"
+
+    def _record(self, query_id: str, seconds: float) -> None:
+        milliseconds = int(seconds * 1000)
+        with self._lock:
+            self.history.append({
+                "QUERY_ID": query_id,
+                "QUERY_TAG": self.query_tag,
+                "TOTAL_ELAPSED_TIME": milliseconds,
+                "COMPILATION_TIME": 0,
+                "QUEUED_TIME": 0,
+                "EXECUTION_TIME": milliseconds,
+                "BYTES_SCANNED": None,
+                "ROWS_PRODUCED": None,
+                "WAREHOUSE_SIZE": "OFFLINE",
+            })
+
+    def _submit(self, statement: str, params: Optional[Sequence]) -> str:
+        cursor = OfflineCursor(self)
+        query_id = self._next_query_id()
+
+        def run() -> OfflineCursor:
+            cursor.execute(statement, params)
+            # Keep the submitted ID; execute() numbered the statement itself
+            with self._lock:
+                for entry in self.history:
+                    if entry["QUERY_ID"] == cursor.sfqid:
+                        entry["QUERY_ID"] = query_id
+            cursor.sfqid = query_id
+            return cursor
+
+        self._futures[query_id] = self._pool.submit(run)
+        return query_id
+
+    def _async_result(self, query_id: str) -> OfflineCursor:
+        return self._futures.pop(query_id).result()
+
+    def _session_result(self, statement: str,
+                        params: Optional[Sequence]) -> Optional[Tuple[Sequence[str], List[Tuple]]]:
+        """(columns, rows) of statements answered by the connection itself, else None."""
+        tag = _QUERY_TAG.search(statement)
+        if tag:
+            self.query_tag = tag.group(1)
+            return (), []
+        if re.search(r"UNSET\s+QUERY_TAG", statement, re.IGNORECASE):
+            self.query_tag = ""
+            return (), []
+        if _SESSION_STATEMENT.match(statement):
+            return (), []
+        if _SHOW_QUERY_TAG.match(statement):
+            level = "SESSION" if self.query_tag else ""
+            return ("key", "value", "default", "level", "description", "type"), [
+                ("QUERY_TAG", self.query_tag, "", level, "String (up to 2000 characters) used to tag statements",
+                 "STRING")]
+        if _CONTEXT_QUERY.match(statement):
+            return ("CURRENT_USER()", "CURRENT_ACCOUNT()", "CURRENT_ROLE()"), [("OFFLINE", "OFFLINE", "OFFLINE")]
+        cancel = _CANCEL_QUERY.search(statement)
+        if cancel:
+            future = self._futures.get(cancel.group(1))
+            if future is not None:
+                future.cancel()
+            return ("STATUS",), [("Identified SQL statement is being canceled.",)]
+        if "QUERY_HISTORY_BY_SESSION" in statement.upper():
+            tag = params[0] if params else self.query_tag
+            with self._lock:
+                rows = [tuple(entry[column] for column in HISTORY_COLUMNS)
+                        for entry in self.history if entry["QUERY_TAG"] == tag]
+            return HISTORY_COLUMNS, rows
+        if "GET_QUERY_OPERATOR_STATS" in statement.upper():
+            return ("PARTITIONS_SCANNED", "PARTITIONS_TOTAL"), [(None, None)]
+        return None
+
+
+def load_synthetic_warehouse(connection: OfflineConnection, rows, report_months: Sequence[str] = DEFAULT_REPORT_MONTHS,
+                             vendor_count: Optional[int] = None, seed: int = 7,
+                             logger: Optional[logging.Logger] = None) -> SyntheticDataset:
+    """
+    Fill the connection's source databases with a synthetic dataset.
+
+    A persistent warehouse that already holds a dataset with the same
+    arguments is reused as is.
+
+    Args:
+        connection (OfflineConnection): Target warehouse
+        rows: Scale factor (COMBINED_IPR rows), e.g. 1000, "100k" or "5M"
+        report_months (Sequence[str]): Report months of the metric lines
+        vendor_count (Optional[int]): Number of vendors (default: by scale)
+        seed (int): Random seed
+
+    Returns:
+        SyntheticDataset: Description of the loaded dataset
+    """
+    logger = logger or logging.getLogger("spp_automation")
+    rows = parse_scale(rows)
+    wanted = {"rows": rows, "seed": seed, "report_months": list(report_months),
+              "vendor_count": vendor_count or default_vendor_count(rows)}
+
+    manifest_path = connection.data_dir / MANIFEST_FILE if connection.data_dir else None
+    if manifest_path and manifest_path.exists():
+        with open(manifest_path) as f:
+            stored = json.load(f)
+        if stored.get("arguments") == wanted:
+            logger.info(f"Reusing synthetic dataset of {rows} rows in {connection.data_dir}")
+            return SyntheticDataset(**stored["dataset"])
+
+    started = time.perf_counter()
+    tables, dataset = generate_tables(rows, report_months, wanted["vendor_count"], seed)
+    database = connection._database
+    for table in tables:
+        catalog, schema, name = table.name.split(".")
+        database.execute(f"CREATE SCHEMA IF NOT EXISTS {catalog}.{schema}")
+        columns = ", ".join(
+            f"CAST({column} AS {table.column_types[column]}) AS {column}" if column in table.column_types
+            else column
+            for column in table.frame.columns
+        )
+        database.register("synthetic_frame", table.frame)
+        try:
+            database.execute(f"CREATE OR REPLACE TABLE {table.name} AS SELECT {columns} FROM synthetic_frame")
+        finally:
+            database.unregister("synthetic_frame")
+    logger.info(f"Generated synthetic dataset of {rows} rows ({len(dataset.vendor_numbers)} vendors) "
+                f"in {time.perf_counter() - started:.2f}s")
+
+    if manifest_path:
+        with open(manifest_path, "w") as f:
+            json.dump({"arguments": wanted, "dataset": dataset._asdict()}, f, indent=2)
+    return dataset
+
+
+def attach_offline_warehouse(engine, connection: OfflineConnection) -> None:
+    """Make an SPPAutomationEnhanced engine connect to the offline warehouse instead of Snowflake."""
+    engine.session.close()
+    engine.session.connect_factory = lambda: connection
+    engine.connection = None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Generate (or reuse) a synthetic dataset and time a report run against it."""
+    parser = argparse.ArgumentParser(description="Run the SPP pipeline against a synthetic offline warehouse")
+    parser.add_argument("--rows", default="100k", help="Scale factor: metric lines, e.g. 1k, 100k, 5M")
+    parser.add_argument("--report-month", default=DEFAULT_REPORT_MONTHS[-1], help="Report month, e.g. FY2025-APR")
+    parser.add_argument("--vendors", type=int, default=1, help="Number of (largest) vendors to report on")
+    parser.add_argument("--batch", action="store_true", help="One workbook per vendor (batch mode)")
+    parser.add_argument("--data-dir", help="Keep the generated dataset in this directory for reuse")
+    parser.add_argument("--config", default="config.ini", help="Engine configuration file")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--use-cache", action="store_true",
+                        help="Allow result cache / ASN store hits (off: every run queries the warehouse)")
+    parser.add_argument("--export", nargs="+", choices=list(EXPORT_FORMATS), metavar="FORMAT",
+                        help=f"Also write the tabs as {', '.join(EXPORT_FORMATS)}")
+    parser.add_argument("--export-only", action="store_true", help="Write the --export files without a workbook")
+    args = parser.parse_args(argv)
+
+    from spp_automation_enhanced import SPPAutomationEnhanced
+    from spp_fiscal_calendar import report_month_date_filter
+
+    engine = SPPAutomationEnhanced(config_file=args.config, user_email="offline@hdsupply.com")
+    connection = OfflineConnection(args.data_dir)
+    try:
+        dataset = load_synthetic_warehouse(connection, args.rows, seed=args.seed, logger=engine.logger)
+        attach_offline_warehouse(engine, connection)
+        engine.bypass_result_cache = not args.use_cache
+        if args.export:
+            engine.export_formats = args.export
+            engine.export_only = args.export_only
+        vendors = dataset.vendor_numbers[:max(1, args.vendors)]
+        date_filter = report_month_date_filter(args.report_month)
+
+        started = time.perf_counter()
+        if args.batch:
+            outcomes = engine.run_batch_automation(vendors, args.report_month, date_filter)
+            for vendor, (path, message) in outcomes.items():
+                print(f"{vendor}: {path or message}")
+        else:
+            path, message = engine.run_full_automation(vendors, args.report_month, date_filter)
+            print(path or message)
+        print(f"Pipeline finished in {time.perf_counter() - started:.2f}s "
+              f"({dataset.rows} metric lines, {len(vendors)} vendor(s))")
+    finally:
+        engine.session.close()
+        connection.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""
+SPP Query Builder
+=================
+
+Building blocks for the parameterized tab queries of the SPP engine.
+
+Every tab query is returned as a ``BoundQuery``: SQL text that never changes
+between vendors or months, plus the values Snowflake binds server-side.
+Identical statement text lets Snowflake reuse compiled plans, groups the
+runs of one query shape together in query history, and removes the SQL
+injection risk of splicing user input into the text.
+
+Binding Conventions:
+-------------------
+- The engine connects with ``paramstyle="numeric"`` so a value can be
+  referenced several times in one statement (``:1``, ``:2``, ...)
+- Vendor lists are bound as a single JSON array string and expanded with
+  ``FLATTEN``, so the text is the same for one vendor or a thousand
+- A list of report months is bound the same way (``month_predicate()``)
+- SAP tables are filtered on the stored LIFNR (``bind_lifnr_list()``) rather
+  than ``LTRIM(LIFNR, 0)``, so the predicate can prune micro-partitions
+- Placeholders are numbered in the order values are added to a
+  ``QueryBinds``, so a builder only binds the values its text references
+
+Run Key Tables:
+--------------
+With ``run_key_tables`` enabled the engine loads the vendor list (and the
+PO/USN keys of the reported metrics) into session temporary tables once per
+run (``RUN_KEY_TABLE_STATEMENTS``). The tab queries then read
+``SPP_RUN_VENDORS`` / ``SPP_RUN_PO_KEYS`` instead of expanding a bound array
+each, so the vendor list is parsed once per run rather than once per tab.
+Their text no longer depends on the vendors, so the vendor list travels in
+``BoundQuery.context`` to keep result cache keys apart.
+
+Developer: Ben F. Benjamaa
+Team: HD Supply Chain Excellence
+"""
+
+import json
+from typing import List, NamedTuple, Tuple, Union
+
+# Connector paramstyle the bound queries are written for
+PARAMSTYLE = "numeric"
+
+# Width of the SAP vendor key (LFA1/LIKP.LIFNR)
+LIFNR_LENGTH = 10
+
+# Session temporary tables of a run (see RUN_KEY_TABLE_STATEMENTS)
+RUN_VENDOR_TABLE = "SPP_RUN_VENDORS"
+RUN_PO_KEY_TABLE = "SPP_RUN_PO_KEYS"
+
+# Statements loading the run key tables: the vendor table binds :1 vendor/LIFNR
+# pairs (JSON), the PO key table :1 the report month(s) for {month_filter}
+RUN_KEY_TABLE_STATEMENTS = (
+    f"""
+CREATE OR REPLACE TEMPORARY TABLE {RUN_VENDOR_TABLE} AS
+SELECT
+    VALUE:vendor::STRING AS VENDOR_NUMBER,
+    VALUE:lifnr::STRING AS LIFNR
+FROM TABLE(FLATTEN(INPUT => PARSE_JSON(:1)))
+""",
+    f"""
+CREATE OR REPLACE TEMPORARY TABLE {RUN_PO_KEY_TABLE} AS
+SELECT DISTINCT
+    TO_CHAR(PO_NUMBER) AS PO_NUMBER,
+    CONCAT(PO_NUMBER, ':', USN) AS METRIC_CONCATENATE
+FROM DM_SUPPLYCHAIN.VENDOR_PERFORMANCE.COMBINED_IPR_IB_VENDOR_PERFORMANCE
+WHERE
+    VENDOR_NUMBER IN (SELECT VENDOR_NUMBER FROM {RUN_VENDOR_TABLE})
+    AND {{month_filter}}
+    AND METRIC IN ('First_Receipt_FR_B1D', 'First_Receipt_FR_B28D', 'Units_On_Time_Complete')
+""",
+)
+
+DROP_RUN_KEY_TABLES = tuple(f"DROP TABLE IF EXISTS {table}" for table in (RUN_PO_KEY_TABLE, RUN_VENDOR_TABLE))
+
+
+class BoundQuery(NamedTuple):
+    """
+    SQL text with its server-side bind values (numeric paramstyle).
+
+    context holds inputs the result depends on that are neither in the text
+    nor bound (the vendors of the run key tables); it is part of the result
+    cache key but never sent to Snowflake.
+    """
+    sql: str
+    params: Tuple = ()
+    context: Tuple = ()
+
+
+class QueryBinds:
+    """
+    Collects the bind values of one statement and numbers their placeholders.
+
+    Example:
+        ``binds = QueryBinds(); sql = f"... LIKE {binds.add(month)}"``
+    """
+
+    def __init__(self):
+        self.values: List = []
+
+    def add(self, value) -> str:
+        """Bind value and return its placeholder (``:1``, ``:2``, ...)."""
+        self.values.append(value)
+        return f":{len(self.values)}"
+
+    def add_month(self, report_month: Union[str, List[str]]) -> str:
+        """Bind one report month or a list of them; returns the RPT_MONTH predicate."""
+        predicate, value = month_predicate(report_month, f":{len(self.values) + 1}")
+        self.add(value)
+        return predicate
+
+    def query(self, sql: str, context: Tuple = ()) -> BoundQuery:
+        return BoundQuery(sql, tuple(self.values), context)
+
+
+def bind_vendor_list(vendor_numbers: List[str]) -> str:
+    """Encode a vendor list as the JSON array bound to ``vendor_in_list()``."""
+    return json.dumps([str(vendor).strip() for vendor in vendor_numbers])
+
+
+def normalize_lifnr(vendor_number: str) -> str:
+    """
+    Convert a vendor number to its stored SAP LIFNR form.
+
+    Numeric vendor numbers are zero-padded to 10 characters ("52889" ->
+    "0000052889") like SAP's ALPHA conversion; alphanumeric ones are stored
+    as entered and only upper-cased.
+    """
+    vendor = str(vendor_number).strip()
+    if vendor.isdigit():
+        return vendor.zfill(LIFNR_LENGTH)
+    return vendor.upper()
+
+
+def bind_lifnr_list(vendor_numbers: List[str]) -> str:
+    """Encode a vendor list as a JSON array of stored LIFNR values."""
+    return json.dumps([normalize_lifnr(vendor) for vendor in vendor_numbers])
+
+
+def bind_run_vendors(vendor_numbers: List[str]) -> str:
+    """Encode a vendor list as the vendor/LIFNR pairs loaded into ``SPP_RUN_VENDORS``."""
+    return json.dumps([{"vendor": str(vendor).strip(), "lifnr": normalize_lifnr(vendor)}
+                       for vendor in vendor_numbers])
+
+
+def run_vendor_list(column: str = "VENDOR_NUMBER") -> str:
+    """SQL subquery over a column of the run vendor table, for use with IN."""
+    return f"(SELECT {column} FROM {RUN_VENDOR_TABLE})"
+
+
+def vendor_in_list(placeholder: str) -> str:
+    """
+    SQL subquery expanding a bound JSON array into rows, for use with IN.
+
+    Example:
+        ``f"VENDOR_NUMBER IN {vendor_in_list(':1')}"``
+    """
+    return f"(SELECT VALUE::STRING FROM TABLE(FLATTEN(INPUT => PARSE_JSON({placeholder}))))"
+
+
+def month_predicate(report_month: Union[str, List[str]], placeholder: str) -> Tuple[str, str]:
+    """
+    RPT_MONTH predicate and bind value for one report month or a list of them.
+
+    A single month keeps the ``RPT_MONTH LIKE :n`` filter; a list is bound as
+    a JSON array and matched with IN (multi-month range runs).
+
+    Returns:
+        Tuple[str, str]: (SQL predicate, value to bind at ``placeholder``)
+    """
+    if isinstance(report_month, str):
+        return f"RPT_MONTH LIKE {placeholder}", report_month
+    return f"RPT_MONTH IN {vendor_in_list(placeholder)}", json.dumps(list(report_month))
@@ -0,0 +1,243 @@
+"""
+SPP Query Profiler
+==================
+
+Per-run Snowflake query profiles, so a slow report can be traced to
+warehouse queuing, a full table scan or the local Excel writing.
+
+Key Features:
+------------
+- **Run Tagging**: Every statement of a run carries ``QUERY_TAG = 'SPP:<run_id>'``;
+  the session's own QUERY_TAG is read first and put back after the run
+- **Query IDs**: The query ID of every tab query is recorded as it runs
+- **Warehouse Metrics**: After the run, elapsed, compile, queued and execution
+  time plus bytes scanned come from ``QUERY_HISTORY_BY_SESSION`` and the
+  partitions scanned/total of the table scans from ``GET_QUERY_OPERATOR_STATS``
+- **Local Phases**: Wall time of local phases (query wait, Excel writing)
+- **Output**: One ``spp_profile_<run_id>.json`` per run in ``profile_dir`` and a
+  summary line per query in the log
+
+Profiling is best effort: a failure to tag or collect metrics is logged as a
+warning and never fails the report.
+
+Developer: Ben F. Benjamaa
+Team: HD Supply Chain Excellence
+"""
+
+import json
+import logging
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+QUERY_TAG_PREFIX = "SPP:"
+
+SESSION_TAG_SQL = "SHOW PARAMETERS LIKE 'QUERY_TAG' IN SESSION"
+
+HISTORY_SQL = """
+SELECT
+    QUERY_ID,
+    TOTAL_ELAPSED_TIME,
+    COMPILATION_TIME,
+    QUEUED_PROVISIONING_TIME + QUEUED_REPAIR_TIME + QUEUED_OVERLOAD_TIME AS QUEUED_TIME,
+    EXECUTION_TIME,
+    BYTES_SCANNED,
+    ROWS_PRODUCED,
+    WAREHOUSE_SIZE
+FROM TABLE({database}.INFORMATION_SCHEMA.QUERY_HISTORY_BY_SESSION(RESULT_LIMIT => 1000))
+WHERE QUERY_TAG = :1
+"""
+
+PARTITIONS_SQL = """
+SELECT
+    SUM(OPERATOR_STATISTICS:pruning:partitions_scanned::NUMBER) AS PARTITIONS_SCANNED,
+    SUM(OPERATOR_STATISTICS:pruning:partitions_total::NUMBER) AS PARTITIONS_TOTAL
+FROM TABLE(GET_QUERY_OPERATOR_STATS(:1))
+WHERE OPERATOR_TYPE = 'TableScan'
+"""
+
+
+class QueryProfiler:
+    """
+    Collects the query profile of one automation run at a time.
+
+    Attributes:
+        profile_dir (Path): Directory for the per-run JSON profiles
+        database (str): Database whose INFORMATION_SCHEMA serves query history
+        enabled (bool): Switch for tagging and metric collection
+        logger (logging.Logger): Logger for the per-query summary lines
+        run_id (str): ID of the current run (None between runs)
+        queries (Dict[str, Dict]): Profile entry per tab query of the run
+        phases (Dict[str, float]): Wall seconds per local phase of the run
+    """
+
+    def __init__(self, profile_dir: str, database: str = "EDP", enabled: bool = True,
+                 logger: Optional[logging.Logger] = None):
+        self.profile_dir = Path(profile_dir)
+        self.database = database
+        self.enabled = enabled
+        self.logger = logger or logging.getLogger("spp_automation")
+        self.run_id: Optional[str] = None
+        self.run_info: Dict[str, Any] = {}
+        self.queries: Dict[str, Dict[str, Any]] = {}
+        self.phases: Dict[str, float] = {}
+        self._started = 0.0
+        self._session_tag: Optional[str] = None
+
+    @property
+    def query_tag(self) -> str:
+        return f"{QUERY_TAG_PREFIX}{self.run_id}"
+
+    def start_run(self, connection, **run_info) -> Optional[str]:
+        """Start a new run and tag every following statement of the session with it."""
+        if not self.enabled:
+            return None
+
+        self.run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        self.run_info = {"started": datetime.now().isoformat(timespec="seconds"), **run_info}
+        self.queries = {}
+        self.phases = {}
+        self._started = time.perf_counter()
+
+        self._session_tag = self._read_session_tag(connection)
+        # run_id is generated here, never user input, so it is safe to inline
+        self._execute(connection, f"ALTER SESSION SET QUERY_TAG = '{self.query_tag}'")
+        self.logger.info(f"Profiling run {self.run_id} (QUERY_TAG {self.query_tag})")
+        return self.run_id
+
+    def record(self, name: str, query_id: Optional[str] = None, rows: Optional[int] = None,
+               source: str = "snowflake") -> None:
+        """Record (or update) the profile entry of a tab query."""
+        if not self.run_id:
+            return
+
+        entry = self.queries.setdefault(name, {"name": name, "source": source})
+        entry["source"] = source
+        if query_id:
+            entry["query_id"] = query_id
+        if rows is not None:
+            entry["rows"] = rows
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a local phase of the run (e.g. ``with profiler.phase("excel"):``)."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.run_id:
+                self.phases[name] = round(self.phases.get(name, 0.0) + time.perf_counter() - started, 3)
+
+    def finish_run(self, connection) -> Optional[str]:
+        """
+        Collect warehouse metrics for the run, write the JSON profile and log
+        one line per query. Returns the profile path, or None if not written.
+        """
+        if not self.run_id:
+            return None
+
+        self.run_info["total_seconds"] = round(time.perf_counter() - self._started, 3)
+        self._execute(connection, self._restore_tag_statement())
+        self._collect_history(connection)
+        for entry in self.queries.values():
+            self.logger.info(self._describe(entry))
+        for name, seconds in self.phases.items():
+            self.logger.info(f"Profile phase {name}: {seconds:.2f}s")
+
+        profile = {
+            "run_id": self.run_id,
+            "query_tag": self.query_tag,
+            **self.run_info,
+            "phases": self.phases,
+            "queries": list(self.queries.values()),
+        }
+        profile_path = self.profile_dir / f"spp_profile_{self.run_id}.json"
+        self.run_id = None
+        try:
+            self.profile_dir.mkdir(parents=True, exist_ok=True)
+            with open(profile_path, "w") as f:
+                json.dump(profile, f, indent=2, default=str)
+        except Exception as e:
+            self.logger.warning(f"Could not write query profile: {e}")
+            return None
+
+        self.logger.info(f"Query profile written to {profile_path}")
+        return str(profile_path)
+
+    def _collect_history(self, connection) -> None:
+        by_id = {entry["query_id"]: entry for entry in self.queries.values() if entry.get("query_id")}
+        if not by_id:
+            return
+
+        try:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(HISTORY_SQL.format(database=self.database), (self.query_tag,))
+                columns = [desc[0].lower() for desc in cursor.description]
+                for row in cursor.fetchall():
+                    metrics = dict(zip(columns, row))
+                    entry = by_id.get(metrics.pop("query_id"))
+                    if entry is not None:
+                        entry.update(metrics)
+
+                for query_id, entry in by_id.items():
+                    cursor.execute(PARTITIONS_SQL, (query_id,))
+                    scanned, total = cursor.fetchone() or (None, None)
+                    entry["partitions_scanned"] = scanned
+                    entry["partitions_total"] = total
+            finally:
+                cursor.close()
+        except Exception as e:
+            self.logger.warning(f"Could not collect query history for run {self.run_id}: {e}")
+
+    def _read_session_tag(self, connection) -> Optional[str]:
+        """QUERY_TAG of the session before the run ("" when unset); None if it could not be read."""
+        try:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(SESSION_TAG_SQL)
+                columns = [desc[0].lower() for desc in cursor.description or []]
+                row = cursor.fetchone()
+            finally:
+                cursor.close()
+        except Exception as e:
+            self.logger.warning(f"Could not read the session QUERY_TAG: {e}")
+            return None
+        return str(dict(zip(columns, row)).get("value") or "") if row else ""
+
+    def _restore_tag_statement(self) -> str:
+        """Statement putting back the QUERY_TAG the session had before the run."""
+        if not self._session_tag:
+            return "ALTER SESSION UNSET QUERY_TAG"
+        escaped = self._session_tag.replace("\\", "\\\\").replace("'", "''")
+        return f"ALTER SESSION SET QUERY_TAG = '{escaped}'"
+
+    def _execute(self, connection, statement: str) -> None:
+        try:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(statement)
+            finally:
+                cursor.close()
+        except Exception as e:
+            self.logger.warning(f"Query profiling statement failed ({statement}): {e}")
+
+    @staticmethod
+    def _describe(entry: Dict[str, Any]) -> str:
+        text = f"Profile {entry['name']}: {entry.get('rows', '?')} rows from {entry['source']}"
+        if entry.get("query_id"):
+            text += f" (query ID {entry['query_id']})"
+        if entry.get("total_elapsed_time") is not None:
+            text += (
+                f", elapsed {entry['total_elapsed_time'] / 1000:.2f}s"
+                f" = compile {(entry.get('compilation_time') or 0) / 1000:.2f}s"
+                f" + queued {(entry.get('queued_time') or 0) / 1000:.2f}s"
+                f" + execution {(entry.get('execution_time') or 0) / 1000:.2f}s"
+                f", {(entry.get('bytes_scanned') or 0) / (1024 * 1024):.1f} MB scanned"
+            )
+        if entry.get("partitions_total") is not None:
+            text += f", partitions {entry['partitions_scanned']}/{entry['partitions_total']}"
+        return text
@@ -0,0 +1,149 @@
+"""
+SPP Query Result Cache
+======================
+
+Persistent on-disk cache of tab query results so re-running the same
+vendor/month (to switch templates, or because Excel had the file locked)
+does not hit the warehouse again.
+
+Key Features:
+------------
+- **Fingerprint Keys**: SHA-256 of the whitespace-normalized statement text
+  plus its bind values
+- **Columnar Storage**: One zstd-compressed Parquet file per result
+- **TTL**: Entries older than ``ttl_seconds`` are treated as misses and removed
+- **LRU Eviction**: When the cache grows past ``max_size_mb`` the least
+  recently used entries are deleted (reads refresh an entry's timestamp)
+
+Requires pyarrow; without it the cache stays disabled and every query goes
+to Snowflake.
+
+Developer: Ben F. Benjamaa
+Team: HD Supply Chain Excellence
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from spp_query_builder import BoundQuery
+
+try:
+    import pyarrow  # noqa: F401 - required by DataFrame.to_parquet
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+
+class QueryResultCache:
+    """
+    Parquet-backed result cache keyed by query fingerprint.
+
+    Attributes:
+        cache_dir (Path): Directory holding the ``<fingerprint>.parquet`` files
+        ttl_seconds (float): Maximum age of a usable entry
+        max_size_bytes (int): Size limit that triggers LRU eviction
+        enabled (bool): False when pyarrow is missing or caching is switched off
+        logger (logging.Logger): Logger for hits, misses and evictions
+    """
+
+    def __init__(self, cache_dir: str, ttl_seconds: float = 12 * 3600, max_size_mb: int = 500,
+                 enabled: bool = True, logger: Optional[logging.Logger] = None):
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = ttl_seconds
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+        self.enabled = enabled and PARQUET_AVAILABLE
+        self.logger = logger or logging.getLogger("spp_automation")
+
+    @staticmethod
+    def fingerprint(query: BoundQuery) -> str:
+        """Stable key for a query: normalized statement text, bind values and context."""
+        normalized_sql = re.sub(r"\s+", " ", query.sql).strip()
+        payload = normalized_sql + "\x00" + json.dumps(list(query.params), default=str)
+        if query.context:
+            payload += "\x00" + json.dumps(list(query.context), default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, query: BoundQuery) -> Optional[pd.DataFrame]:
+        """Return the cached result of ``query``, or None on a miss."""
+        if not self.enabled:
+            return None
+
+        path = self._path(query)
+        try:
+            age = time.time() - path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+
+        if age > self.ttl_seconds:
+            self._remove(path)
+            return None
+
+        try:
+            df = pd.read_parquet(path)
+        except Exception as e:
+            self.logger.warning(f"Discarding unreadable cache entry {path.name}: {e}")
+            self._remove(path)
+            return None
+
+        # Touch on read so eviction removes the least recently used entries first
+        os.utime(path, None)
+        self.logger.info(f"Result cache hit: {len(df)} rows, {age / 60:.0f} min old")
+        return df
+
+    def put(self, query: BoundQuery, df: pd.DataFrame) -> None:
+        """Store the result of ``query`` and evict old entries if over size."""
+        if not self.enabled:
+            return
+
+        path = self._path(query)
+        temp_path = path.with_suffix(".tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            df.to_parquet(temp_path, compression="zstd", index=False)
+            os.replace(temp_path, path)
+        except Exception as e:
+            self.logger.warning(f"Could not cache query result: {e}")
+            self._remove(temp_path)
+            return
+
+        self.evict()
+
+    def evict(self) -> None:
+        """Delete least recently used entries until the cache fits max_size_mb."""
+        entries = []
+        for path in self.cache_dir.glob("*.parquet"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_size_bytes:
+                break
+            self._remove(path)
+            total -= size
+            self.logger.info(f"Evicted cached result {path.name}")
+
+    def clear(self) -> None:
+        """Remove every cached result."""
+        for path in self.cache_dir.glob("*.parquet"):
+            self._remove(path)
+
+    def _path(self, query: BoundQuery) -> Path:
+        return self.cache_dir / f"{self.fingerprint(query)}.parquet"
+
+    def _remove(self, path: Path) -> None:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
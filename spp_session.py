@@ -0,0 +1,144 @@
+"""
+SPP Snowflake Session Manager
+=============================
+
+Keeps one authenticated Snowflake connection alive for the lifetime of the
+automation engine so consecutive report runs reuse a single SSO login instead
+of repeating the external-browser handshake and database context setup.
+
+Key Features:
+------------
+- **Connection Reuse**: The live connection is handed back to every caller
+- **Keep-Alive Heartbeats**: Enables the connector's session heartbeat so the
+  master token does not expire between reports
+- **Cheap Health Checks**: Local ``is_closed()`` check on every use, a
+  ``SELECT 1`` round trip only when the session has been idle for a while
+- **Transparent Reconnect**: Expired or broken sessions are replaced by a new
+  connection from the engine-supplied factory
+
+Usage Example:
+-------------
+```python
+session = SnowflakeSessionManager(open_connection, logger=logger)
+connection = session.get_connection()   # logs in once
+connection = session.get_connection()   # reuses the same session
+session.close()
+```
+
+Developer: Ben F. Benjamaa
+Team: HD Supply Chain Excellence
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Optional
+
+
+class SnowflakeSessionManager:
+    """
+    Owns the engine's Snowflake connection and decides when it can be reused.
+
+    Attributes:
+        connect_factory (Callable[[], Any]): Opens a new, fully initialised
+            connection (authentication plus database context)
+        validation_interval (int): Idle seconds after which the session is
+            verified with a ``SELECT 1`` before being reused
+        logger (logging.Logger): Logger for session lifecycle events
+        login_count (int): Number of logins performed by this manager
+
+    Thread Safety:
+        ``get_connection`` and ``close`` are serialised with a lock so the GUI
+        worker threads never race to open two sessions.
+    """
+
+    def __init__(self, connect_factory: Callable[[], Any],
+                 logger: Optional[logging.Logger] = None,
+                 validation_interval: int = 300):
+        self.connect_factory = connect_factory
+        self.validation_interval = validation_interval
+        self.logger = logger or logging.getLogger("spp_automation")
+        self.login_count = 0
+
+        self._connection: Optional[Any] = None
+        self._last_used = 0.0
+        self._lock = threading.RLock()
+
+    @property
+    def connection(self) -> Optional[Any]:
+        """Current connection without any health check (may be stale)."""
+        return self._connection
+
+    def get_connection(self) -> Any:
+        """
+        Return a live connection, reconnecting only if the session is gone.
+
+        Returns:
+            SnowflakeConnection: Connection ready for query execution
+
+        Raises:
+            Exception: Whatever the connect factory raises on login failure
+        """
+        with self._lock:
+            if self._connection is not None and self.is_alive():
+                self._last_used = time.monotonic()
+                self.logger.info("Reusing authenticated Snowflake session")
+                return self._connection
+
+            if self._connection is not None:
+                self.logger.warning("Snowflake session expired, reconnecting")
+                self._discard()
+
+            self._connection = self.connect_factory()
+            self.login_count += 1
+            self._last_used = time.monotonic()
+            self.logger.info("Snowflake session opened (login #%s)", self.login_count)
+            return self._connection
+
+    def is_alive(self) -> bool:
+        """
+        Check the session cheaply.
+
+        A closed connection is detected locally. Only when the session has
+        been idle longer than ``validation_interval`` is a ``SELECT 1`` sent
+        to the server to confirm the session token is still accepted.
+        """
+        connection = self._connection
+        if connection is None:
+            return False
+
+        try:
+            if connection.is_closed():
+                return False
+        except Exception:
+            return False
+
+        if time.monotonic() - self._last_used < self.validation_interval:
+            return True
+
+        try:
+            cursor = connection.cursor()
+            try:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+            finally:
+                cursor.close()
+            return True
+        except Exception as e:
+            self.logger.warning(f"Snowflake session validation failed: {e}")
+            return False
+
+    def close(self) -> None:
+        """Close the managed connection, if any."""
+        with self._lock:
+            if self._connection is not None:
+                self._discard()
+                self.logger.info("Snowflake connection closed")
+
+    def _discard(self) -> None:
+        """Drop the current connection, ignoring errors from a dead session."""
+        try:
+            self._connection.close()
+        except Exception as e:
+            self.logger.debug(f"Ignoring error while closing Snowflake connection: {e}")
+        self._connection = None
@@ -0,0 +1,111 @@
+"""
+SPP Summary Metrics
+===================
+
+Computes the Tab1 Summary_Metrics KPIs in-process from the Basic_Metrics
+(Tab2) result, replacing the part of the summary query that re-scanned
+COMBINED_IPR_IB_VENDOR_PERFORMANCE with the same filters.
+
+KPIs (one row per report month, vendor and metric):
+---------------------------------------------------
+1. Shipments In Full (1 Day)   - SUM(received) / SUM(ordered)
+2. Inbound Fill Rate (28 Days) - SUM(received) / SUM(ordered)
+3. Units On Time Complete      - SUM(received) / SUM(ordered)
+4. ASN Success Rate            - ASN lines / all inbound lines, taken as is
+   from the ASN success rate query (it counts the lines of materials without
+   a MARA record, which the ASN_Data tab leaves out)
+
+The output matches the summary query exactly: columns RPT_MONTH,
+VENDOR_NUMBER, VENDOR_NAME, METRICTYPE, METRIC_PERCENTAGE, percentages
+formatted like Snowflake's ``TO_CHAR(x, 'FM999.9') || '%'``, sorted by
+vendor number and metric type.
+
+Developer: Ben F. Benjamaa
+Team: HD Supply Chain Excellence
+"""
+
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Optional
+
+import pandas as pd
+
+SUMMARY_COLUMNS = ['RPT_MONTH', 'VENDOR_NUMBER', 'VENDOR_NAME', 'METRICTYPE', 'METRIC_PERCENTAGE']
+
+# Basic_Metrics MetricType -> Summary_Metrics MetricType
+SUMMARY_METRIC_TYPES = {
+    'Shipments_In_Full_1D': '1.Shipments_In_Full_1D',
+    'Inbound_Fill_Rate_28D': '2.Inbound_Fill_Rate_28D',
+    'Units_On_Time_Complete': '3.Units_On_Time_Complete'
+}
+
+GROUP_KEYS = ['RPT_MONTH', 'VENDOR_NUMBER', 'VENDOR_NAME', 'METRICTYPE']
+
+
+def format_metric_percentage(numerator, denominator) -> Optional[str]:
+    """
+    Format numerator / denominator * 100 like ``TO_CHAR(x, 'FM999.9') || '%'``.
+
+    One decimal, rounded half away from zero, no leading zero before the
+    decimal point (0.5 -> '.5%'). Returns None where Snowflake would return
+    NULL or fail (missing values, zero denominator).
+    """
+    if pd.isna(numerator) or pd.isna(denominator) or denominator == 0:
+        return None
+
+    value = Decimal(str(numerator)) * 100 / Decimal(str(denominator))
+    text = str(value.quantize(Decimal("0.1"), rounding=ROUND_HALF_UP))
+    if text.startswith("0."):
+        text = text[1:]
+    elif text.startswith("-0."):
+        text = "-" + text[2:]
+    return f"{text}%"
+
+
+def derive_summary_metrics(df_basic: pd.DataFrame, df_asn_rates: pd.DataFrame) -> pd.DataFrame:
+    """
+    Build the Summary_Metrics tab from the Basic_Metrics tab and the ASN success rates.
+
+    Args:
+        df_basic (pd.DataFrame): Result of the Basic Metrics query (Tab2)
+        df_asn_rates (pd.DataFrame): Result of the ASN success rate query, in
+            the summary layout
+
+    Returns:
+        pd.DataFrame: Summary rows in the layout of the summary query
+    """
+    asn_rates = df_asn_rates if df_asn_rates is not None else pd.DataFrame(columns=SUMMARY_COLUMNS)
+    parts = [part for part in (_metric_percentages(df_basic), asn_rates.reindex(columns=SUMMARY_COLUMNS))
+             if not part.empty]
+    if not parts:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+
+    summary = pd.concat(parts, ignore_index=True)
+    return summary.sort_values(['VENDOR_NUMBER', 'METRICTYPE'], kind='mergesort',
+                               na_position='last', ignore_index=True)
+
+
+def _metric_percentages(df_basic: pd.DataFrame) -> pd.DataFrame:
+    if df_basic is None or df_basic.empty:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+
+    metrics = df_basic[df_basic['METRICTYPE'].isin(SUMMARY_METRIC_TYPES.keys())]
+    # VENDOR is "NUMBER - NAME"; vendor numbers never contain " - "
+    vendor = metrics['VENDOR'].str.split(' - ', n=1, expand=True).reindex(columns=[0, 1])
+
+    frame = pd.DataFrame({
+        'RPT_MONTH': metrics['REPORT_MONTH'],
+        'VENDOR_NUMBER': vendor[0],
+        'VENDOR_NAME': vendor[1],
+        'METRICTYPE': metrics['METRICTYPE'].map(SUMMARY_METRIC_TYPES),
+        'NUMERATOR': metrics['METRIC_UNITS_RECEIVED'],
+        'DENOMINATOR': metrics['METRIC_UNITS_ORDERED'],
+    })
+    totals = frame.groupby(GROUP_KEYS, dropna=False, sort=False)[['NUMERATOR', 'DENOMINATOR']] \
+        .sum(min_count=1).reset_index()
+
+    totals['METRIC_PERCENTAGE'] = [
+        format_metric_percentage(numerator, denominator)
+        for numerator, denominator in zip(totals['NUMERATOR'], totals['DENOMINATOR'])
+    ]
+    return totals[SUMMARY_COLUMNS]
+
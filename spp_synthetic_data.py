@@ -0,0 +1,544 @@
+"""
+SPP Synthetic Data Generator
+============================
+
+Generates the Snowflake source tables the four SPP tab queries read, at a
+chosen scale, for the offline warehouse (see spp_offline.py). With it the
+whole pipeline - queries, fetch, summary, Excel writing - can be run and
+benchmarked on any machine without an HDSUPPLY-DATA login.
+
+Generated Tables:
+----------------
+- DM_SUPPLYCHAIN.VENDOR_PERFORMANCE.COMBINED_IPR_IB_VENDOR_PERFORMANCE
+  (``rows`` metric lines; the scale factor)
+- DM_SUPPLYCHAIN.IA_ATLAS.ATLAS, DM_SUPPLYCHAIN.PRO_INVENTORY_ANALYTICS.
+  REPORT_PURCHASE_ORDER_VISIBILITY_SHIPMENTS (HDP receipts)
+- EDP.STD_ECC.EKBE (HDS receipts), LIKP / LIPS / LFA1 / MARA (deliveries)
+- EDP.STD_ENABLE.EW_VW_MAINTENANCE_REQUESTS_STG / APPROVAL_STG /
+  QUESTIONS_STG and EDP.STD_JDA.SKUEXTRACT (PDH maintenance)
+
+Data Shape:
+----------
+- Vendor sizes are heavily skewed: the first vendor ("52889") always holds
+  10% of the lines, so a single-vendor run scales with the dataset
+- Metric lines, receipts and deliveries share PO/USN keys, so the receipt
+  and ASN joins find matches at realistic rates
+- PDH requests are dated relative to today, like the live rolling view
+- Column types follow Snowflake: NUMBER columns are DECIMAL (the connector
+  returns ``decimal.Decimal``), SAP dates are YYYYMMDD strings
+
+Report Tabs:
+-----------
+``generate_tab_frames()`` builds the four result DataFrames (Tab1 - Tab4)
+directly, shaped like the tab queries return them through the connector, for
+benchmarking the Excel writers without running the queries
+(see spp_writer_benchmark.py).
+
+Scale factors accept suffixes: ``parse_scale("1k")`` -> 1000,
+``parse_scale("5M")`` -> 5000000.
+
+Developer: Ben F. Benjamaa
+Team: HD Supply Chain Excellence
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from spp_fiscal_calendar import report_month_range
+from spp_query_builder import normalize_lifnr
+
+# Vendor that always exists and is the largest one in a generated dataset
+ANCHOR_VENDOR = "52889"
+
+# Share of all lines/deliveries/requests that belong to ANCHOR_VENDOR
+ANCHOR_SHARE = 0.1
+
+DEFAULT_REPORT_MONTHS = ("FY2025-FEB", "FY2025-MAR", "FY2025-APR")
+
+METRICS = ("First_Receipt_FR_B1D", "First_Receipt_FR_B28D", "Units_On_Time_Complete")
+
+ASN_CREATORS = ("BPAREMOTE", "SCEBATCH", "P2P_IDOC", "P2PBATCH", "JSMITH")
+
+REQUEST_STATUSES = ("Supplier Review", "Maintenance Complete", "HDS Team Review",
+                    "Maintenance Rejected", "New", "HDS Maintenance Canceled")
+
+REQUEST_TYPES = ("Attribute Update", "Image Request", "Cost Update")
+
+ASN_INBOUND_TYPES = ("ASN", "EGR", "Manually Created")
+
+_SCALE_SUFFIXES = {"K": 1000, "M": 1000000}
+
+
+class SyntheticDataset(NamedTuple):
+    """Description of a generated dataset."""
+    rows: int
+    seed: int
+    vendor_numbers: List[str]
+    report_months: List[str]
+    table_rows: Dict[str, int]
+
+
+class SyntheticTable(NamedTuple):
+    """One generated table: qualified name, frame and SQL types of its typed columns."""
+    name: str
+    frame: pd.DataFrame
+    column_types: Dict[str, str]
+
+
+def parse_scale(scale) -> int:
+    """
+    Row count of a scale factor such as ``"100k"``, ``"5M"`` or ``2500``.
+
+    Raises:
+        ValueError: If the scale is not a positive row count
+    """
+    text = str(scale).strip().upper().replace("_", "")
+    multiplier = _SCALE_SUFFIXES.get(text[-1:], 1)
+    if text[-1:] in _SCALE_SUFFIXES:
+        text = text[:-1]
+    try:
+        rows = int(float(text) * multiplier)
+    except ValueError:
+        raise ValueError(f"Scale must be a row count like 1000, 100k or 5M, got {scale!r}")
+    if rows <= 0:
+        raise ValueError(f"Scale must be positive, got {scale!r}")
+    return rows
+
+
+def default_vendor_count(rows: int) -> int:
+    """Number of vendors generated for a scale (about 500 metric lines each, 3 to 2000)."""
+    return max(3, min(2000, rows // 500))
+
+
+def generate_tables(rows: int, report_months: Sequence[str] = DEFAULT_REPORT_MONTHS,
+                    vendor_count: Optional[int] = None, seed: int = 7,
+                    today: Optional[date] = None) -> Tuple[List[SyntheticTable], SyntheticDataset]:
+    """
+    Generate all source tables for a dataset of ``rows`` metric lines.
+
+    Args:
+        rows (int): COMBINED_IPR_IB_VENDOR_PERFORMANCE rows; the other tables
+            are sized relative to it
+        report_months (Sequence[str]): Report months the lines are spread over
+        vendor_count (Optional[int]): Number of vendors (default: by scale)
+        seed (int): Random seed; the same arguments give the same data
+        today (Optional[date]): Reference day of the PDH requests
+
+    Returns:
+        Tuple[List[SyntheticTable], SyntheticDataset]: Tables in load order
+        and the dataset description
+    """
+    rng = np.random.default_rng(seed)
+    report_months = list(report_months)
+    vendor_count = vendor_count or default_vendor_count(rows)
+    vendors = _vendor_numbers(vendor_count)
+    vendor_names = np.array([f"VENDOR {vendor} SUPPLY CO" for vendor in vendors], dtype=object)
+    sku_count = max(100, rows // 10)
+
+    metric_lines = _metric_lines(rng, rows, vendors, vendor_names, report_months, sku_count)
+    tables = [metric_lines]
+    tables += _receipt_tables(rng, metric_lines.frame, sku_count)
+    tables += _delivery_tables(rng, max(1, rows // 2), vendors, vendor_names, report_months, sku_count)
+    tables += _pdh_tables(rng, max(10, rows // 50), vendors, vendor_names, sku_count, today or date.today())
+
+    dataset = SyntheticDataset(
+        rows=rows,
+        seed=seed,
+        vendor_numbers=vendors,
+        report_months=report_months,
+        table_rows={table.name: len(table.frame) for table in tables},
+    )
+    return tables, dataset
+
+
+def _vendor_numbers(count: int) -> List[str]:
+    return [ANCHOR_VENDOR] + [str(10000 + 7 * index) for index in range(1, count)]
+
+
+def _skewed_choice(rng: np.random.Generator, count: int, size: int) -> np.ndarray:
+    """Indices in [0, count): 0 (the anchor vendor) for ANCHOR_SHARE, the rest skewed to low indices."""
+    others = 1 + np.minimum((rng.pareto(1.2, size) * count / 20).astype(np.int64), count - 2)
+    return np.where(rng.random(size) < ANCHOR_SHARE, 0, others) if count > 1 else np.zeros(size, dtype=np.int64)
+
+
+def _random_days(rng: np.random.Generator, starts: np.ndarray, low: int, high: int) -> np.ndarray:
+    return starts + rng.integers(low, high, len(starts)).astype("timedelta64[D]")
+
+
+def _month_starts(report_months: Sequence[str]) -> np.ndarray:
+    return np.array([datetime.strptime(report_month_range(month).start, "%Y%m%d")
+                     for month in report_months], dtype="datetime64[D]")
+
+
+def _format_unique(values: np.ndarray, formatter) -> np.ndarray:
+    """Format each distinct value once (keys and dates repeat heavily at scale)."""
+    unique, inverse = np.unique(values, return_inverse=True)
+    return np.array([formatter(value) for value in unique], dtype=object)[inverse.reshape(-1)]
+
+
+def _yyyymmdd(days: np.ndarray) -> np.ndarray:
+    return _format_unique(days.astype("datetime64[D]"), lambda day: str(day).replace("-", ""))
+
+
+def _labels(prefix: str, values: np.ndarray) -> np.ndarray:
+    return _format_unique(np.asarray(values), lambda value: f"{prefix}{value}")
+
+
+def _usn_strings(usn: np.ndarray) -> np.ndarray:
+    return _labels("", usn)
+
+
+def _matnr(usn: np.ndarray) -> np.ndarray:
+    """Stored SAP material number (18 characters, zero-padded) of a USN."""
+    return _format_unique(usn, lambda value: str(value).zfill(18))
+
+
+def _metric_lines(rng, rows, vendors, vendor_names, report_months, sku_count) -> SyntheticTable:
+    vendor_index = _skewed_choice(rng, len(vendors), rows)
+    month_index = rng.integers(0, len(report_months), rows)
+    ordered = _random_days(rng, _month_starts(report_months)[month_index], 0, 28)
+    promised = _random_days(rng, ordered, 7, 22)
+    first_received = _random_days(rng, promised, -3, 11).astype("datetime64[ns]")
+    first_received[rng.random(rows) < 0.1] = np.datetime64("NaT")
+
+    denominator = rng.integers(1, 100, rows)
+    numerator = np.where(rng.random(rows) < 0.8, denominator, (denominator * rng.random(rows)).astype(np.int64))
+    usn = 100000 + rng.integers(0, sku_count, rows)
+    warehouse = 1000 + rng.integers(0, 20, rows)
+    months = np.array(report_months, dtype=object)[month_index]
+
+    frame = pd.DataFrame({
+        "VENDOR_NUMBER": np.array(vendors, dtype=object)[vendor_index],
+        "VENDOR_NAME": vendor_names[vendor_index],
+        "PO_NUMBER": 4500000000 + np.arange(rows, dtype=np.int64) // 3,
+        "USN": _usn_strings(usn),
+        "ITEM_DESCRIPTION": _labels("ITEM ", usn),
+        "DATE_ORIG_ORDERED": ordered,
+        "DATE_ORIG_PROMISED": promised,
+        "DATE_FIRST_RECEIVED": first_received,
+        "WAREHOUSE_NUM": _labels("", warehouse),
+        "WAREHOUSE_NAME": _labels("DC ", warehouse),
+        "METRIC": np.array(METRICS, dtype=object)[rng.integers(0, len(METRICS), rows)],
+        "RPT_MONTH": months,
+        "FSCL_YR_PRD": _format_unique(months, lambda month: month.replace("FY", "")),
+        "METRIC_NUMERATOR": numerator,
+        "METRIC_DENOMINATOR": denominator,
+        "NETWORK": np.where(rng.random(rows) < 0.7, "HDS", "HDP").astype(object),
+    })
+    return SyntheticTable(
+        "DM_SUPPLYCHAIN.VENDOR_PERFORMANCE.COMBINED_IPR_IB_VENDOR_PERFORMANCE",
+        frame,
+        {"PO_NUMBER": "DECIMAL(38,0)", "DATE_ORIG_ORDERED": "DATE", "DATE_ORIG_PROMISED": "DATE",
+         "DATE_FIRST_RECEIVED": "DATE", "METRIC_NUMERATOR": "DECIMAL(38,0)",
+         "METRIC_DENOMINATOR": "DECIMAL(38,0)"},
+    )
+
+
+def _receipt_tables(rng, lines: pd.DataFrame, sku_count: int) -> List[SyntheticTable]:
+    received = lines[lines["DATE_FIRST_RECEIVED"].notna()]
+    hds = received[received["NETWORK"].to_numpy() == "HDS"]
+    hdp = received[received["NETWORK"].to_numpy() == "HDP"]
+
+    # Roughly one line in four is received in two goods receipts
+    hds = pd.concat([hds, hds.sample(frac=0.25, random_state=int(rng.integers(1 << 31)))], ignore_index=True)
+    last_received = _random_days(rng, hds["DATE_FIRST_RECEIVED"].to_numpy().astype("datetime64[D]"), 0, 15)
+    usn = hds["USN"].to_numpy().astype(np.int64)
+    ekbe = pd.DataFrame({
+        "EBELN": _labels("", hds["PO_NUMBER"].to_numpy()),
+        "MATNR": _matnr(usn),
+        "BWART": np.where(rng.random(len(hds)) < 0.97, "101", "102").astype(object),
+        "BUDAT": _yyyymmdd(last_received),
+    })
+
+    skus = 100000 + np.arange(sku_count)
+    atlas = pd.DataFrame({
+        "MATERIAL": _matnr(skus),
+        "MIC": _labels("MFR-", skus),
+    })
+
+    hdp_usn = hdp["USN"].to_numpy()
+    visibility = pd.DataFrame({
+        "PO_NUMBER": hdp["PO_NUMBER"].to_numpy(),
+        "USN": hdp_usn,
+        "DATE_RECEIVED": _random_days(rng, hdp["DATE_FIRST_RECEIVED"].to_numpy().astype("datetime64[D]"), 0, 15),
+        "MANUFACTURER_PART_NUMBER": _labels("MFR-", hdp_usn),
+    })
+
+    return [
+        SyntheticTable("EDP.STD_ECC.EKBE", ekbe, {}),
+        SyntheticTable("DM_SUPPLYCHAIN.IA_ATLAS.ATLAS", atlas, {}),
+        SyntheticTable("DM_SUPPLYCHAIN.PRO_INVENTORY_ANALYTICS.REPORT_PURCHASE_ORDER_VISIBILITY_SHIPMENTS",
+                       visibility, {"PO_NUMBER": "DECIMAL(38,0)", "DATE_RECEIVED": "DATE"}),
+    ]
+
+
+def _delivery_tables(rng, line_count, vendors, vendor_names, report_months, sku_count) -> List[SyntheticTable]:
+    delivery_count = max(1, line_count // 3)
+    vendor_index = _skewed_choice(rng, len(vendors), delivery_count)
+    lifnr = np.array([normalize_lifnr(vendor) for vendor in vendors], dtype=object)
+
+    # Delivery numbers: 06... (supplier ASN), 10... (EGR) or 08... (manual)
+    prefix = rng.choice(np.array(["06", "10", "08"]), delivery_count, p=[0.7, 0.2, 0.1])
+    sequence = np.char.zfill((np.arange(delivery_count) + 1).astype(str), 8)
+    vbeln = np.char.add(prefix, sequence).astype(object)
+    created = _random_days(rng, _month_starts(report_months)[rng.integers(0, len(report_months), delivery_count)],
+                           0, 28)
+    delivery_ids = np.arange(delivery_count)
+
+    likp = pd.DataFrame({
+        "MANDT": "300",
+        "VBELN": vbeln,
+        "LFART": np.where(rng.random(delivery_count) < 0.95, "ZEL", "ZNB").astype(object),
+        "ERNAM": np.array(ASN_CREATORS, dtype=object)[rng.integers(0, len(ASN_CREATORS), delivery_count)],
+        "LIFNR": lifnr[vendor_index],
+        "ERDAT": _yyyymmdd(created),
+        "VSTEL": _labels("", 1000 + rng.integers(0, 20, delivery_count)),
+        "ZUKRL": _labels("", 4500000000 + rng.integers(0, max(1, delivery_count), delivery_count)),
+        "LIFEX": _labels("SHP", delivery_ids),
+        "ZCARRIER_T": np.array(["UPS FREIGHT", "FEDEX FREIGHT", "ESTES", "OLD DOMINION"], dtype=object)[
+            rng.integers(0, 4, delivery_count)],
+        "BOLNR": _labels("BOL", delivery_ids),
+    })
+
+    line_delivery = rng.integers(0, delivery_count, line_count)
+    usn = 100000 + rng.integers(0, sku_count, line_count)
+    ordered = rng.integers(1, 200, line_count)
+    lips = pd.DataFrame({
+        "MANDT": "300",
+        "VBELN": vbeln[line_delivery],
+        "POSNR": _labels("", np.arange(line_count) % 900 + 10),
+        "MATNR": _matnr(usn),
+        "ARKTX": _labels("ITEM ", usn),
+        "ORMNG": ordered,
+        "LFIMG": np.where(rng.random(line_count) < 0.9, ordered, ordered // 2),
+        "MEINS": "EA",
+    })
+
+    skus = 100000 + np.arange(sku_count)
+    mara = pd.DataFrame({
+        "MANDT": "300",
+        "MATNR": _matnr(skus),
+        "MFRPN": _labels("MFR-", skus),
+    })
+    lfa1 = pd.DataFrame({"MANDT": "300", "LIFNR": lifnr, "NAME1": vendor_names})
+
+    return [
+        SyntheticTable("EDP.STD_ECC.LIKP", likp, {}),
+        SyntheticTable("EDP.STD_ECC.LIPS", lips, {"ORMNG": "DECIMAL(13,3)", "LFIMG": "DECIMAL(13,3)"}),
+        SyntheticTable("EDP.STD_ECC.MARA", mara, {}),
+        SyntheticTable("EDP.STD_ECC.LFA1", lfa1, {}),
+    ]
+
+
+def _pdh_tables(rng, request_count, vendors, vendor_names, sku_count, today: date) -> List[SyntheticTable]:
+    vendor_index = _skewed_choice(rng, len(vendors), request_count)
+    request_ids = 700000 + np.arange(request_count)
+    sent = (np.datetime64(today, "s") - rng.integers(0, 60 * 86400, request_count).astype("timedelta64[s]"))
+    product_count = rng.integers(1, 4, request_count)
+    first_sku = 100000 + rng.integers(0, sku_count, request_count)
+    product_list = pd.Series(first_sku).astype(str)
+    for extra in (1, 2):
+        more = product_count > extra
+        product_list[more] = product_list[more] + ";" + (first_sku[more] + extra).astype(str)
+
+    requests = pd.DataFrame({
+        "INTERNALRECORDID": request_ids,
+        "REQUEST_ID_PK1": request_ids,
+        "SUPPLIER_NAME": np.array(vendors, dtype=object)[vendor_index],
+        "PRODUCT_LIST": product_list.to_numpy(dtype=object),
+        "REQUEST_SENT_DATE": sent,
+        "REQUEST_STATUS": np.array(REQUEST_STATUSES, dtype=object)[
+            rng.choice(len(REQUEST_STATUSES), request_count, p=[0.35, 0.35, 0.1, 0.1, 0.05, 0.05])],
+        "REQUEST_TYPE": np.array(REQUEST_TYPES, dtype=object)[rng.integers(0, len(REQUEST_TYPES), request_count)],
+        "REQUEST_INITITATOR_TYPE": np.where(rng.random(request_count) < 0.9, "HDS Initiated",
+                                            "Supplier Initiated").astype(object),
+    })
+
+    approved = rng.random(request_count) < 0.5
+    approvals = pd.DataFrame({
+        "INTERNALRECORDID": 800000 + np.arange(int(approved.sum())),
+        "ASSOCIATED_REQUEST_ID": request_ids[approved],
+        "REVIEW_ID_PK1": request_ids[approved],
+        "VENDOR_NUMBER": requests["SUPPLIER_NAME"].to_numpy()[approved],
+        "HDS_PART_NUMBER": first_sku[approved].astype(str).astype(object),
+        "VENDOR_PART_NUMBER": ("MFR-" + pd.Series(first_sku[approved]).astype(str)).to_numpy(dtype=object),
+        "ATTRIBUTE_UPDATE_DATE": sent[approved] + rng.integers(0, 20 * 86400, int(approved.sum())).astype(
+            "timedelta64[s]"),
+    })
+
+    asked = rng.random(request_count) < 0.2
+    questions = pd.DataFrame({
+        "INTERNALRECORDID": 900000 + np.arange(int(asked.sum())),
+        "REVIEW_ID_PK1": request_ids[asked],
+        "QUESTION_ID_PK2": 900000 + np.arange(int(asked.sum())),
+        "QUESTION_DATE": sent[asked] + rng.integers(0, 15 * 86400, int(asked.sum())).astype("timedelta64[s]"),
+        "VENDOR_NUMBER": requests["SUPPLIER_NAME"].to_numpy()[asked],
+    })
+
+    sku_extract = pd.DataFrame({
+        "UDC_PRIMARY_VENDOR": ["E_" + vendor for vendor in vendors] + ["NO_VALUE"],
+        "UDC_PRIMARY_VENDOR_DESCR": list(vendor_names) + ["NO VALUE"],
+        "UDC_BUYER_ID": [f"B{index % 25:03d}" for index in range(len(vendors))] + ["B000"],
+        "UDC_BUYER": [f"BUYER {index % 25}" for index in range(len(vendors))] + ["UNASSIGNED"],
+    })
+
+    timestamps = {"REQUEST_SENT_DATE": "TIMESTAMP"}
+    return [
+        SyntheticTable("EDP.STD_ENABLE.EW_VW_MAINTENANCE_REQUESTS_STG", requests, timestamps),
+        SyntheticTable("EDP.STD_ENABLE.EW_VW_MAINTENANCE_APPROVAL_STG", approvals,
+                       {"ATTRIBUTE_UPDATE_DATE": "TIMESTAMP"}),
+        SyntheticTable("EDP.STD_ENABLE.EW_VW_MAINTENANCE_QUESTIONS_STG", questions, {"QUESTION_DATE": "TIMESTAMP"}),
+        SyntheticTable("EDP.STD_JDA.SKUEXTRACT", sku_extract, {}),
+    ]
+
+
+def generate_tab_frames(rows: int, vendor_count: Optional[int] = None, seed: int = 7,
+                        report_month: str = "FY2025-APR") -> Dict[str, pd.DataFrame]:
+    """
+    Generate the four report tab DataFrames of a run with ``rows`` metric lines.
+
+    Columns and value types follow the tab queries' results as fetched by the
+    connector: strings, ``int``/``float`` for NUMBER, ``decimal.Decimal`` for
+    quantities and ``datetime.date`` (or None) for dates.
+
+    Args:
+        rows (int): Basic_Metrics rows (Tab2); ASN_Data gets rows // 2 and
+            PDH_Compliance rows // 50, like generate_tables()
+        vendor_count (Optional[int]): Number of vendors (default: by scale)
+        seed (int): Random seed; the same arguments give the same frames
+        report_month (str): Report month of every row
+
+    Returns:
+        Dict[str, pd.DataFrame]: data_dict keyed like the engine's tabs
+    """
+    rng = np.random.default_rng(seed)
+    vendors = _vendor_numbers(vendor_count or default_vendor_count(rows))
+    vendor_names = np.array([f"VENDOR {vendor} SUPPLY CO" for vendor in vendors], dtype=object)
+    sku_count = max(100, rows // 10)
+    month_start = _month_starts([report_month])[0]
+
+    return {
+        'Summary_Metrics': _summary_tab(rng, vendors, vendor_names, report_month),
+        'Basic_Metrics': _basic_tab(rng, rows, vendors, vendor_names, report_month, month_start, sku_count),
+        'ASN_Data': _asn_tab(rng, max(1, rows // 2), vendors, vendor_names, month_start, sku_count),
+        'PDH_Compliance': _pdh_tab(rng, max(10, rows // 50), vendors, vendor_names, month_start, sku_count),
+    }
+
+
+def _dates(days: np.ndarray) -> np.ndarray:
+    """datetime.date objects (None for NaT), as the connector returns DATE columns."""
+    return _format_unique(days.astype("datetime64[D]"),
+                          lambda day: None if np.isnat(day) else day.astype(date))
+
+
+def _decimals(values: np.ndarray) -> np.ndarray:
+    return _format_unique(values, lambda value: Decimal(int(value)).quantize(Decimal("0.001")))
+
+
+def _summary_tab(rng, vendors, vendor_names, report_month) -> pd.DataFrame:
+    metric_types = ("1.Shipments_In_Full_1D", "2.Inbound_Fill_Rate_28D", "3.Units_On_Time_Complete",
+                    "4.ASN_Compliance")
+    count = len(vendors) * len(metric_types)
+    return pd.DataFrame({
+        "RPT_MONTH": report_month,
+        "VENDOR_NUMBER": np.repeat(np.array(vendors, dtype=object), len(metric_types)),
+        "VENDOR_NAME": np.repeat(vendor_names, len(metric_types)),
+        "METRICTYPE": np.tile(np.array(metric_types, dtype=object), len(vendors)),
+        "METRIC_PERCENTAGE": _format_unique(np.round(rng.uniform(60, 100, count), 1), lambda value: f"{value}%"),
+    })
+
+
+def _basic_tab(rng, rows, vendors, vendor_names, report_month, month_start, sku_count) -> pd.DataFrame:
+    vendor_index = _skewed_choice(rng, len(vendors), rows)
+    ordered = _random_days(rng, np.full(rows, month_start), 0, 28)
+    first_received = _random_days(rng, ordered, 4, 18).astype("datetime64[ns]")
+    first_received[rng.random(rows) < 0.1] = np.datetime64("NaT")
+    last_received = (first_received + rng.integers(0, 8, rows).astype("timedelta64[D]")).astype("datetime64[ns]")
+    units_ordered = rng.integers(1, 100, rows)
+    units_received = np.where(rng.random(rows) < 0.8, units_ordered, (units_ordered * rng.random(rows)).astype(int))
+    usn = 100000 + rng.integers(0, sku_count, rows)
+    warehouse = 1000 + rng.integers(0, 20, rows)
+    vendor_labels = np.array([f"{vendor} - {name}" for vendor, name in zip(vendors, vendor_names)], dtype=object)
+
+    return pd.DataFrame({
+        "REPORT_MONTH": report_month,
+        "NETWORK": np.where(rng.random(rows) < 0.7, "HDS", "HDP").astype(object),
+        "VENDOR": vendor_labels[vendor_index],
+        "WAREHOUSE_NUM": _labels("", warehouse),
+        "WAREHOUSE_NAME": _labels("DC ", warehouse),
+        "PO_NUMBER": (4500000000 + np.arange(rows, dtype=np.int64) // 3).astype(object),
+        "SKU": _format_unique(usn, lambda value: f"{value} - ITEM {value}"),
+        "VENDOR_PART_NUMBER": _labels("MFR-", usn),
+        "DATE_ORDERED": _dates(ordered),
+        "DATE_FIRST_RECEIVED": _dates(first_received),
+        "DATE_LAST_RECEIVED": _dates(last_received),
+        "METRICTYPE": np.array(METRICS, dtype=object)[rng.integers(0, len(METRICS), rows)],
+        "METRIC_UNITS_RECEIVED": units_received.astype(object),
+        "METRIC_UNITS_ORDERED": units_ordered.astype(object),
+        "Result": np.where(units_received == units_ordered, "Compliant", "Non-Compliant").astype(object),
+    })
+
+
+def _asn_tab(rng, line_count, vendors, vendor_names, month_start, sku_count) -> pd.DataFrame:
+    vendor_index = _skewed_choice(rng, len(vendors), line_count)
+    delivery = rng.integers(0, max(1, line_count // 3), line_count)
+    usn = 100000 + rng.integers(0, sku_count, line_count)
+    ordered = rng.integers(1, 200, line_count)
+    received = np.where(rng.random(line_count) < 0.9, ordered, ordered // 2)
+    inbound_type = np.array(ASN_INBOUND_TYPES, dtype=object)[
+        rng.choice(len(ASN_INBOUND_TYPES), line_count, p=[0.7, 0.2, 0.1])]
+
+    return pd.DataFrame({
+        "INBOUND_TYPE": inbound_type,
+        "VENDOR_NAME": vendor_names[vendor_index],
+        "VENDOR_NUMBER": np.array(vendors, dtype=object)[vendor_index],
+        "CREATE_DATE": _dates(_random_days(rng, np.full(line_count, month_start), 0, 28)),
+        "DC": _labels("", 1000 + rng.integers(0, 20, line_count)),
+        "PO_NUMBER": _labels("", 4500000000 + rng.integers(0, max(1, line_count), line_count)),
+        "VENDOR_PART_NUMBER": _labels("MFR-", usn),
+        "MATERIAL_NUMBER": _labels("", usn),
+        "MATERIAL_DESCRIPTION": _labels("ITEM ", usn),
+        "QUANTITY_ORDERED": _decimals(ordered),
+        "QUANTITY_RECEIVED": _decimals(received),
+        "UNIT_OF_MEASURE": "EA",
+        "DELIVERY_NUMBER": _labels("6", 10000000 + delivery),
+        "SUPPLIER_PROVIDED_ID": _labels("SHP", delivery),
+        "CARRIER_NAME": np.array(["UPS FREIGHT", "FEDEX FREIGHT", "ESTES", "OLD DOMINION"], dtype=object)[
+            rng.integers(0, 4, line_count)],
+        "PROVIDED_BOL": _labels("BOL", delivery),
+        "Result": np.where(inbound_type == "ASN", "Compliant", "Non-Compliant").astype(object),
+    })
+
+
+def _pdh_tab(rng, request_count, vendors, vendor_names, month_start, sku_count) -> pd.DataFrame:
+    vendor_index = _skewed_choice(rng, len(vendors), request_count)
+    requested = _random_days(rng, np.full(request_count, month_start), 0, 60)
+    asked = rng.random(request_count) < 0.2
+    updated = rng.random(request_count) < 0.5
+    question_day = _random_days(rng, requested, 0, 15).astype("datetime64[ns]")
+    question_day[~asked] = np.datetime64("NaT")
+    update_day = _random_days(rng, requested, 0, 20).astype("datetime64[ns]")
+    update_day[~updated] = np.datetime64("NaT")
+    request_ids = 700000 + np.arange(request_count)
+
+    return pd.DataFrame({
+        "SUPPLIER_NUMBER": np.array(vendors, dtype=object)[vendor_index],
+        "SUPPLIER_NAME": vendor_names[vendor_index],
+        "REQUESTED_SKU": _labels("", 100000 + rng.integers(0, sku_count, request_count)),
+        "REQUEST_STATUS": np.array(REQUEST_STATUSES, dtype=object)[rng.integers(0, len(REQUEST_STATUSES),
+                                                                                request_count)],
+        "REQUESTED_INFO": np.array(REQUEST_TYPES, dtype=object)[rng.integers(0, len(REQUEST_TYPES), request_count)],
+        "REQUEST_ID": request_ids,
+        "REQUEST_DATE_DAY": _dates(requested),
+        "QUESTION_ID": np.where(asked, 900000 + np.arange(request_count), np.nan),
+        "QUESTION_DATE_DAY": _dates(question_day),
+        "UPDATE_ID": np.where(updated, 800000 + np.arange(request_count), np.nan),
+        "UPDATE_DATE_DAY": _dates(update_day),
+        "DAYS_SINCE_REQUEST": rng.integers(0, 60, request_count),
+        "COMPLIANCE_LABEL": np.where(updated | asked, "Compliant", "Non-Compliant").astype(object),
+        "SUPPLIER_ACTION": np.where(updated | asked, "Actioned", "Not-Actioned").astype(object),
+    })
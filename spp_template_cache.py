@@ -0,0 +1,161 @@
+"""
+SPP Template Cache
+==================
+
+Keeps the report template resolved, read and parsed once per engine instead
+of once per report.
+
+Without it every report of a batch re-stats every ``search_paths`` entry (the
+template is looked up by generate_filename(), run_full_automation() and
+copy_template_file()), copies the template from OneDrive with
+``shutil.copy2`` and then re-parses the copy - workbook, relationships,
+styles - to populate it.
+
+Key Features:
+------------
+- **Resolved Once**: The template path is looked up once per template
+  configuration (custom path, template name and search paths); a template
+  that was not found is looked up again next time
+- **In-Memory Copy**: The template's bytes and its parsed package
+  (spp_excel_writers.TemplatePackage) are held in memory; every output is
+  written from those bytes and populated from that package
+- **Invalidation**: Each use stats the template file; when its mtime or
+  size changed it is re-read, and re-parsed only if its SHA-256 changed
+
+Developer: Ben F. Benjamaa
+Team: HD Supply Chain Excellence
+"""
+
+import hashlib
+import logging
+import os
+import zipfile
+from typing import Any, Dict, Optional, Tuple
+
+from spp_excel_writers import TemplatePackage
+
+
+class CachedTemplate:
+    """
+    One template file held in memory.
+
+    Attributes:
+        path (str): Template file path
+        signature (Tuple[int, int]): (mtime_ns, size) of the file when read
+        digest (str): SHA-256 of the content
+        data (bytes): File content
+        package (Optional[TemplatePackage]): Parsed package, None when the
+            file is not a readable zip package (outputs are still copied)
+    """
+
+    def __init__(self, path: str, signature: Tuple[int, int], data: bytes,
+                 logger: logging.Logger):
+        self.path = path
+        self.signature = signature
+        self.data = data
+        self.digest = hashlib.sha256(data).hexdigest()
+        try:
+            self.package: Optional[TemplatePackage] = TemplatePackage(data)
+        except (zipfile.BadZipFile, KeyError, StopIteration, ValueError) as e:
+            logger.warning(f"Template {path} could not be parsed ({e}) - outputs will be populated with openpyxl")
+            self.package = None
+
+
+class TemplateCache:
+    """
+    Resolved template path and in-memory template for a run or a batch of runs.
+
+    Attributes:
+        enabled (bool): False to resolve and copy from disk on every use
+        logger (logging.Logger): Logger for lookups and reloads
+    """
+
+    def __init__(self, enabled: bool = True, logger: Optional[logging.Logger] = None):
+        self.enabled = enabled
+        self.logger = logger or logging.getLogger("spp_automation")
+        self._resolved: Optional[Tuple[tuple, Optional[str]]] = None
+        self._template: Optional[CachedTemplate] = None
+        # output path -> (file signature after writing, template it was written from)
+        self._outputs: Dict[str, Tuple[Tuple[int, int], CachedTemplate]] = {}
+
+    def resolve(self, template_config: Dict[str, Any]) -> Optional[str]:
+        """Template path for template_config: the custom path, else the first search path holding it."""
+        key = (template_config.get("template_path") or "", template_config.get("template_name", "SPP_Template.xlsm"),
+               tuple(template_config.get("search_paths", [])))
+        if self.enabled and self._resolved and self._resolved[0] == key:
+            return self._resolved[1]
+
+        template_path = self._find(*key)
+        self._resolved = (key, template_path) if template_path else None
+        return template_path
+
+    def _find(self, custom_path: str, template_name: str, search_paths: tuple) -> Optional[str]:
+        # First check if user has specified a custom path
+        if custom_path and os.path.exists(custom_path):
+            self.logger.info(f"Using user-specified template: {custom_path}")
+            return custom_path
+
+        # Search in predefined locations
+        for search_path in search_paths:
+            template_path = os.path.join(search_path, template_name)
+            if os.path.exists(template_path):
+                self.logger.info(f"Found template at: {template_path}")
+                return template_path
+
+        self.logger.warning(f"Template file '{template_name}' not found in any search paths")
+        return None
+
+    def load(self, template_path: str) -> CachedTemplate:
+        """
+        The in-memory copy of template_path, re-read when the file changed.
+
+        Raises:
+            OSError: The template file cannot be read
+        """
+        stat = os.stat(template_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = self._template
+        if cached and cached.path == template_path and cached.signature == signature:
+            return cached
+
+        with open(template_path, "rb") as f:
+            data = f.read()
+        if cached and cached.path == template_path and hashlib.sha256(data).hexdigest() == cached.digest:
+            cached.signature = signature
+            return cached
+
+        self._template = CachedTemplate(template_path, signature, data, self.logger)
+        self._outputs.clear()
+        self.logger.info(f"Loaded template {template_path} ({len(data) / 1024:.0f} KB)")
+        return self._template
+
+    def copy_to(self, template_path: str, output_path: str) -> None:
+        """
+        Write the template to output_path from the in-memory copy.
+
+        Raises:
+            OSError: The template cannot be read or the output written
+        """
+        template = self.load(template_path)
+        with open(output_path, "wb") as f:
+            f.write(template.data)
+        stat = os.stat(output_path)
+        self._outputs[output_path] = ((stat.st_mtime_ns, stat.st_size), template)
+
+    def package_for(self, output_path: str) -> Optional[TemplatePackage]:
+        """Parsed template output_path was copied from, if the file has not changed since."""
+        entry = self._outputs.pop(output_path, None)
+        if entry is None:
+            return None
+        signature, template = entry
+        try:
+            stat = os.stat(output_path)
+        except OSError:
+            return None
+        return template.package if (stat.st_mtime_ns, stat.st_size) == signature else None
+
+    def invalidate(self) -> None:
+        """Forget the resolved path and the in-memory template."""
+        self._resolved = None
+        self._template = None
+        self._outputs.clear()
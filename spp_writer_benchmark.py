@@ -0,0 +1,350 @@
+"""
+SPP Excel Writer Benchmark
+==========================
+
+Times every Excel writer path of the SPP tools on synthetic report tabs and
+compares the numbers with a stored baseline, so a change that makes workbook
+writing slower, hungrier or bigger is caught before it ships.
+
+Writer Paths:
+------------
+- ``enhanced_template``: SPPAutomationEnhanced.populate_template_tabs()
+  (tab rows injected into the sheet XML of the copied template, see
+  spp_excel_writers.inject_sheet_data(); templates without the Tab1 - Tab4
+  sheets are populated with openpyxl)
+- ``enhanced_standard``: SPPAutomationEnhanced.create_standard_excel_file()
+  (write-only openpyxl workbook filled in chunks, see StreamingWorkbookWriter)
+- ``legacy_template`` / ``legacy_standard``: the SPPMetricAutomationFixed
+  writers (cell-by-cell openpyxl); they only know the METRIC DATA
+  (Basic_Metrics) and ASN Data tabs
+
+Template paths run against ``sample_templates/SPP_Template.xlsx`` ("sample")
+and a macro-enabled .xlsm ("macro", see build_macro_template()). Standard
+paths have no template ("none").
+
+Measurements:
+------------
+Every case runs in a fresh process (so peak memory belongs to that case
+only) on frames from spp_synthetic_data.generate_tab_frames():
+
+- ``seconds``: Wall time of the writer call
+- ``relative_seconds``: seconds / seconds of the REFERENCE_WRITER case of
+  the same scale in the same run, so it does not depend on the machine
+- ``peak_rss_mb``: Peak RSS of the case process (input frames included)
+- ``output_kb``: Size of the written workbook
+
+Baseline:
+--------
+``writer_benchmark_baseline.json`` holds the last accepted numbers per case
+(``<writer>/<template>/<scale>``, e.g. ``enhanced_template/macro/10k``). A
+metric regresses when it exceeds ``baseline * factor + slack`` (see
+DEFAULT_TOLERANCE; the file may override it). Wall times are only compared
+as relative_seconds; absolute seconds are recorded for reference.
+test_writer_benchmark.py checks the scales in ``SPP_BENCH_SIZES``
+(opt-in, e.g. ``SPP_BENCH_SIZES=10k``; the cases take minutes).
+
+Usage:
+-----
+    python spp_writer_benchmark.py --sizes 10k 100k 1M
+    python spp_writer_benchmark.py --sizes 10k --update-baseline
+
+Developer: Ben F. Benjamaa
+Team: HD Supply Chain Excellence
+"""
+
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import openpyxl
+from openpyxl.styles import Font
+
+from spp_excel_writers import TAB_SHEETS
+from spp_fetch import peak_rss_mb
+from spp_synthetic_data import generate_tab_frames, parse_scale
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+BASELINE_FILE = os.path.join(REPO_DIR, "writer_benchmark_baseline.json")
+
+DEFAULT_SIZES = ("10k", "100k", "1M")
+
+SAMPLE_TEMPLATE = os.path.join(REPO_DIR, "sample_templates", "SPP_Template.xlsx")
+
+# Checked-in macro template (built with build_macro_template() from a team
+# report workbook) whose VBA project the macro template gets
+MACRO_TEMPLATE_SOURCE = os.path.join(REPO_DIR, "sample_templates", "SPP_Macro_Template.xlsm")
+
+# Writer path -> runs against templates (True) or without one (False)
+WRITERS: Dict[str, bool] = {
+    'enhanced_template': True,
+    'enhanced_standard': False,
+    'legacy_template': True,
+    'legacy_standard': False,
+}
+
+TEMPLATES = ("sample", "macro")
+
+# Writer path whose time every case of a scale is divided by: the legacy
+# cell-by-cell writer is frozen, so it only tracks the speed of the machine
+REFERENCE_WRITER = 'legacy_standard'
+
+# Metric -> (factor, slack): regression when value > baseline * factor + slack
+DEFAULT_TOLERANCE: Dict[str, List[float]] = {
+    "relative_seconds": [1.5, 0.1],
+    "peak_rss_mb": [1.5, 50.0],
+    "output_kb": [1.25, 16.0],
+}
+
+# Metrics stored in the baseline
+METRICS = ("seconds", "relative_seconds", "peak_rss_mb", "output_kb")
+
+
+class BenchmarkCase(NamedTuple):
+    """One writer path on one template at one scale."""
+    writer: str
+    template: str
+    rows: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.writer}/{self.template}/{scale_label(self.rows)}"
+
+
+class BenchmarkResult(NamedTuple):
+    """Measurements of one case; success is the writer's own return value."""
+    key: str
+    seconds: float
+    peak_rss_mb: Optional[float]
+    output_kb: float
+    success: bool
+    relative_seconds: Optional[float] = None
+
+
+def scale_label(rows: int) -> str:
+    """Short label of a row count: 10000 -> "10k", 1000000 -> "1M"."""
+    for suffix, size in (("M", 1000000), ("k", 1000)):
+        if rows >= size and rows % size == 0:
+            return f"{rows // size}{suffix}"
+    return str(rows)
+
+
+def benchmark_cases(sizes: Sequence = DEFAULT_SIZES, writers: Sequence[str] = tuple(WRITERS),
+                    templates: Sequence[str] = TEMPLATES) -> List[BenchmarkCase]:
+    """All cases for the given scales, writer paths and templates (REFERENCE_WRITER always included)."""
+    writers = [REFERENCE_WRITER] + [writer for writer in writers if writer != REFERENCE_WRITER]
+    cases = []
+    for size in sizes:
+        for writer in writers:
+            for template in (templates if WRITERS[writer] else ("none",)):
+                cases.append(BenchmarkCase(writer, template, parse_scale(size)))
+    return cases
+
+
+def build_macro_template(output_path: str, source: str = MACRO_TEMPLATE_SOURCE) -> str:
+    """
+    Build the macro-enabled benchmark template (.xlsm) with the VBA project of source.
+
+    The template has the sheets of the team's macro workbook without data: a
+    pivot sheet, the legacy METRIC DATA / ASN Data tabs and Tab1 - Tab4, each
+    with a bold header row. Only the VBA project is taken over from source
+    (its pivot caches would make every load measure the source's data).
+
+    Returns:
+        str: output_path
+    """
+    vba_parts = io.BytesIO()
+    with zipfile.ZipFile(source) as workbook_zip, zipfile.ZipFile(vba_parts, "w") as vba_zip:
+        for name in ("[Content_Types].xml", "_rels/.rels", "xl/vbaProject.bin"):
+            vba_zip.writestr(name, workbook_zip.read(name))
+
+    frames = generate_tab_frames(10)
+    headers = {'METRIC DATA': frames['Basic_Metrics'].columns, 'ASN Data': frames['ASN_Data'].columns}
+    headers.update({sheet_name: frames[data_key].columns for data_key, sheet_name in TAB_SHEETS.items()})
+
+    workbook = openpyxl.Workbook()
+    workbook.active.title = 'Metric Pivots'
+    workbook.active['A1'] = 'SPP Metric Pivots'
+    for sheet_name, columns in headers.items():
+        worksheet = workbook.create_sheet(sheet_name)
+        for col, column_name in enumerate(columns, 1):
+            worksheet.cell(row=1, column=col, value=column_name).font = Font(bold=True)
+    workbook.vba_archive = zipfile.ZipFile(vba_parts)
+    workbook.save(output_path)
+    workbook.close()
+    return output_path
+
+
+def run_case(case: BenchmarkCase, work_dir: str, template_paths: Dict[str, str],
+             seed: int = 7) -> BenchmarkResult:
+    """
+    Run one case in a fresh worker process.
+
+    Args:
+        case (BenchmarkCase): Case to run
+        work_dir (str): Directory for the workbook and the writers' log files
+        template_paths (Dict[str, str]): Template name -> workbook path
+        seed (int): Seed of the synthetic frames
+    """
+    context = multiprocessing.get_context("spawn")
+    try:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            return pool.submit(_measure_case, case, work_dir, template_paths.get(case.template), seed).result()
+    except BrokenProcessPool:
+        # The worker died (typically out of memory at the largest scales)
+        return BenchmarkResult(case.key, 0.0, None, 0.0, False)
+
+
+def _measure_case(case: BenchmarkCase, work_dir: str, template_path: Optional[str], seed: int) -> BenchmarkResult:
+    """Worker task: generate the frames, time the writer, measure the output."""
+    os.chdir(work_dir)
+    frames = generate_tab_frames(case.rows, seed=seed)
+    extension = os.path.splitext(template_path)[1] if template_path else ".xlsx"
+    output_path = os.path.join(work_dir, case.key.replace("/", "_") + extension)
+    if template_path:
+        shutil.copy2(template_path, output_path)
+
+    writer = _writer(case.writer)
+    if case.writer.startswith("legacy"):
+        frames = {'METRIC DATA': frames['Basic_Metrics'], 'ASN Data': frames['ASN_Data']}
+
+    started = time.perf_counter()
+    success = writer(output_path, frames)
+    seconds = time.perf_counter() - started
+
+    peak = peak_rss_mb()
+    output_kb = os.path.getsize(output_path) / 1024 if os.path.exists(output_path) else 0.0
+    if os.path.exists(output_path):
+        os.remove(output_path)
+    return BenchmarkResult(case.key, round(seconds, 3), round(peak, 1) if peak is not None else None,
+                           round(output_kb, 1), bool(success))
+
+
+def with_relative_seconds(results: Sequence[BenchmarkResult]) -> List[BenchmarkResult]:
+    """results with relative_seconds set from the REFERENCE_WRITER result of each scale."""
+    reference = {result.key.rsplit("/", 1)[1]: result.seconds for result in results
+                 if result.key.startswith(f"{REFERENCE_WRITER}/") and result.success and result.seconds > 0}
+    relative = []
+    for result in results:
+        seconds = reference.get(result.key.rsplit("/", 1)[1])
+        relative.append(result._replace(relative_seconds=round(result.seconds / seconds, 3) if seconds else None))
+    return relative
+
+
+def _writer(name: str):
+    """Bound writer method of a fresh engine for a writer path."""
+    if name.startswith("enhanced"):
+        from spp_automation_enhanced import SPPAutomationEnhanced
+        engine = SPPAutomationEnhanced(config_file="benchmark.ini", user_email="benchmark@hdsupply.com")
+    else:
+        from spp_metric_automation_fixed import SPPMetricAutomationFixed
+        engine = SPPMetricAutomationFixed(config_file="benchmark.ini", user_email="benchmark@hdsupply.com")
+    return engine.populate_template_tabs if name.endswith("template") else engine.create_standard_excel_file
+
+
+def load_baseline(path: str = BASELINE_FILE) -> Dict:
+    """Stored baseline ({"tolerance": ..., "results": {case key: metrics}}); empty if missing."""
+    try:
+        with open(path) as f:
+            baseline = json.load(f)
+    except (OSError, ValueError):
+        baseline = {}
+    baseline.setdefault("tolerance", DEFAULT_TOLERANCE)
+    baseline.setdefault("results", {})
+    return baseline
+
+
+def save_baseline(results: Sequence[BenchmarkResult], path: str = BASELINE_FILE) -> None:
+    """Merge results into the stored baseline (other cases are kept)."""
+    baseline = load_baseline(path)
+    for result in results:
+        baseline["results"][result.key] = {metric: getattr(result, metric) for metric in METRICS}
+    baseline["results"] = dict(sorted(baseline["results"].items()))
+    baseline["recorded"] = {"date": datetime.now().strftime("%Y-%m-%d"), "platform": platform.platform(),
+                            "python": platform.python_version()}
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2)
+        f.write("\n")
+
+
+def find_regressions(result: BenchmarkResult, baseline: Dict) -> List[str]:
+    """Regression messages of result against the baseline (empty: within tolerance or no baseline)."""
+    reference = baseline.get("results", {}).get(result.key)
+    if reference is None:
+        return []
+
+    tolerance = {**DEFAULT_TOLERANCE, **baseline.get("tolerance", {})}
+    regressions = []
+    for metric in DEFAULT_TOLERANCE:
+        value, expected = getattr(result, metric), reference.get(metric)
+        if value is None or expected is None:
+            continue
+        factor, slack = tolerance[metric]
+        limit = expected * factor + slack
+        if value > limit:
+            regressions.append(f"{result.key}: {metric} {value} exceeds {limit:.1f} (baseline {expected})")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmark, print a table and check (or update) the baseline."""
+    parser = argparse.ArgumentParser(description="Benchmark the SPP Excel writer paths")
+    parser.add_argument("--sizes", nargs="+", default=list(DEFAULT_SIZES), help="Scales, e.g. 10k 100k 1M")
+    parser.add_argument("--writers", nargs="+", default=list(WRITERS), choices=list(WRITERS))
+    parser.add_argument("--templates", nargs="+", default=list(TEMPLATES), choices=list(TEMPLATES))
+    parser.add_argument("--macro-source", default=MACRO_TEMPLATE_SOURCE,
+                        help="Macro-enabled workbook the macro template is built from")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="Baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the baseline")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    baseline = load_baseline(args.baseline)
+    results, regressions = [], []
+    work_dir = tempfile.mkdtemp(prefix="spp_writer_benchmark_")
+    try:
+        template_paths = {"sample": SAMPLE_TEMPLATE}
+        if "macro" in args.templates:
+            template_paths["macro"] = build_macro_template(os.path.join(work_dir, "macro_template.xlsm"),
+                                                           args.macro_source)
+
+        for case in benchmark_cases(args.sizes, args.writers, args.templates):
+            results.append(run_case(case, work_dir, template_paths, args.seed))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    results = with_relative_seconds(results)
+    for result in results:
+        regressions += find_regressions(result, baseline)
+
+    print(f"{'case':<36}{'seconds':>10}{'relative':>10}{'peak MB':>10}{'output KB':>12}")
+    for result in results:
+        relative = f"{result.relative_seconds:.2f}" if result.relative_seconds is not None else "n/a"
+        peak = f"{result.peak_rss_mb:.1f}" if result.peak_rss_mb is not None else "n/a"
+        status = "" if result.success else "  (writer failed)"
+        print(f"{result.key:<36}{result.seconds:>10.2f}{relative:>10}{peak:>10}{result.output_kb:>12.1f}{status}")
+
+    if args.update_baseline:
+        save_baseline(results, args.baseline)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    return 1 if regressions or not all(result.success for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
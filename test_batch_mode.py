@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test script for per-vendor batch mode in SPP Enhanced (no live login needed)
+"""
+
+import datetime
+import os
+import sys
+
+import openpyxl
+import pandas as pd
+import pytest
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from spp_batch import partition_by_vendor
+from spp_batch_writer import BatchWorkbookWriter
+from spp_summary import SUMMARY_COLUMNS
+
+BASIC_COLUMNS = ["REPORT_MONTH", "VENDOR", "PO_NUMBER", "METRICTYPE",
+                 "METRIC_UNITS_RECEIVED", "METRIC_UNITS_ORDERED"]
+ASN_COLUMNS = ["INBOUND_TYPE", "VENDOR_NAME", "VENDOR_NUMBER", "CREATE_DATE"]
+
+# Marker text in each tab query -> (columns, rows) covering two vendors
+FAKE_RESULTS = {
+    "ASN_Metric AS": (SUMMARY_COLUMNS, [
+        ("FY2025-APR", "13479", "ACME SUPPLY", "4.ASN_Success_Rate", ".0%"),
+        ("FY2025-APR", "52889", "BOXER HOME LLC", "4.ASN_Success_Rate", "100.0%"),
+    ]),
+    "primary_metric AS": (BASIC_COLUMNS, [
+        ("FY2025-APR", "52889 - BOXER HOME LLC", "PO1", "Shipments_In_Full_1D", 1, 2),
+        ("FY2025-APR", "13479 - ACME SUPPLY", "PO2", "Shipments_In_Full_1D", 3, 3),
+        ("FY2025-APR", "52889 - BOXER HOME LLC", "PO3", "Units_On_Time_Complete", 0, 1),
+    ]),
+    "FROM EDP.STD_ECC.LIKP IH": (ASN_COLUMNS, [
+        ("ASN", "BOXER HOME LLC", "52889", datetime.date(2025, 4, 2)),
+        ("EGR", "ACME SUPPLY", "13479", datetime.date(2025, 4, 9)),
+    ]),
+    "primary_request As": (["SUPPLIER_NUMBER", "REQUESTED_SKU"], [("13479", "SKU1")]),
+}
+
+
+@pytest.fixture
+def automation(automation, attach_connection):
+    automation.performance_config.update(concurrent_queries=False, result_cache=False, run_key_tables=False)
+    automation.result_cache.enabled = False
+    attach_connection(FAKE_RESULTS)
+    return automation
+
+
+def test_one_query_pass_one_workbook_per_vendor(automation):
+    """Each tab query runs once for all vendors; each vendor gets its own file."""
+    outcomes = automation.run_batch_automation(["52889", "13479", "99999"], "FY2025-APR", "202504")
+
+    queries = automation.connection.queries
+    assert [marker for marker, _, _ in queries] == ["ASN_Metric AS", "primary_metric AS",
+                                                    "FROM EDP.STD_ECC.LIKP IH", "primary_request As"]
+    assert '"52889"' in queries[1][2][0] and '"13479"' in queries[1][2][0]
+
+    assert os.path.basename(outcomes["52889"][0]) == "52889 - BOXER HOME LLC - APR 2025.xlsx"
+    assert os.path.basename(outcomes["13479"][0]) == "13479 - ACME SUPPLY - APR 2025.xlsx"
+    assert outcomes["99999"] == ("", "No data found for the specified criteria")
+
+    workbook = openpyxl.load_workbook(outcomes["52889"][0])
+    assert workbook.sheetnames == ["Tab1_Summary_Metrics", "Tab2_Basic_Metrics", "Tab3_ASN_Data"]
+    assert [row[2] for row in workbook["Tab2_Basic_Metrics"].iter_rows(min_row=2, values_only=True)] == ["PO1", "PO3"]
+    summary_vendors = {row[1] for row in workbook["Tab1_Summary_Metrics"].iter_rows(min_row=2, values_only=True)}
+    assert summary_vendors == {"52889"}
+
+    workbook = openpyxl.load_workbook(outcomes["13479"][0])
+    assert "Tab4_PDH_Compliance" in workbook.sheetnames
+
+
+def test_rerun_of_settled_month_skips_the_asn_query(automation):
+    """ASN lines of a closed month come from the incremental extract store on re-runs."""
+    pytest.importorskip("pyarrow")
+    first = automation.run_batch_automation(["52889", "13479"], "FY2025-APR", "202504")
+    automation.connection.queries.clear()
+
+    second = automation.run_batch_automation(["52889", "13479"], "FY2025-APR", "202504")
+
+    assert "FROM EDP.STD_ECC.LIKP IH" not in [marker for marker, _, _ in automation.connection.queries]
+    assert [status for _, status in second.values()] == [status for _, status in first.values()]
+
+
+def test_partition_matches_padded_and_trimmed_vendor_numbers():
+    results = {
+        "ASN_Data": pd.DataFrame({"VENDOR_NUMBER": ["52889", "0052889 ", "13479"], "ROW": [1, 2, 3]}),
+        "Basic_Metrics": pd.DataFrame({"VENDOR": ["52889 - A - B"], "ROW": [4]}),
+    }
+
+    partitions = partition_by_vendor(results, ["052889", "77777"])
+
+    assert partitions["052889"]["ASN_Data"]["ROW"].tolist() == [1, 2]
+    assert partitions["052889"]["Basic_Metrics"]["ROW"].tolist() == [4]
+    assert partitions["77777"]["ASN_Data"].empty
+    assert list(partitions["77777"]["ASN_Data"].columns) == ["VENDOR_NUMBER", "ROW"]
+
+
+def test_process_pool_writer_collects_results_and_errors_per_vendor(automation):
+    """Workbooks are written by worker processes; a failing vendor does not stop the rest."""
+    def data_dict(vendor, name):
+        return {
+            "Summary_Metrics": pd.DataFrame(),
+            "Basic_Metrics": pd.DataFrame({"VENDOR": [f"{vendor} - {name}"], "PO_NUMBER": ["PO1"]}),
+            "ASN_Data": pd.DataFrame(),
+            "PDH_Compliance": pd.DataFrame(),
+        }
+
+    partitions = {vendor: data_dict(vendor, f"VENDOR {vendor}") for vendor in ("111", "222", "333")}
+    del partitions["222"]["PDH_Compliance"]
+
+    outcomes = BatchWorkbookWriter(automation, max_workers=2).write_all("FY2025-APR", partitions)
+
+    assert list(outcomes) == ["111", "222", "333"]
+    assert os.path.basename(outcomes["111"][0]) == "111 - VENDOR 111 - APR 2025.xlsx"
+    assert os.path.exists(outcomes["333"][0])
+    assert outcomes["222"][0] == "" and "PDH_Compliance" in outcomes["222"][1]
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
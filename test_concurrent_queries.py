@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Test script for concurrent tab query execution in SPP Enhanced (no live login needed)
+"""
+
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from spp_query_builder import BoundQuery
+
+# Marker text in each tab query -> a one-row result naming the tab
+TAB_RESULTS = {marker: (["TAB"], [(name,)]) for marker, name in (
+    ("Metric_Data AS", "Summary_Metrics"), ("primary_metric AS", "Basic_Metrics"),
+    ("FROM EDP.STD_ECC.LIKP IH", "ASN_Data"), ("primary_request As", "PDH_Compliance"))}
+
+
+def test_all_queries_submitted_before_any_result(automation, fake_connection):
+    """All four tab queries are in flight at once and results keep tab order."""
+    automation.connection = fake_connection(TAB_RESULTS)
+    queries = automation.build_tab_queries(["52889"], "FY2025-APR", "202507")
+
+    results = automation.run_tab_queries(queries)
+
+    assert [statement for statement, _ in automation.connection.submitted] == [query.sql for query in queries.values()]
+    assert list(results) == ['Summary_Metrics', 'Basic_Metrics', 'ASN_Data', 'PDH_Compliance']
+    for name, df in results.items():
+        assert df.iloc[0, 0] == name
+
+
+def test_failed_query_cancels_remaining(automation, fake_connection):
+    """A failing query cancels the ones still running and re-raises."""
+    automation.connection = fake_connection(TAB_RESULTS, fail_on="Metric_Data AS")
+    queries = automation.build_tab_queries(["52889"], "FY2025-APR", "202507")
+
+    with pytest.raises(Exception):
+        automation.execute_queries_concurrently(queries)
+
+    cancelled = [q for q, _ in automation.connection.statements if "SYSTEM$CANCEL_QUERY" in q]
+    assert len(cancelled) == 4
+
+
+def test_sequential_mode_when_disabled(automation):
+    """concurrent_queries = False falls back to the blocking execute_query path."""
+    automation.performance_config["concurrent_queries"] = False
+    executed = []
+    automation.execute_query = lambda query, name="query": executed.append(query.sql) or pd.DataFrame({"SQL": [query.sql]})
+    queries = {"A": BoundQuery("SELECT 1"), "B": BoundQuery("SELECT 2")}
+
+    results = automation.run_tab_queries(queries)
+    assert [df.iloc[0, 0] for df in results.values()] == ["SELECT 1", "SELECT 2"]
+    assert executed == ["SELECT 1", "SELECT 2"]
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
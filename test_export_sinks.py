@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test script for the Parquet/CSV/Feather/SQLite export sinks (no live login needed)
+"""
+
+import os
+import sqlite3
+import sys
+
+import openpyxl
+import pandas as pd
+import pytest
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import spp_excel_writers
+from spp_automation_enhanced import SPPAutomationEnhanced, main
+from spp_excel_writers import OVERFLOW_SHEET
+from spp_export import export_data, parse_export_formats
+from spp_synthetic_data import generate_tab_frames
+
+
+def test_parse_export_formats():
+    assert parse_export_formats("parquet, CSV sqlite,,parquet") == ["parquet", "csv", "sqlite"]
+    assert parse_export_formats("") == []
+    with pytest.raises(ValueError):
+        parse_export_formats(["parquet", "xlsb"])
+
+
+def test_export_writes_typed_tabs(tmp_path):
+    frames = generate_tab_frames(200)
+    base_path = str(tmp_path / "52889 - BOXER HOME LLC - APR 2025")
+
+    paths = export_data(frames, base_path, ["parquet", "csv", "feather", "sqlite"])
+
+    assert len(paths) == 13 and all(os.path.exists(path) for path in paths)
+    basic = pd.read_parquet(f"{base_path} - Tab2_Basic_Metrics - export.parquet")
+    assert len(basic) == 200
+    assert pd.api.types.is_datetime64_any_dtype(basic["DATE_ORDERED"])
+    asn = pd.read_feather(f"{base_path} - Tab3_ASN_Data - export.feather")
+    assert pd.api.types.is_float_dtype(asn["QUANTITY_ORDERED"])
+    assert len(pd.read_csv(f"{base_path} - Tab4_PDH_Compliance - export.csv")) == len(frames['PDH_Compliance'])
+
+    with sqlite3.connect(f"{base_path}.sqlite") as connection:
+        tables = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        rows = connection.execute('SELECT COUNT(*) FROM "Tab2_Basic_Metrics"').fetchone()[0]
+    assert tables == {"Tab1_Summary_Metrics", "Tab2_Basic_Metrics", "Tab3_ASN_Data", "Tab4_PDH_Compliance"}
+    assert rows == 200
+
+
+def test_report_exports_alongside_workbook(automation):
+    automation.export_formats = ["parquet", "sqlite"]
+
+    path, message = automation.write_report(["52889"], "FY2025-APR", generate_tab_frames(100))
+
+    assert path.endswith(".xlsx") and os.path.exists(path)
+    base_path = os.path.splitext(path)[0]
+    assert os.path.exists(f"{base_path} - Tab2_Basic_Metrics - export.parquet") and os.path.exists(f"{base_path}.sqlite")
+    assert "also exported 5 parquet/sqlite files" in message
+
+
+def test_export_and_overflow_sidecar_write_separate_files(automation, monkeypatch):
+    """A parquet export and a row_overflow sidecar of the same tab never share a file."""
+    monkeypatch.setattr(spp_excel_writers, "EXCEL_MAX_ROWS", 11)
+    automation.performance_config["row_overflow"] = "sidecar"
+    automation.export_formats = ["parquet"]
+
+    path, _ = automation.write_report(["52889"], "FY2025-APR", generate_tab_frames(100))
+
+    base_path = os.path.splitext(path)[0]
+    sidecars = [row[3] for row in openpyxl.load_workbook(path)[OVERFLOW_SHEET].iter_rows(min_row=2, values_only=True)]
+    assert f"{os.path.basename(base_path)} - Tab2_Basic_Metrics.parquet" in sidecars
+    for name in (f"{base_path} - Tab2_Basic_Metrics.parquet", f"{base_path} - Tab2_Basic_Metrics - export.parquet"):
+        assert len(pd.read_parquet(name)) == 100
+
+
+def test_export_only_skips_workbook(automation):
+    automation.export_formats, automation.export_only = ["csv"], True
+
+    path, message = automation.write_report(["52889"], "FY2025-APR", generate_tab_frames(100))
+
+    assert path.endswith(" - Tab1_Summary_Metrics - export.csv") and "without an Excel workbook" in message
+    assert not [name for name in os.listdir(os.path.dirname(path)) if name.endswith((".xlsx", ".xlsm"))]
+
+
+def test_cli_selects_export_sinks(automation, monkeypatch, capsys):
+    runs = []
+
+    def fake_run(engine, vendors, month, date_filter):
+        runs.append((vendors, month, date_filter, engine.export_formats, engine.export_only))
+        return "report.parquet", "ok"
+
+    monkeypatch.setattr(SPPAutomationEnhanced, "run_full_automation", fake_run)
+
+    assert main(["--vendors", "52889", "--month", "FY2025-APR", "--config", "missing.ini",
+                 "--export", "parquet", "feather", "--export-only"]) == 0
+    assert runs == [(["52889"], "FY2025-APR", "202504", ["parquet", "feather"], True)]
+    assert "report.parquet" in capsys.readouterr().out
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
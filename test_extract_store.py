@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test script for the incremental ASN extract store of SPP Enhanced (no live login needed)
+"""
+
+import os
+import sys
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+pytest.importorskip("pyarrow")
+
+from spp_extract_store import IncrementalExtractStore
+from spp_fiscal_calendar import ErdatRange
+
+TODAY = date.today()
+
+
+def day(offset: int) -> str:
+    return (TODAY + timedelta(days=offset)).strftime("%Y%m%d")
+
+
+def asn_lines(*rows):
+    """rows: (vendor number, day offset, delivery number)"""
+    return pd.DataFrame({
+        "VENDOR_NUMBER": [vendor for vendor, _, _ in rows],
+        "CREATE_DATE": [TODAY + timedelta(days=offset) for _, offset, _ in rows],
+        "DELIVERY_NUMBER": [delivery for _, _, delivery in rows],
+    })
+
+
+@pytest.fixture
+def store(tmp_path):
+    return IncrementalExtractStore(str(tmp_path / "asn"), overlap_days=3)
+
+
+def test_rerun_fetches_only_the_overlap(store):
+    window = ErdatRange(day(-10), day(1))
+    assert store.plan(["52889"], window) == window
+
+    first = asn_lines(("52889", -9, "D1"), ("52889", -2, "D2"))
+    store.merge(["52889"], window, window, first)
+
+    fetch = store.plan(["52889"], window)
+    assert fetch == ErdatRange(day(-3), day(1))
+
+    # D2 was changed and D3 arrived since the first sync
+    delta = asn_lines(("52889", -2, "D2-updated"), ("52889", 0, "D3"))
+    merged = store.merge(["52889"], window, fetch, delta)
+    assert sorted(merged["DELIVERY_NUMBER"]) == ["D1", "D2-updated", "D3"]
+
+
+def test_settled_past_window_is_served_without_a_query(store):
+    window = ErdatRange(day(-60), day(-30))
+    store.merge(["52889"], window, window, asn_lines(("52889", -45, "D1"), ("52889", -5, "OUTSIDE")))
+
+    assert store.plan(["52889"], window) is None
+    assert store.merge(["52889"], window, None, None)["DELIVERY_NUMBER"].tolist() == ["D1"]
+
+
+def test_new_vendor_or_refresh_needs_the_whole_window(store):
+    window = ErdatRange(day(-60), day(-30))
+    store.merge(["52889"], window, window, asn_lines(("52889", -45, "D1")))
+
+    assert store.plan(["52889", "13479"], window) == window
+    assert store.plan(["52889"], window, refresh=True) == window
+    # A window before the stored interval restarts the store
+    earlier = ErdatRange(day(-90), day(-61))
+    assert store.plan(["52889"], earlier) == earlier
+
+
+def test_vendors_are_split_into_their_own_stores(store):
+    window = ErdatRange(day(-60), day(-30))
+    store.merge(["52889", "13479"], window, window,
+                asn_lines(("52889", -45, "D1"), ("13479", -40, "D2")))
+
+    assert store.merge(["13479"], window, None, None)["DELIVERY_NUMBER"].tolist() == ["D2"]
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
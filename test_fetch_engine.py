@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Test script for Arrow result fetching in SPP Enhanced (no live login needed)
+"""
+
+import logging
+import os
+import sys
+from datetime import date, datetime
+from decimal import Decimal
+
+import openpyxl
+import pandas as pd
+import pytest
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from spp_excel_writers import StreamingWorkbookWriter
+from spp_fetch import ArrowFetchEngine, TAB_COLUMN_TYPES, materialize_types
+
+pa = pytest.importorskip("pyarrow")
+
+
+COLUMNS = ["VENDOR_NUMBER", "METRIC_NUMERATOR"]
+ROWS = [("52889", 10), ("52889", 0), ("13479", 7)]
+
+TYPED_COLUMNS = ["VENDOR_NUMBER", "CREATE_DATE", "QUANTITY_ORDERED", "METRIC_UNITS_ORDERED"]
+TYPED_ROWS = [
+    ("52889", date(2025, 4, 1), Decimal("12.500"), Decimal("5.000")),
+    ("52889", None, None, Decimal("7.000")),
+    ("13479", date(2025, 4, 30), Decimal("30.000"), Decimal("1.000")),
+]
+
+COLUMN_TYPES = {"CREATE_DATE": "datetime64", "QUANTITY_ORDERED": "float64", "METRIC_UNITS_ORDERED": "int64"}
+
+
+@pytest.fixture
+def run_query(fake_connection):
+    """Cursor that executed a query returning rows (in batches of 2 rows)."""
+    def execute(columns, rows):
+        cursor = fake_connection({"SELECT": (columns, rows)}, batch_rows=2).cursor()
+        cursor.execute("SELECT")
+        return cursor
+    return execute
+
+
+def test_arrow_and_fetchall_return_same_rows(run_query):
+    """Arrow batches are concatenated into the same frame fetchall() builds."""
+    arrow_df = ArrowFetchEngine(use_arrow=True).fetch_dataframe(run_query(COLUMNS, ROWS))
+    tuple_df = ArrowFetchEngine(use_arrow=False).fetch_dataframe(run_query(COLUMNS, ROWS))
+
+    assert arrow_df.values.tolist() == tuple_df.values.tolist()
+    assert list(arrow_df.columns) == COLUMNS
+
+
+def test_fetch_table_is_columnar_and_records_stats(run_query):
+    """fetch_table() returns a pyarrow.Table and records fetch statistics."""
+    engine = ArrowFetchEngine()
+    table = engine.fetch_table(run_query(COLUMNS, ROWS))
+
+    assert isinstance(table, pa.Table)
+    assert table.num_rows == 3
+    assert engine.stats[-1]["rows"] == 3
+    assert engine.stats[-1]["method"] == "arrow"
+    # RSS after the fetch and its change over the fetch (None where RSS is not measurable)
+    assert (engine.stats[-1]["rss_mb"] is None) == (engine.stats[-1]["rss_delta_mb"] is None)
+
+
+def test_empty_result_keeps_columns(run_query):
+    """Queries without rows still return the result columns."""
+    df = ArrowFetchEngine().fetch_dataframe(run_query(COLUMNS, []))
+
+    assert df.empty
+    assert list(df.columns) == COLUMNS
+
+
+@pytest.mark.parametrize("use_arrow", [True, False])
+def test_decimal_and_date_columns_typed_at_fetch(use_arrow, run_query, caplog):
+    """Decimal and date objects come back as float64/int64/datetime64 columns."""
+    caplog.set_level(logging.INFO)
+    engine = ArrowFetchEngine(use_arrow=use_arrow)
+    df = engine.fetch_dataframe(run_query(TYPED_COLUMNS, TYPED_ROWS), COLUMN_TYPES, "ASN_Data")
+
+    assert pd.api.types.is_datetime64_any_dtype(df["CREATE_DATE"]) and df["CREATE_DATE"].isna().tolist() == \
+        [False, True, False]
+    assert df["QUANTITY_ORDERED"].dtype == "float64" and df["QUANTITY_ORDERED"].tolist()[::2] == [12.5, 30.0]
+    assert df["METRIC_UNITS_ORDERED"].dtype == "int64" and df["METRIC_UNITS_ORDERED"].tolist() == [5, 7, 1]
+    assert "ASN_Data: typed 3 columns" in caplog.text and "MB ->" in caplog.text
+
+
+@pytest.mark.parametrize("use_arrow", [True, False])
+def test_open_ended_date_survives_fetch_and_write(use_arrow, run_query, tmp_path):
+    """SAP's 9999-12-31 sentinel is typed at fetch and reaches the written cell."""
+    rows = TYPED_ROWS[:2] + [TYPED_ROWS[2][:1] + (date(9999, 12, 31),) + TYPED_ROWS[2][2:]]
+    df = ArrowFetchEngine(use_arrow=use_arrow).fetch_dataframe(run_query(TYPED_COLUMNS, rows), COLUMN_TYPES)
+
+    assert pd.api.types.is_datetime64_any_dtype(df["CREATE_DATE"])
+    assert df["CREATE_DATE"].iloc[2] == pd.Timestamp("9999-12-31")
+
+    path = str(tmp_path / "sentinel.xlsx")
+    writer = StreamingWorkbookWriter(path)
+    writer.write_sheet("Tab3_ASN_Data", df)
+    writer.save()
+    worksheet = openpyxl.load_workbook(path)["Tab3_ASN_Data"]
+    assert worksheet["B4"].value == datetime(9999, 12, 31)
+
+
+def test_int_columns_with_fractions_or_gaps_stay_float():
+    df = pd.DataFrame({"DAYS": [Decimal("1.5"), Decimal("2")], "IDS": [1, None]}, dtype=object)
+
+    typed = materialize_types(df, {"DAYS": "int64", "IDS": "int64", "MISSING": "datetime64"})
+
+    assert typed["DAYS"].tolist() == [1.5, 2.0] and typed["IDS"].dtype == "float64"
+    assert materialize_types(typed, {"DAYS": "int64", "IDS": "int64"}) is typed
+    with pytest.raises(ValueError):
+        materialize_types(df, {"DAYS": "decimal"})
+
+
+def test_streamed_chunks_share_dtypes(run_query):
+    """Every streamed chunk is typed, including a chunk whose dates are all missing."""
+    rows = [TYPED_ROWS[0], TYPED_ROWS[1][:3] + (None,), TYPED_ROWS[2][:1] + (None,) + TYPED_ROWS[2][2:]]
+    batches = list(ArrowFetchEngine().iter_dataframes(run_query(TYPED_COLUMNS, rows), column_types=COLUMN_TYPES))
+
+    assert len(batches) == 2
+    assert all(pd.api.types.is_datetime64_any_dtype(batch["CREATE_DATE"]) for batch in batches)
+    assert batches[1]["METRIC_UNITS_ORDERED"].dtype == "float64" and batches[0].dtypes.equals(batches[1].dtypes)
+    assert set(TAB_COLUMN_TYPES) == {"Basic_Metrics", "ASN_Data", "PDH_Compliance"}
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
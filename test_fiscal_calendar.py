@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test script for the ERDAT range helpers of SPP Enhanced
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from spp_fiscal_calendar import ErdatRange, date_filter_range, erdat_range, erdat_span, report_month_range, \
+    report_months_between
+
+
+@pytest.mark.parametrize("report_month, expected", [
+    ("FY2025-APR", ("20250401", "20250501")),
+    ("fy2026-jan", ("20260101", "20260201")),
+    ("FY2025-DEC", ("20251201", "20260101")),
+])
+def test_report_month_range(report_month, expected):
+    assert report_month_range(report_month) == ErdatRange(*expected)
+
+
+@pytest.mark.parametrize("date_filter, expected", [
+    ("2025", ("20250101", "20260101")),
+    ("202502", ("20250201", "20250301")),
+    ("202412", ("20241201", "20250101")),
+    ("20240228", ("20240228", "20240229")),
+    ("20241231", ("20241231", "20250101")),
+])
+def test_date_filter_range_matches_like_prefix(date_filter, expected):
+    assert date_filter_range(date_filter) == ErdatRange(*expected)
+
+
+@pytest.mark.parametrize("date_filter", ["2025-04", "20251", "202513", "20250230", ""])
+def test_invalid_date_filter_rejected(date_filter):
+    with pytest.raises(ValueError):
+        date_filter_range(date_filter)
+
+
+def test_invalid_report_month_rejected():
+    with pytest.raises(ValueError):
+        report_month_range("FY2025-APRIL")
+
+
+def test_date_filter_takes_precedence_over_report_month():
+    assert erdat_range("FY2025-APR", "202503") == ErdatRange("20250301", "20250401")
+    assert erdat_range("FY2025-APR", " ") == ErdatRange("20250401", "20250501")
+
+
+def test_month_range_crosses_year_end():
+    months = report_months_between("FY2025-NOV", "FY2026-FEB")
+
+    assert months == ["FY2025-NOV", "FY2025-DEC", "FY2026-JAN", "FY2026-FEB"]
+    assert erdat_span(months) == ErdatRange("20251101", "20260301")
+    assert erdat_span(months, "20251115", "20260210") == ErdatRange("20251115", "20260211")
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
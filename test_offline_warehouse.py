@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Test script for the offline warehouse and synthetic data generator (no live login needed)
+"""
+
+import json
+import os
+import sys
+
+import openpyxl
+import pytest
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+pytest.importorskip("duckdb")
+
+from spp_offline import (MANIFEST_FILE, OfflineConnection, attach_offline_warehouse, load_synthetic_warehouse,
+                         translate_sql)
+from spp_synthetic_data import ANCHOR_VENDOR, generate_tables, parse_scale
+
+
+@pytest.fixture
+def warehouse():
+    connection = OfflineConnection()
+    dataset = load_synthetic_warehouse(connection, "2k")
+    yield connection, dataset
+    connection.close()
+
+
+@pytest.fixture
+def automation(automation, warehouse):
+    attach_offline_warehouse(automation, warehouse[0])
+    return automation
+
+
+def test_parse_scale():
+    assert parse_scale("1k") == 1000
+    assert parse_scale("5M") == 5000000
+    assert parse_scale(2500) == 2500
+    with pytest.raises(ValueError):
+        parse_scale("lots")
+
+
+def test_generator_is_deterministic_and_sized():
+    tables, dataset = generate_tables(1000, seed=3)
+    again, _ = generate_tables(1000, seed=3)
+
+    assert dataset.vendor_numbers[0] == ANCHOR_VENDOR
+    assert dataset.table_rows["DM_SUPPLYCHAIN.VENDOR_PERFORMANCE.COMBINED_IPR_IB_VENDOR_PERFORMANCE"] == 1000
+    for table, repeat in zip(tables, again):
+        if "MAINTENANCE" not in table.name:
+            assert table.frame.equals(repeat.frame)
+
+
+def test_translate_snowflake_constructs():
+    sql = translate_sql(
+        "SELECT TO_CHAR(TO_DATE(ERDAT, 'YYYYMMDD'), '\"FY\"YYYY-MON'), LTRIM(LIFNR, 0) FROM T "
+        "WHERE V IN (SELECT VALUE::STRING FROM TABLE(FLATTEN(INPUT => PARSE_JSON(:1)))) -- note (x\n"
+        "AND CONCAT(PO, ':', USN) = :2"
+    )
+    assert "$1" in sql and "$2" in sql
+    assert "':'" in sql
+    assert "FLATTEN" not in sql and "from_json" in sql
+    assert "upper(strftime(" in sql
+    assert "note" not in sql
+
+
+def test_full_automation_end_to_end(automation, warehouse):
+    """run_full_automation produces the four tabs from the synthetic warehouse."""
+    path, message = automation.run_full_automation([ANCHOR_VENDOR], "FY2025-APR", "202504")
+
+    assert path, message
+    workbook = openpyxl.load_workbook(path, read_only=True)
+    assert workbook.sheetnames[:4] == ['Tab1_Summary_Metrics', 'Tab2_Basic_Metrics',
+                                       'Tab3_ASN_Data', 'Tab4_PDH_Compliance']
+    for name in workbook.sheetnames[:3]:
+        assert workbook[name].max_row > 1
+    workbook.close()
+
+
+def test_concurrent_queries_and_history(automation, warehouse):
+    """Async tab queries overlap and their timings come back through query history."""
+    automation.connect_to_snowflake()
+    automation.connection.cursor().execute("ALTER SESSION SET QUERY_TAG = 'nightly'")
+    automation.profiler.start_run(automation.connection)
+    queries = automation.build_tab_queries([ANCHOR_VENDOR], "FY2025-APR", "202504")
+
+    results = automation.execute_queries_concurrently(queries)
+    automation.profiler.finish_run(automation.connection)
+
+    assert warehouse[0].query_tag == "nightly"
+
+    assert list(results) == ['Summary_Metrics', 'Basic_Metrics', 'ASN_Data', 'PDH_Compliance']
+    assert set(results['Summary_Metrics']['VENDOR_NUMBER']) == {ANCHOR_VENDOR}
+    profile_files = os.listdir("profiles")
+    with open(os.path.join("profiles", profile_files[0])) as f:
+        profile = json.load(f)
+    assert all(entry.get("execution_time") is not None for entry in profile["queries"])
+
+
+def test_local_summary_matches_summary_query(automation, warehouse):
+    """Tab1 derived locally equals the summary query, also when ASN lines have materials without MARA."""
+    cursor = warehouse[0].cursor()
+    cursor.execute("DELETE FROM EDP.STD_ECC.MARA WHERE MATNR LIKE '%3'")
+    automation.connect_to_snowflake()
+    summary_query = automation.get_query_0_summary_metrics([ANCHOR_VENDOR], "FY2025-APR", "202504")
+    expected = automation.run_tab_queries({'Summary_Metrics': summary_query})['Summary_Metrics']
+
+    results = automation.fetch_tab_results([ANCHOR_VENDOR], "FY2025-APR", "202504")
+
+    assert not results['ASN_Data']['MATERIAL_NUMBER'].str.endswith("3").any()
+    assert '4.ASN_Success_Rate' in expected['METRICTYPE'].tolist()
+    assert results['Summary_Metrics'].values.tolist() == expected.values.tolist()
+
+
+def test_persistent_dataset_is_reused(tmp_path):
+    connection = OfflineConnection(str(tmp_path / "warehouse"))
+    first = load_synthetic_warehouse(connection, 1000)
+    connection.close()
+
+    connection = OfflineConnection(str(tmp_path / "warehouse"))
+    try:
+        second = load_synthetic_warehouse(connection, 1000)
+        cursor = connection.cursor()
+        cursor.execute("SELECT COUNT(*) FROM EDP.STD_ECC.LIPS")
+        assert cursor.fetchone()[0] == first.table_rows["EDP.STD_ECC.LIPS"]
+    finally:
+        connection.close()
+    assert second == first
+    assert (tmp_path / "warehouse" / MANIFEST_FILE).exists()
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
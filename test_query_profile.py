@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test script for per-run query profiling in SPP Enhanced (no live login needed)
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from spp_query_profile import QueryProfiler
+
+
+# Query history and partition statistics of the run's queries
+PROFILE_RESULTS = {
+    "QUERY_HISTORY_BY_SESSION": (["QUERY_ID", "TOTAL_ELAPSED_TIME", "COMPILATION_TIME", "QUEUED_TIME",
+                                  "EXECUTION_TIME", "BYTES_SCANNED"],
+                                 [("qid-1", 5000, 200, 3000, 1800, 1048576), ("other", 1, 1, 1, 1, 1)]),
+    "GET_QUERY_OPERATOR_STATS": (["PARTITIONS_SCANNED", "PARTITIONS_TOTAL"], [(12, 3400)]),
+}
+
+
+def test_run_is_tagged_and_profile_written(tmp_path, fake_connection):
+    connection = fake_connection(PROFILE_RESULTS)
+    profiler = QueryProfiler(str(tmp_path / "profiles"))
+
+    run_id = profiler.start_run(connection, vendors=["52889"])
+    profiler.record("Basic_Metrics", "qid-1", rows=7)
+    profiler.record("ASN_Data", rows=2, source="result_cache")
+    with profiler.phase("excel"):
+        pass
+    profile_path = profiler.finish_run(connection)
+
+    statements = [statement for statement, _ in connection.statements]
+    assert statements[:2] == ["SHOW PARAMETERS LIKE 'QUERY_TAG' IN SESSION",
+                              f"ALTER SESSION SET QUERY_TAG = 'SPP:{run_id}'"]
+    assert "ALTER SESSION UNSET QUERY_TAG" in statements
+    assert (statements[3].splitlines()[0], connection.statements[3][1]) == ("SELECT", (f"SPP:{run_id}",))
+
+    with open(profile_path) as f:
+        profile = json.load(f)
+    assert profile["run_id"] == run_id and profile["vendors"] == ["52889"]
+    assert "excel" in profile["phases"]
+    basic, asn = profile["queries"]
+    assert basic["queued_time"] == 3000 and basic["bytes_scanned"] == 1048576
+    assert (basic["partitions_scanned"], basic["partitions_total"]) == (12, 3400)
+    assert asn == {"name": "ASN_Data", "source": "result_cache", "rows": 2}
+
+
+def test_session_query_tag_is_restored(tmp_path, fake_connection):
+    """A QUERY_TAG the session already had is set again after the run instead of being unset."""
+    connection = fake_connection({"SHOW PARAMETERS": (["key", "value", "default", "level"],
+                                                      [("QUERY_TAG", "finance's dashboard", "", "SESSION")])})
+    profiler = QueryProfiler(str(tmp_path))
+
+    profiler.start_run(connection)
+    profiler.finish_run(connection)
+
+    statements = [statement for statement, _ in connection.statements]
+    assert statements[-1] == "ALTER SESSION SET QUERY_TAG = 'finance''s dashboard'"
+    assert "ALTER SESSION UNSET QUERY_TAG" not in statements
+
+
+def test_profiling_failures_never_fail_the_run(tmp_path):
+    class BrokenConnection:
+        def cursor(self):
+            raise Exception("session expired")
+
+    profiler = QueryProfiler(str(tmp_path))
+    profiler.start_run(BrokenConnection())
+    profiler.record("Basic_Metrics", "qid-1", rows=7)
+
+    assert profiler.finish_run(BrokenConnection()) is not None
+
+
+def test_disabled_profiler_sends_nothing(tmp_path, fake_connection):
+    connection = fake_connection()
+    profiler = QueryProfiler(str(tmp_path), enabled=False)
+
+    assert profiler.start_run(connection) is None
+    profiler.record("Basic_Metrics", "qid-1")
+    assert profiler.finish_run(connection) is None
+    assert connection.statements == []
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test script for multi-month range mode in SPP Enhanced (no live login needed)
+"""
+
+import datetime
+import json
+import os
+import sys
+
+import openpyxl
+import pytest
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+
+# Marker text in each tab query -> (columns, rows) covering two months
+FAKE_RESULTS = {
+    "primary_metric AS": (["REPORT_MONTH", "VENDOR", "PO_NUMBER", "METRICTYPE",
+                           "METRIC_UNITS_RECEIVED", "METRIC_UNITS_ORDERED"], [
+        ("FY2025-JAN", "52889 - BOXER HOME LLC", "PO1", "Shipments_In_Full_1D", 1, 2),
+        ("FY2025-MAR", "52889 - BOXER HOME LLC", "PO2", "Shipments_In_Full_1D", 2, 2),
+    ]),
+    "FROM EDP.STD_ECC.LIKP IH": (["INBOUND_TYPE", "VENDOR_NAME", "VENDOR_NUMBER", "CREATE_DATE"], [
+        ("ASN", "BOXER HOME LLC", "52889", datetime.date(2025, 1, 20)),
+        ("EGR", "BOXER HOME LLC", "52889", datetime.date(2025, 3, 3)),
+    ]),
+    "primary_request As": (["SUPPLIER_NUMBER", "REQUESTED_SKU"], [("52889", "SKU1")]),
+}
+
+
+@pytest.fixture
+def automation(automation, attach_connection):
+    automation.performance_config.update(concurrent_queries=False, batch_workers=1, run_key_tables=False)
+    automation.result_cache.enabled = False
+    attach_connection(FAKE_RESULTS)
+    return automation
+
+
+def test_one_query_per_tab_split_into_months(automation):
+    outcomes = automation.run_range_automation(["52889"], "FY2025-JAN", "FY2025-MAR")
+
+    executed = automation.connection.executed
+    basic_sql, basic_params = executed("primary_metric AS")
+    assert "RPT_MONTH IN" in basic_sql
+    assert json.loads(basic_params[1]) == ["FY2025-JAN", "FY2025-FEB", "FY2025-MAR"]
+    assert executed("FROM EDP.STD_ECC.LIKP IH")[1][1:] == ("20250101", "20250401")
+
+    assert list(outcomes) == ["FY2025-JAN", "FY2025-FEB", "FY2025-MAR"]
+    assert outcomes["FY2025-FEB"] == ("", "No data found for the specified criteria")
+    assert os.path.basename(outcomes["FY2025-JAN"][0]) == "52889 - BOXER HOME LLC - JAN 2025.xlsx"
+
+    workbook = openpyxl.load_workbook(outcomes["FY2025-MAR"][0])
+    assert [row[2] for row in workbook["Tab2_Basic_Metrics"].iter_rows(min_row=2, values_only=True)] == ["PO2"]
+    assert [row[0] for row in workbook["Tab3_ASN_Data"].iter_rows(min_row=2, values_only=True)] == ["EGR"]
+    assert workbook["Tab4_PDH_Compliance"].max_row == 2
+
+
+def test_combined_workbook_for_whole_range(automation):
+    outcomes = automation.run_range_automation(["52889"], "FY2025-JAN", "FY2025-MAR", split_months=False)
+
+    output_path, status = outcomes["FY2025-JAN to FY2025-MAR"]
+    assert os.path.basename(output_path) == "52889 - BOXER HOME LLC - JAN 2025 to MAR 2025.xlsx"
+    assert "2 basic metrics records, 2 ASN records" in status
+
+
+def test_invalid_range_is_reported(automation):
+    outcomes = automation.run_range_automation(["52889"], "FY2025-MAR", "FY2025-JAN")
+
+    assert outcomes["FY2025-MAR to FY2025-JAN"][0] == ""
+    assert "before start month" in outcomes["FY2025-MAR to FY2025-JAN"][1]
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
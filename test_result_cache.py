@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test script for the on-disk query result cache in SPP Enhanced (no live login needed)
+"""
+
+import os
+import sys
+import time
+
+import pandas as pd
+import pytest
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+pytest.importorskip("pyarrow")
+
+from spp_query_builder import BoundQuery
+from spp_result_cache import QueryResultCache
+
+QUERY = BoundQuery("SELECT *\n  FROM t WHERE v IN :1", ('["52889"]',))
+
+
+def make_frame(rows=3):
+    return pd.DataFrame({"VENDOR_NUMBER": ["52889"] * rows, "METRIC_NUMERATOR": range(rows)})
+
+
+def test_round_trip_and_whitespace_normalization(tmp_path):
+    """A stored result is returned for the same query regardless of whitespace."""
+    cache = QueryResultCache(tmp_path)
+    cache.put(QUERY, make_frame())
+
+    reformatted = BoundQuery("SELECT * FROM t   WHERE v IN :1", QUERY.params)
+    pd.testing.assert_frame_equal(cache.get(reformatted), make_frame())
+    assert cache.get(BoundQuery(QUERY.sql, ('["13479"]',))) is None
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = QueryResultCache(tmp_path, ttl_seconds=60)
+    cache.put(QUERY, make_frame())
+    path = next(tmp_path.glob("*.parquet"))
+    old = time.time() - 120
+    os.utime(path, (old, old))
+
+    assert cache.get(QUERY) is None
+    assert not path.exists()
+
+
+def test_lru_eviction_keeps_recently_read_entries(tmp_path):
+    cache = QueryResultCache(tmp_path)
+    queries = [BoundQuery(QUERY.sql, (f'["{n}"]',)) for n in range(3)]
+    for age, query in zip((300, 200, 100), queries):
+        cache.put(query, make_frame(200))
+        path = cache._path(query)
+        os.utime(path, (time.time() - age, time.time() - age))
+
+    cache.get(queries[0])  # oldest entry becomes most recently used
+    entry_size = cache._path(queries[0]).stat().st_size
+    cache.max_size_bytes = entry_size * 2
+    cache.evict()
+
+    assert cache.get(queries[0]) is not None
+    assert cache.get(queries[1]) is None
+    assert cache.get(queries[2]) is not None
+
+
+def test_engine_skips_warehouse_on_cache_hit(automation, monkeypatch):
+    """A second identical run never reaches Snowflake; bypass forces a refresh."""
+    engine = automation
+    executed = []
+
+    def fake_execute(queries):
+        executed.append(list(queries))
+        return {name: make_frame() for name in queries}
+
+    monkeypatch.setattr(engine, "_execute_tab_queries", fake_execute)
+    queries = engine.build_tab_queries(["52889"], "FY2025-APR", "202504")
+
+    engine.run_tab_queries(queries)
+    results = engine.run_tab_queries(queries)
+    assert len(executed) == 1
+    assert list(results) == list(queries)
+
+    engine.bypass_result_cache = True
+    engine.run_tab_queries(queries)
+    assert len(executed) == 2
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
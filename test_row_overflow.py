@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test script for tabs exceeding Excel's row limit (no live login needed)
+
+EXCEL_MAX_ROWS is patched down to 4, so every sheet holds 3 data rows.
+"""
+
+import os
+import shutil
+import sys
+import zipfile
+
+import openpyxl
+import pandas as pd
+import pytest
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import spp_excel_writers
+from spp_excel_writers import OVERFLOW_SHEET, StreamingWorkbookWriter, plan_sheets
+from spp_writer_benchmark import build_macro_template
+
+
+@pytest.fixture(autouse=True)
+def small_sheets(monkeypatch):
+    monkeypatch.setattr(spp_excel_writers, "EXCEL_MAX_ROWS", 4)
+
+
+def data_dict(basic_rows=7):
+    return {
+        'Summary_Metrics': pd.DataFrame({"RPT_MONTH": ["FY2025-APR"], "VENDOR_NUMBER": ["52889"]}),
+        'Basic_Metrics': pd.DataFrame({"REPORT_MONTH": ["FY2025-APR"] * basic_rows,
+                                       "LINE": list(range(1, basic_rows + 1))}),
+    }
+
+
+def column(worksheet, index=2):
+    return [row[0] for row in worksheet.iter_rows(min_row=2, min_col=index, max_col=index, values_only=True)]
+
+
+def test_plan_splits_overflowing_tab():
+    plans = plan_sheets(data_dict())
+
+    assert [plan.sheet_name for plan in plans] == ['Tab1_Summary_Metrics', 'Tab2_Basic_Metrics',
+                                                  'Tab2_Basic_Metrics_2', 'Tab2_Basic_Metrics_3']
+    assert [len(plan.df) for plan in plans] == [1, 3, 3, 1]
+    assert {plan.template_sheet for plan in plans[1:]} == {'Tab2_Basic_Metrics'}
+
+    with pytest.raises(ValueError):
+        plan_sheets(data_dict(), overflow="truncate")
+
+
+def test_plan_spills_overflowing_tab_to_sidecar(tmp_path):
+    plans = plan_sheets(data_dict(), overflow="sidecar", sidecar_base=str(tmp_path / "report"))
+
+    assert [plan.sheet_name for plan in plans] == ['Tab1_Summary_Metrics', 'Tab2_Basic_Metrics', OVERFLOW_SHEET]
+    assert len(plans[1].df) == 3
+    pointer = plans[2].df.iloc[0]
+    assert pointer["SHEET"] == 'Tab2_Basic_Metrics' and pointer["TOTAL_ROWS"] == 7
+    sidecar = str(tmp_path / pointer["FILE"])
+    full = pd.read_parquet(sidecar) if sidecar.endswith(".parquet") else pd.read_csv(sidecar)
+    assert full["LINE"].tolist() == list(range(1, 8))
+
+
+@pytest.mark.parametrize("write_only", [True, False])
+def test_standard_excel_continues_on_new_sheets(automation, tmp_path, write_only):
+    automation.performance_config["write_only_excel"] = write_only
+    output_path = str(tmp_path / "report.xlsx")
+
+    assert automation.create_standard_excel_file(output_path, data_dict())
+
+    workbook = openpyxl.load_workbook(output_path)
+    assert workbook.sheetnames == ['Tab1_Summary_Metrics', 'Tab2_Basic_Metrics',
+                                   'Tab2_Basic_Metrics_2', 'Tab2_Basic_Metrics_3']
+    assert column(workbook['Tab2_Basic_Metrics_2']) == [4, 5, 6]
+    assert workbook['Tab2_Basic_Metrics_3']['A1'].value == "REPORT_MONTH"
+
+
+def test_streamed_batches_roll_over_to_continuation_sheet(tmp_path):
+    output_path = str(tmp_path / "report.xlsx")
+    writer = StreamingWorkbookWriter(output_path)
+    for start in range(0, 8, 2):
+        writer.write_batch('Basic_Metrics', pd.DataFrame({"LINE": [start + 1, start + 2]}))
+    assert writer.save() and writer.row_counts['Basic_Metrics'] == 8
+
+    workbook = openpyxl.load_workbook(output_path)
+    assert workbook.sheetnames == ['Tab2_Basic_Metrics', 'Tab2_Basic_Metrics_2', 'Tab2_Basic_Metrics_3']
+    assert column(workbook['Tab2_Basic_Metrics_3'], 1) == [7, 8]
+
+
+@pytest.mark.parametrize("injection", [True, False])
+def test_template_gets_continuation_sheets(automation, tmp_path, caplog, injection):
+    automation.performance_config["template_injection"] = injection
+    template_path, output_path = str(tmp_path / "template.xlsm"), str(tmp_path / "report.xlsm")
+    build_macro_template(template_path)
+    shutil.copy2(template_path, output_path)
+
+    assert automation.populate_template_tabs(output_path, data_dict())
+    if injection:
+        assert "openpyxl" not in caplog.text
+
+    assert zipfile.ZipFile(output_path).read("xl/vbaProject.bin") == \
+        zipfile.ZipFile(template_path).read("xl/vbaProject.bin")
+    workbook = openpyxl.load_workbook(output_path, keep_vba=True)
+    template_sheets = openpyxl.load_workbook(template_path).sheetnames
+    assert workbook.sheetnames == template_sheets + ['Tab2_Basic_Metrics_2', 'Tab2_Basic_Metrics_3']
+    continuation = workbook['Tab2_Basic_Metrics_2']
+    assert continuation['A1'].value == "REPORT_MONTH" and continuation['A1'].font.bold
+    assert column(continuation) == [4, 5, 6] and continuation.max_row == 4
+
+
+def test_template_sidecar_adds_pointer_sheet(automation, tmp_path):
+    automation.performance_config["row_overflow"] = "sidecar"
+    template_path, output_path = str(tmp_path / "template.xlsm"), str(tmp_path / "report.xlsm")
+    build_macro_template(template_path)
+    shutil.copy2(template_path, output_path)
+
+    assert automation.populate_template_tabs(output_path, data_dict())
+
+    workbook = openpyxl.load_workbook(output_path, keep_vba=True)
+    assert workbook.sheetnames[-1] == OVERFLOW_SHEET
+    assert column(workbook['Tab2_Basic_Metrics']) == [1, 2, 3]
+    sidecar = workbook[OVERFLOW_SHEET]['D2'].value
+    assert sidecar.startswith("report - Tab2_Basic_Metrics.") and os.path.exists(tmp_path / sidecar)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test script for the session run key tables in SPP Enhanced (no live login needed)
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from spp_query_builder import RUN_PO_KEY_TABLE, RUN_VENDOR_TABLE
+from spp_result_cache import QueryResultCache
+
+
+@pytest.fixture
+def automation(automation):
+    automation.performance_config["concurrent_queries"] = False
+    automation.result_cache.enabled = False
+    automation.asn_store.enabled = False
+    return automation
+
+
+def test_key_tables_loaded_once_and_shared(automation, attach_connection):
+    """Both tables are created once; every tab query reads them instead of binding vendors."""
+    attach_connection()
+    vendors = [str(vendor) for vendor in range(1000, 3000)]
+
+    automation.fetch_tab_results(vendors, "FY2025-APR", "202504")
+
+    statements = automation.connection.statements
+    creates = [(sql, params) for sql, params in statements if "CREATE" in sql]
+    assert len(creates) == 2
+    pairs = json.loads(creates[0][1][0])
+    assert pairs[0] == {"vendor": "1000", "lifnr": "0000001000"}
+    assert creates[1][1] == ("FY2025-APR",)
+
+    tab_queries = [(sql, params) for sql, params in statements if "CREATE" not in sql and "DROP" not in sql]
+    assert len(tab_queries) == 4
+    for sql, params in tab_queries:
+        assert RUN_VENDOR_TABLE in sql
+        assert "PARSE_JSON" not in sql
+        assert not any("1000" in str(value) for value in params)
+    assert any(RUN_PO_KEY_TABLE in sql for sql, _ in tab_queries)
+
+    drops = [sql for sql, _ in statements if sql.startswith("DROP")]
+    assert len(drops) == 2
+    assert automation.key_tables_active is False
+
+
+def test_cached_rerun_skips_key_tables(automation, attach_connection):
+    """A re-run served from the result cache creates (and drops) no key tables."""
+    attach_connection()
+    automation.result_cache.enabled = True
+
+    automation.fetch_tab_results(["52889"], "FY2025-APR", "202504")
+    assert len([sql for sql, _ in automation.connection.statements if "CREATE" in sql]) == 2
+
+    automation.connection.statements.clear()
+    automation.fetch_tab_results(["52889"], "FY2025-APR", "202504")
+    assert automation.connection.statements == []
+
+
+def test_query_text_independent_of_vendor_count(automation):
+    """While the key tables are loaded, vendor list size does not change the SQL."""
+    automation.key_tables_active = True
+    few = automation.build_tab_queries(["52889"], "FY2025-APR", "202504")
+    many = automation.build_tab_queries([str(vendor) for vendor in range(5000)], "FY2025-APR", "202504")
+
+    for name in few:
+        assert few[name].sql == many[name].sql
+        assert few[name].params == many[name].params
+        assert QueryResultCache.fingerprint(few[name]) != QueryResultCache.fingerprint(many[name])
+
+    summary = few['Summary_Metrics']
+    assert summary.params == ("FY2025-APR", "20250401", "20250501")
+    assert ":4" not in summary.sql
+
+
+def test_falls_back_to_json_binds(automation, attach_connection):
+    """Without a schema for temp tables the queries keep their own vendor binds."""
+    attach_connection(fail_on="CREATE")
+
+    assert automation.load_run_key_tables(["52889"], "FY2025-APR") is False
+    assert automation.key_tables_active is False
+    queries = automation.build_tab_queries(["52889"], "FY2025-APR", "202504")
+    assert queries['Basic_Metrics'].params[0] == '["52889"]'
+    assert queries['Basic_Metrics'].context == ()
+
+
+def test_disabled_by_config(automation, attach_connection):
+    attach_connection()
+    automation.performance_config["run_key_tables"] = False
+
+    assert automation.load_run_key_tables(["52889"], "FY2025-APR") is False
+    assert automation.connection.statements == []
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test script for Snowflake session reuse in SPP Enhanced (no live login needed)
+"""
+
+import os
+import sys
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from spp_session import SnowflakeSessionManager
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def execute(self, query):
+        if self.connection.expired:
+            raise Exception("Session no longer exists")
+        self.connection.queries.append(query)
+
+    def fetchone(self):
+        return (1,)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+        self.expired = False
+        self.queries = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def is_closed(self):
+        return self.closed
+
+    def close(self):
+        self.closed = True
+
+
+def make_session(validation_interval=300):
+    opened = []
+
+    def factory():
+        connection = FakeConnection()
+        opened.append(connection)
+        return connection
+
+    return SnowflakeSessionManager(factory, validation_interval=validation_interval), opened
+
+
+def test_twenty_reports_cost_one_login():
+    """Repeated get_connection calls reuse the same session."""
+    session, opened = make_session()
+    connections = {id(session.get_connection()) for _ in range(20)}
+
+    assert len(connections) == 1
+    assert session.login_count == 1
+    assert opened[0].queries == []  # recent session is not pinged
+
+
+def test_closed_connection_reconnects():
+    """A locally closed connection is replaced without a round trip."""
+    session, opened = make_session()
+    first = session.get_connection()
+    first.closed = True
+
+    second = session.get_connection()
+    assert second is not first
+    assert session.login_count == 2
+
+
+def test_idle_session_is_validated_and_reconnected_when_expired():
+    """Sessions idle past the validation interval are pinged before reuse."""
+    session, opened = make_session(validation_interval=0)
+    first = session.get_connection()
+    assert session.get_connection() is first
+    assert first.queries == ["SELECT 1"]
+
+    first.expired = True
+    second = session.get_connection()
+    assert second is not first
+    assert first.closed
+    assert session.login_count == 2
+
+
+def test_close_drops_connection():
+    """close() ends the session and the next call logs in again."""
+    session, opened = make_session()
+    first = session.get_connection()
+    session.close()
+
+    assert first.closed
+    assert session.connection is None
+    assert session.get_connection() is not first
+
+
+if __name__ == "__main__":
+    test_twenty_reports_cost_one_login()
+    test_closed_connection_reconnects()
+    test_idle_session_is_validated_and_reconnected_when_expired()
+    test_close_drops_connection()
+    print("✅ All session manager tests passed")
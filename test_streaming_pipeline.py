@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test script for the streaming query-to-sheet pipeline in SPP Enhanced (no live login needed)
+"""
+
+import os
+import sys
+from datetime import date
+
+import openpyxl
+import pandas as pd
+import pytest
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import spp_excel_writers
+
+# Marker text in each tab query -> (columns, rows)
+FAKE_RESULTS = {
+    "Metric_Data AS": (["RPT_MONTH", "VENDOR_NUMBER", "VENDOR_NAME", "METRICTYPE", "METRIC_PERCENTAGE"],
+                       [("FY2025-APR", "52889", "BOXER HOME LLC", "1.Shipments_In_Full_1D", "95.0%")]),
+    "primary_metric AS": (["REPORT_MONTH", "VENDOR", "PO_NUMBER"],
+                          [("FY2025-APR", "52889 - BOXER HOME LLC", f"PO{i}") for i in range(7)]),
+    "FROM EDP.STD_ECC.LIKP IH": (["INBOUND_TYPE", "VENDOR_NUMBER", "QUANTITY_RECEIVED"],
+                                 [("ASN", "52889", None), ("EGR", "52889", 4)]),
+    "primary_request As": (["SUPPLIER_NUMBER", "REQUESTED_SKU"], []),
+}
+
+
+@pytest.fixture
+def automation(automation, attach_connection):
+    automation.performance_config.update(stream_to_sheets=True, concurrent_queries=False)
+    # Tiny batches exercise the streaming path
+    attach_connection(FAKE_RESULTS, batch_rows=3, strict=True)
+    return automation
+
+
+def test_streaming_writes_tabs_in_order_with_row_counts(automation):
+    """Batches land in their sheets, empty tabs are skipped, counts feed the status."""
+    output_path, status = automation.run_full_automation(["52889"], "FY2025-APR", "202504")
+
+    assert os.path.basename(output_path) == "52889 - BOXER HOME LLC - APR 2025.xlsx"
+    assert "1 summary records, 7 basic metrics records, 2 ASN records, and 0 PDH" in status
+
+    workbook = openpyxl.load_workbook(output_path)
+    assert workbook.sheetnames == ["Tab1_Summary_Metrics", "Tab2_Basic_Metrics", "Tab3_ASN_Data"]
+    assert workbook["Tab2_Basic_Metrics"].max_row == 8
+    assert workbook["Tab3_ASN_Data"]["C2"].value is None
+    assert not [f for f in os.listdir("Output") if f.startswith("~streaming_")]
+
+
+def test_streaming_without_rows_reports_no_data(automation, monkeypatch):
+    """No rows in any tab gives the usual no-data message and leaves no file."""
+    monkeypatch.setitem(FAKE_RESULTS, "Metric_Data AS", (["RPT_MONTH"], []))
+    monkeypatch.setitem(FAKE_RESULTS, "primary_metric AS", (["REPORT_MONTH"], []))
+    monkeypatch.setitem(FAKE_RESULTS, "FROM EDP.STD_ECC.LIKP IH", (["INBOUND_TYPE"], []))
+
+    output_path, status = automation.run_full_automation(["52889"], "FY2025-APR", "202504")
+
+    assert output_path == ""
+    assert status == "No data found for the specified criteria"
+    assert os.listdir("Output") == []
+
+
+def test_standard_excel_is_written_in_chunks(automation, monkeypatch):
+    """The write-only standard writer keeps tab order, header style, dates and NaN handling."""
+    monkeypatch.setattr(spp_excel_writers, "WRITE_CHUNK_ROWS", 2)
+    data_dict = {
+        'PDH_Compliance': pd.DataFrame({"SUPPLIER_NUMBER": ["52889"], "QUESTION_ID": [float("nan")]}),
+        'Basic_Metrics': pd.DataFrame({"PO_NUMBER": [f"PO{i}" for i in range(5)],
+                                       "DATE_ORDERED": [date(2025, 4, i + 1) for i in range(5)]}),
+        'ASN_Data': pd.DataFrame(),
+        'Summary_Metrics': pd.DataFrame({"VENDOR_NUMBER": ["52889"]}),
+    }
+
+    assert automation.create_standard_excel_file("standard.xlsx", data_dict)
+
+    workbook = openpyxl.load_workbook("standard.xlsx")
+    assert workbook.sheetnames == ["Tab1_Summary_Metrics", "Tab2_Basic_Metrics", "Tab4_PDH_Compliance"]
+    basic = workbook["Tab2_Basic_Metrics"]
+    assert basic.max_row == 6
+    assert basic["A1"].font.bold and basic["A6"].value == "PO4"
+    assert basic["B6"].value.date() == date(2025, 4, 5) and basic["B6"].is_date
+    assert workbook["Tab4_PDH_Compliance"]["B2"].value is None
+    assert openpyxl.load_workbook("standard.xlsx", read_only=True)["Tab2_Basic_Metrics"].max_row == 6
+
+    assert not automation.create_standard_excel_file("empty.xlsx", {'ASN_Data': pd.DataFrame()})
+
+
+def test_typed_date_columns_keep_date_format(automation):
+    """datetime64 columns (typed results) are written as dates, not date-times, on both write-only paths."""
+    dates = pd.Series(pd.to_datetime(["2025-04-01", None, "9999-12-31"])).astype("datetime64[us]")
+    data_dict = {'Basic_Metrics': pd.DataFrame({"PO_NUMBER": ["PO1", "PO2", "PO3"], "DATE_ORDERED": dates})}
+
+    assert automation.create_standard_excel_file("typed.xlsx", data_dict)
+    writer = spp_excel_writers.StreamingWorkbookWriter("streamed.xlsx")
+    writer.write_batch('Basic_Metrics', data_dict['Basic_Metrics'])
+    assert writer.save()
+
+    for path in ("typed.xlsx", "streamed.xlsx"):
+        basic = openpyxl.load_workbook(path)["Tab2_Basic_Metrics"]
+        assert basic["B2"].number_format == spp_excel_writers.DATE_FORMAT
+        assert basic["B2"].value.date() == date(2025, 4, 1) and basic["B3"].value is None
+        assert basic["B4"].value.date() == date(9999, 12, 31)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
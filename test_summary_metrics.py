@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test script for local Tab1 summary KPI derivation in SPP Enhanced (no live login needed)
+"""
+
+import os
+import sys
+from decimal import Decimal
+
+import pandas as pd
+import pytest
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from spp_summary import SUMMARY_COLUMNS, derive_summary_metrics, format_metric_percentage
+
+
+def make_basic():
+    return pd.DataFrame({
+        'REPORT_MONTH': ['FY2025-APR'] * 5,
+        'VENDOR': ['52889 - BOXER HOME LLC'] * 4 + ['13479 - ACME - WEST'],
+        'METRICTYPE': ['Shipments_In_Full_1D', 'Shipments_In_Full_1D', 'Units_On_Time_Complete',
+                       'Inbound_Fill_Rate_28D', 'Inbound_Fill_Rate_28D'],
+        'METRIC_UNITS_RECEIVED': [Decimal(1), Decimal(2), Decimal(0), Decimal(2), Decimal(5)],
+        'METRIC_UNITS_ORDERED': [Decimal(2), Decimal(4), Decimal(8), Decimal(3), Decimal(5)],
+    })
+
+
+def make_asn_rates():
+    return pd.DataFrame([['FY2025-APR', '52889', 'BOXER HOME LLC', '4.ASN_Success_Rate', '66.7%']],
+                        columns=SUMMARY_COLUMNS)
+
+
+@pytest.mark.parametrize("numerator, denominator, expected", [
+    (1, 3, "33.3%"),
+    (2, 3, "66.7%"),
+    (1, 2000, ".1%"),
+    (0, 5, ".0%"),
+    (5, 5, "100.0%"),
+    (Decimal("0.25"), 1, "25.0%"),
+    (1, 0, None),
+    (None, 4, None),
+])
+def test_percentage_format_matches_to_char_fm999_9(numerator, denominator, expected):
+    assert format_metric_percentage(numerator, denominator) == expected
+
+
+def test_summary_layout_and_order():
+    """One row per vendor/month/metric, sorted by vendor number then metric type."""
+    summary = derive_summary_metrics(make_basic(), make_asn_rates())
+
+    assert list(summary.columns) == SUMMARY_COLUMNS
+    assert summary.values.tolist() == [
+        ['FY2025-APR', '13479', 'ACME - WEST', '2.Inbound_Fill_Rate_28D', '100.0%'],
+        ['FY2025-APR', '52889', 'BOXER HOME LLC', '1.Shipments_In_Full_1D', '50.0%'],
+        ['FY2025-APR', '52889', 'BOXER HOME LLC', '2.Inbound_Fill_Rate_28D', '66.7%'],
+        ['FY2025-APR', '52889', 'BOXER HOME LLC', '3.Units_On_Time_Complete', '.0%'],
+        ['FY2025-APR', '52889', 'BOXER HOME LLC', '4.ASN_Success_Rate', '66.7%'],
+    ]
+
+
+def test_empty_inputs_give_empty_summary():
+    summary = derive_summary_metrics(make_basic().iloc[:0], make_asn_rates().iloc[:0])
+
+    assert summary.empty
+    assert list(summary.columns) == SUMMARY_COLUMNS
+
+
+def test_only_asn_rate_queried_when_summary_derived_locally(automation):
+    queries = automation.build_tab_queries(["52889"], "FY2025-APR", "202504", include_summary=False)
+
+    assert list(queries) == ['ASN_Success_Rate', 'Basic_Metrics', 'ASN_Data', 'PDH_Compliance']
+    assert "ASN_Metric AS" in queries['ASN_Success_Rate'].sql
+    assert "COMBINED_IPR_IB_VENDOR_PERFORMANCE" not in queries['ASN_Success_Rate'].sql
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
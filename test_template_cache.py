@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test script for the parsed-template cache (no live login needed)
+"""
+
+import os
+import sys
+
+import openpyxl
+import pandas as pd
+import pytest
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import spp_template_cache
+from spp_template_cache import TemplateCache
+from spp_writer_benchmark import build_macro_template
+
+
+@pytest.fixture
+def automation(automation, tmp_path):
+    engine = automation
+    template_dir = tmp_path / "OneDrive"
+    template_dir.mkdir()
+    build_macro_template(str(template_dir / "SPP_Template.xlsm"))
+    engine.template_config.update({"use_template": True, "template_path": "",
+                                   "search_paths": [str(tmp_path / "Documents"), str(template_dir)]})
+    return engine
+
+
+def data_dict(vendor):
+    return {'Basic_Metrics': pd.DataFrame({"REPORT_MONTH": ["FY2025-APR"] * 2, "VENDOR_NUMBER": [vendor] * 2})}
+
+
+def test_template_resolved_once_per_config(automation, tmp_path, monkeypatch):
+    lookups = []
+    exists = os.path.exists
+    monkeypatch.setattr(spp_template_cache.os.path, "exists", lambda path: lookups.append(path) or exists(path))
+
+    paths = {automation.find_template_file() for _ in range(3)}
+    assert paths == {str(tmp_path / "OneDrive" / "SPP_Template.xlsm")} and len(lookups) == 2
+
+    automation.template_config["template_name"] = "Other.xlsm"
+    assert automation.find_template_file() is None
+    assert automation.find_template_file() is None and len(lookups) == 6
+
+
+def test_outputs_start_from_in_memory_template(automation, tmp_path, caplog):
+    outputs = [str(tmp_path / f"{vendor}.xlsm") for vendor in ("52889", "13479")]
+    for output_path in outputs:
+        assert automation.copy_template_file(output_path)
+        assert automation.populate_template_tabs(output_path, data_dict(os.path.basename(output_path)[:5]))
+
+    assert caplog.text.count("Loaded template") == 1
+    for output_path in outputs:
+        workbook = openpyxl.load_workbook(output_path, keep_vba=True)
+        assert workbook['Tab2_Basic_Metrics']['B3'].value == os.path.basename(output_path)[:5]
+        assert workbook['Tab2_Basic_Metrics'].max_row == 3
+
+
+def test_changed_template_is_reloaded(tmp_path):
+    template_path = str(tmp_path / "template.xlsm")
+    build_macro_template(template_path)
+    cache = TemplateCache()
+    first = cache.load(template_path)
+
+    # Same content with a new mtime: kept, not re-parsed
+    os.utime(template_path, ns=(first.signature[0] + 10**9, first.signature[0] + 10**9))
+    assert cache.load(template_path) is first
+
+    workbook = openpyxl.load_workbook(template_path, keep_vba=True)
+    workbook['Tab1_Summary_Metrics']['A1'] = "CHANGED"
+    workbook.save(template_path)
+    reloaded = cache.load(template_path)
+    assert reloaded is not first and reloaded.digest != first.digest
+
+
+def test_modified_output_is_not_injected_from_cache(tmp_path):
+    template_path, output_path = str(tmp_path / "template.xlsm"), str(tmp_path / "report.xlsm")
+    build_macro_template(template_path)
+    cache = TemplateCache()
+
+    cache.copy_to(template_path, output_path)
+    assert cache.package_for(output_path) is cache.load(template_path).package
+
+    cache.copy_to(template_path, output_path)
+    with open(output_path, "ab") as f:
+        f.write(b"\0")
+    assert cache.package_for(output_path) is None
+
+
+def test_cache_can_be_disabled(automation, tmp_path):
+    automation.template_cache.enabled = False
+    output_path = str(tmp_path / "report.xlsm")
+
+    assert automation.copy_template_file(output_path)
+    assert automation.template_cache.package_for(output_path) is None
+    assert automation.populate_template_tabs(output_path, data_dict("52889"))
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Test script for sheet-XML injection into copied .xlsm templates (no live login needed)
+"""
+
+import os
+import shutil
+import sys
+import zipfile
+from datetime import date, datetime
+
+import openpyxl
+import pandas as pd
+import pytest
+from openpyxl.workbook.defined_name import DefinedName
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from spp_excel_writers import DATE_FORMAT, excel_columns
+from spp_writer_benchmark import SAMPLE_TEMPLATE, build_macro_template
+
+
+@pytest.fixture
+def macro_template(tmp_path):
+    """Macro template saved with last month's Tab2 rows, a styled data row and a named range."""
+    path = str(tmp_path / "template.xlsm")
+    build_macro_template(path)
+    workbook = openpyxl.load_workbook(path, keep_vba=True)
+    basic = workbook['Tab2_Basic_Metrics']
+    for row in range(2, 40):
+        basic.cell(row=row, column=1, value=f"OLD{row}")
+    basic['M2'].number_format = '#,##0'
+    workbook.defined_names["BasicData"] = DefinedName("BasicData", attr_text="Tab2_Basic_Metrics!$A$1:$O$40")
+    workbook.save(path)
+    return path
+
+
+def data_dict():
+    return {
+        'Summary_Metrics': pd.DataFrame({"RPT_MONTH": ["FY2025-APR"], "VENDOR_NUMBER": ["52889"],
+                                         "VENDOR_NAME": ["BOXER & HOME <LLC>"]}),
+        'Basic_Metrics': pd.DataFrame({"REPORT_MONTH": ["FY2025-APR"] * 3,
+                                       "DATE_ORDERED": [date(2025, 4, 2), None, pd.Timestamp("2025-04-03")],
+                                       "METRIC_UNITS": [1, 2, 3]}).reindex(
+            columns=["REPORT_MONTH", "DATE_ORDERED", "C", "D", "E", "F", "G", "H", "I", "J", "K", "L", "METRIC_UNITS"]),
+        'ASN_Data': pd.DataFrame(),
+        'PDH_Compliance': pd.DataFrame({"SUPPLIER_NUMBER": ["52889"], "QUESTION_ID": [float("nan")]}),
+    }
+
+
+def test_injection_rewrites_only_tab_sheets(automation, macro_template, tmp_path):
+    output_path = str(tmp_path / "report.xlsm")
+    shutil.copy2(macro_template, output_path)
+
+    assert automation.populate_template_tabs(output_path, data_dict())
+
+    before, after = zipfile.ZipFile(macro_template), zipfile.ZipFile(output_path)
+    assert before.namelist() == after.namelist()
+    changed = [name for name in before.namelist() if before.read(name) != after.read(name)]
+    # Tab1, Tab2 and Tab4 are rewritten; the empty ASN tab keeps the template's sheet.
+    # The template has no yyyy-mm-dd style yet, so one is appended to the styles part.
+    sheets = [name for name in changed if name.startswith("xl/worksheets/sheet")]
+    assert len(sheets) == 3 and set(changed) - set(sheets) == {"xl/styles.xml"}
+    assert after.read("xl/vbaProject.bin") == before.read("xl/vbaProject.bin")
+
+    workbook = openpyxl.load_workbook(output_path, keep_vba=True)
+    basic = workbook['Tab2_Basic_Metrics']
+    assert basic['A1'].value == "REPORT_MONTH" and basic['A1'].font.bold
+    assert basic.max_row == 4 and basic.dimensions == "A1:O4"
+    assert [basic['B2'].value, basic['B3'].value, basic['B4'].value] == [datetime(2025, 4, 2), None,
+                                                                          datetime(2025, 4, 3)]
+    assert basic['B2'].is_date and basic['B4'].number_format == DATE_FORMAT
+    assert basic['M3'].value == 2 and basic['M3'].number_format == '#,##0'
+    assert workbook['Tab1_Summary_Metrics']['C2'].value == "BOXER & HOME <LLC>"
+    assert workbook['Tab4_PDH_Compliance']['B2'].value is None
+    assert "BasicData" in workbook.defined_names
+
+
+def test_injection_reuses_date_style(automation, macro_template, tmp_path):
+    output_path = str(tmp_path / "report.xlsm")
+    shutil.copy2(macro_template, output_path)
+    assert automation.populate_template_tabs(output_path, data_dict())
+    styles = zipfile.ZipFile(output_path).read("xl/styles.xml")
+
+    # A second run on the populated workbook finds the appended style again
+    assert automation.populate_template_tabs(output_path, data_dict())
+    assert zipfile.ZipFile(output_path).read("xl/styles.xml") == styles
+
+
+def test_openpyxl_path_clears_old_rows_in_bulk(automation, macro_template, tmp_path):
+    automation.performance_config["template_injection"] = False
+    output_path = str(tmp_path / "report.xlsm")
+    shutil.copy2(macro_template, output_path)
+
+    assert automation.populate_template_tabs(output_path, data_dict())
+
+    workbook = openpyxl.load_workbook(output_path, keep_vba=True)
+    basic = workbook['Tab2_Basic_Metrics']
+    # Last month's 38 rows are gone, not just blanked
+    assert basic.max_row == 4 and basic.dimensions == "A1:O4"
+    assert basic['A1'].value == "REPORT_MONTH" and basic['A1'].font.bold
+    assert basic['M3'].value == 2 and basic['M3'].number_format == '#,##0'
+    assert basic['B2'].is_date and basic['B2'].number_format == DATE_FORMAT
+    assert "BasicData" in workbook.defined_names
+
+
+def test_legacy_template_clears_old_rows_in_bulk(macro_template, tmp_path, monkeypatch):
+    from spp_metric_automation_fixed import SPPMetricAutomationFixed
+    monkeypatch.chdir(tmp_path)
+    workbook = openpyxl.load_workbook(macro_template, keep_vba=True)
+    metric = workbook['METRIC DATA']
+    for row in range(2, 60):
+        metric.cell(row=row, column=20, value=row)
+    metric.merge_cells("A30:C30")
+    workbook.save(macro_template)
+    legacy = SPPMetricAutomationFixed(config_file=str(tmp_path / "missing.ini"))
+
+    assert legacy.populate_template_tabs(macro_template, {'METRIC DATA': data_dict()['Basic_Metrics']})
+
+    metric = openpyxl.load_workbook(macro_template, keep_vba=True)['METRIC DATA']
+    # Old header cells past the new columns are blanked, the column-T values are gone
+    assert metric.max_row == 4 and metric.max_column == 15 and metric['N1'].value is None
+    assert metric['A1'].value == "REPORT_MONTH" and metric['A1'].font.bold
+    assert not metric.merged_cells.ranges
+
+
+def test_excel_columns_convert_once_per_column():
+    df = pd.DataFrame({"DATE": [date(2025, 4, 1), None, date(1900, 3, 1)],
+                       "SENTINEL": [date(2025, 4, 1), None, date(9999, 12, 31)],
+                       "STAMP": pd.to_datetime(["2025-04-01 12:00", None, "2025-04-02 00:00"]),
+                       "QTY": [1.5, float("nan"), float("inf")],
+                       "UNITS": pd.array([1, None, 3], dtype="Int64"),
+                       "NAME": ["A", None, "C"]})
+
+    dates, sentinels, stamps, quantities, units, names = excel_columns(df)
+
+    assert dates == [45748, None, 61]
+    assert sentinels == [45748, None, 2958465]
+    assert excel_columns(df[["SENTINEL"]].astype("datetime64[s]"))[0] == [45748, None, 2958465]
+    assert stamps == [45748.5, None, 45749]
+    assert quantities == [1.5, None, None]
+    assert units == [1, None, 3]
+    assert names == ["A", None, "C"]
+
+
+def test_template_without_tab_sheets_uses_openpyxl(automation, tmp_path):
+    output_path = str(tmp_path / "report.xlsx")
+    shutil.copy2(SAMPLE_TEMPLATE, output_path)
+
+    assert automation.populate_template_tabs(output_path, data_dict())
+
+    workbook = openpyxl.load_workbook(output_path)
+    assert 'Tab2_Basic_Metrics' in workbook.sheetnames
+    assert workbook['Tab2_Basic_Metrics']['A3'].value == "FY2025-APR"
+
+
+def test_injection_can_be_disabled(automation, macro_template, tmp_path, monkeypatch):
+    import spp_automation_enhanced
+    monkeypatch.setattr(spp_automation_enhanced, "inject_sheet_data",
+                        lambda *args, **kwargs: pytest.fail("injection should be disabled"))
+    automation.performance_config["template_injection"] = False
+    output_path = str(tmp_path / "report.xlsm")
+    shutil.copy2(macro_template, output_path)
+
+    assert automation.populate_template_tabs(output_path, data_dict())
+    assert openpyxl.load_workbook(output_path)['Tab2_Basic_Metrics']['A2'].value == "FY2025-APR"
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
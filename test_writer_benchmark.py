@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test script for the Excel writer benchmark (fails when a writer path regresses)
+
+The benchmark cases take minutes and only run for the scales in
+SPP_BENCH_SIZES, e.g. SPP_BENCH_SIZES="10k 100k" python -m pytest test_writer_benchmark.py
+"""
+
+import os
+import sys
+import zipfile
+from datetime import date
+from decimal import Decimal
+
+import openpyxl
+import pytest
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from spp_excel_writers import TAB_SHEETS
+from spp_synthetic_data import generate_tab_frames
+from spp_writer_benchmark import (REFERENCE_WRITER, SAMPLE_TEMPLATE, BenchmarkResult, benchmark_cases,
+                                  build_macro_template, find_regressions, load_baseline, run_case, save_baseline,
+                                  scale_label, with_relative_seconds)
+
+BENCH_SIZES = os.environ.get("SPP_BENCH_SIZES", "").replace(",", " ").split()
+
+
+@pytest.fixture(scope="module")
+def template_paths(tmp_path_factory):
+    work_dir = tmp_path_factory.mktemp("templates")
+    return {"sample": SAMPLE_TEMPLATE,
+            "macro": build_macro_template(str(work_dir / "macro_template.xlsm"))}
+
+
+def test_tab_frames_shape():
+    frames = generate_tab_frames(1000)
+
+    assert list(frames) == list(TAB_SHEETS)
+    assert len(frames['Basic_Metrics']) == 1000
+    assert len(frames['ASN_Data']) == 500
+    assert isinstance(frames['Basic_Metrics']['DATE_ORDERED'].iloc[0], date)
+    assert isinstance(frames['ASN_Data']['QUANTITY_ORDERED'].iloc[0], Decimal)
+    assert frames['Basic_Metrics']['DATE_FIRST_RECEIVED'].isna().any()
+
+
+def test_macro_template_keeps_vba(template_paths):
+    path = template_paths["macro"]
+    assert "xl/vbaProject.bin" in zipfile.ZipFile(path).namelist()
+
+    workbook = openpyxl.load_workbook(path, keep_vba=True)
+    assert set(TAB_SHEETS.values()) | {'METRIC DATA', 'ASN Data'} <= set(workbook.sheetnames)
+    assert workbook['Tab3_ASN_Data']['A1'].value == 'INBOUND_TYPE'
+
+
+def test_regression_thresholds(tmp_path):
+    assert scale_label(10000) == "10k" and scale_label(1000000) == "1M" and scale_label(2500) == "2500"
+    baseline_file = str(tmp_path / "baseline.json")
+    save_baseline([BenchmarkResult("enhanced_standard/none/10k", 4.0, 200.0, 1000.0, True, 0.5)], baseline_file)
+    baseline = load_baseline(baseline_file)
+
+    def result(seconds, relative, peak=200.0, output_kb=1000.0, key="enhanced_standard/none/10k"):
+        return BenchmarkResult(key, seconds, peak, output_kb, True, relative)
+
+    # Absolute wall time depends on the machine and is not compared
+    assert find_regressions(result(40.0, 0.85, 340.0, 1200.0), baseline) == []
+    slower = find_regressions(result(4.0, 0.9), baseline)
+    assert len(slower) == 1 and "relative_seconds" in slower[0]
+    assert find_regressions(result(900.0, 9.0, 9000.0, 1.0, key="enhanced_standard/none/1M"), baseline) == []
+
+
+def test_relative_seconds_divide_by_the_reference_writer_of_the_scale():
+    assert benchmark_cases(["10k"], writers=["enhanced_standard"])[0].writer == REFERENCE_WRITER
+    results = with_relative_seconds([
+        BenchmarkResult(f"{REFERENCE_WRITER}/none/10k", 8.0, None, 1.0, True),
+        BenchmarkResult("enhanced_standard/none/10k", 2.0, None, 1.0, True),
+        BenchmarkResult("enhanced_standard/none/100k", 20.0, None, 1.0, True),
+    ])
+
+    assert [result.relative_seconds for result in results] == [1.0, 0.25, None]
+
+
+@pytest.mark.skipif(not BENCH_SIZES, reason="Writer benchmark is opt-in: set SPP_BENCH_SIZES, e.g. 10k")
+@pytest.mark.parametrize("size", BENCH_SIZES or ["10k"])
+def test_writers_within_baseline(size, template_paths, tmp_path):
+    """Every writer path of a scale, timed against the reference writer of the same run."""
+    baseline = load_baseline()
+    cases = benchmark_cases([size])
+    if not any(case.key in baseline["results"] for case in cases):
+        pytest.skip(f"No baseline for {size} (record one with spp_writer_benchmark.py --update-baseline)")
+
+    results = with_relative_seconds([run_case(case, str(tmp_path), template_paths) for case in cases])
+
+    assert [result.key for result in results if not result.success] == []
+    assert [message for result in results for message in find_regressions(result, baseline)] == []
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))